@@ -12,7 +12,7 @@ from symbolic import SymbolicError, normalize_debug_id
 from sentry import ratelimits, roles
 from sentry.api.bases.project import ProjectEndpoint, ProjectReleasePermission
 from sentry.api.exceptions import ResourceDoesNotExist
-from sentry.api.paginator import OffsetPaginator
+from sentry.api.paginator import KeysetPaginator
 from sentry.api.serializers import serialize
 from sentry.auth.superuser import is_active_superuser
 from sentry.auth.system import is_system_auth
@@ -32,6 +32,7 @@ from sentry.tasks.assemble import (
     set_assemble_status,
 )
 from sentry.utils import json
+from sentry.utils.cursors import StringCursor
 
 logger = logging.getLogger("sentry.api")
 ERR_FILE_EXISTS = "A file matching this debug identifier already exists"
@@ -182,7 +183,8 @@ class DebugFilesEndpoint(ProjectEndpoint):
             request=request,
             queryset=queryset,
             order_by="-id",
-            paginator_cls=OffsetPaginator,
+            paginator_cls=KeysetPaginator,
+            cursor_cls=StringCursor,
             default_per_page=20,
             on_results=lambda x: serialize(x, request.user),
         )
@@ -441,8 +443,9 @@ class SourceMapsEndpoint(ProjectEndpoint):
         return self.paginate(
             request=request,
             queryset=queryset,
-            order_by="-date_added",
-            paginator_cls=OffsetPaginator,
+            order_by=["-date_added", "-id"],
+            paginator_cls=KeysetPaginator,
+            cursor_cls=StringCursor,
             default_per_page=10,
             on_results=serialize_results,
         )
@@ -2,7 +2,7 @@ from functools import partial
 
 from rest_framework.response import Response
 
-from sentry import eventstore
+from sentry import eventstore, options
 from sentry.api.bases import GroupEndpoint
 from sentry.api.paginator import GenericOffsetPaginator
 from sentry.api.serializers import EventSerializer, serialize
@@ -57,8 +57,20 @@ class GroupHashesEndpoint(GroupEndpoint):
         if not hash_list:
             return Response()
 
+        kwargs = {}
+        if options.get("unmerge.high-throughput"):
+            kwargs = {
+                "high_throughput": True,
+                "batch_size": options.get("unmerge.high-throughput.batch-size"),
+            }
+
         unmerge.delay(
-            group.project_id, group.id, None, hash_list, request.user.id if request.user else None
+            group.project_id,
+            group.id,
+            None,
+            hash_list,
+            request.user.id if request.user else None,
+            **kwargs,
         )
 
         return Response(status=202)
@@ -1,5 +1,6 @@
 from rest_framework.response import Response
 
+from sentry import grouphash_cache
 from sentry.api.bases import ProjectEndpoint
 from sentry.api.exceptions import ResourceDoesNotExist
 from sentry.models import GroupHash, GroupTombstone
@@ -29,6 +30,7 @@ class GroupTombstoneDetailsEndpoint(ProjectEndpoint):
             # will allow new events to be captured
             group_tombstone_id=None
         )
+        grouphash_cache.invalidate([project.id])
 
         tombstone.delete()
 
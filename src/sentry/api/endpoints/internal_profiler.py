@@ -0,0 +1,100 @@
+import os
+
+from rest_framework.response import Response
+
+from sentry.api.base import Endpoint
+from sentry.api.permissions import SuperuserPermission
+from sentry.utils.profiler import DEFAULT_INTERVAL, profiler
+
+
+class InternalProfilerEndpoint(Endpoint):
+    """
+    Controls the sampling profiler of a single process: the one that serves
+    the request. With several web workers, requests land on arbitrary
+    workers. Every response contains the ``pid`` of the process that served
+    it. Requests that pass a ``pid`` are refused with a 409 unless they are
+    served by that process, and must be retried until they reach it. Stopping
+    the profiler requires a ``pid``.
+
+    Starting the profiler only works on requests that are served on the main
+    thread of the process, others are refused with a 409 as well. Once
+    started, all threads are sampled.
+
+    To profile an arbitrary process, use ``sentry profile --pid`` instead.
+    """
+
+    permission_classes = (SuperuserPermission,)
+
+    def serialize(self):
+        return {
+            "pid": os.getpid(),
+            "running": profiler.running,
+            "interval": profiler.interval,
+            "samples": profiler.sample_count,
+            "stacks": profiler.get_folded(),
+        }
+
+    def check_pid(self, pid):
+        """
+        Returns an error response if the request targets another process.
+        """
+        if pid is None:
+            return None
+        try:
+            pid = int(pid)
+        except (TypeError, ValueError):
+            return Response({"detail": "`pid` must be an integer"}, status=400)
+        if pid != os.getpid():
+            return Response(
+                {"detail": f"Served by another process than {pid}", "pid": os.getpid()},
+                status=409,
+            )
+        return None
+
+    def get(self, request):
+        error = self.check_pid(request.GET.get("pid"))
+        if error is not None:
+            return error
+        return Response(self.serialize())
+
+    def put(self, request):
+        pid = request.data.get("pid")
+        error = self.check_pid(pid)
+        if error is not None:
+            return error
+
+        running = request.data.get("running")
+        if not isinstance(running, bool):
+            return Response({"detail": "`running` must be a boolean"}, status=400)
+
+        if not running:
+            if pid is None:
+                return Response({"detail": "`pid` is required to stop the profiler"}, status=400)
+            profiler.stop()
+            return Response(self.serialize())
+
+        try:
+            interval = float(request.data.get("interval", DEFAULT_INTERVAL))
+        except (TypeError, ValueError):
+            return Response({"detail": "`interval` must be a number"}, status=400)
+        if not 0.001 <= interval <= 1:
+            return Response({"detail": "`interval` must be between 0.001 and 1"}, status=400)
+
+        if not profiler.running:
+            profiler.reset()
+            try:
+                profiler.start(interval)
+            except ValueError:
+                # Web workers serve requests on several threads, but signal
+                # handlers can only be installed from the main thread.
+                return Response(
+                    {
+                        "detail": "The profiler can only be started by a request that is "
+                        "served on the main thread of a process. Retry the request, or "
+                        "use `sentry profile --pid` instead.",
+                        "pid": os.getpid(),
+                    },
+                    status=409,
+                )
+
+        return Response(self.serialize())
@@ -6,10 +6,10 @@ from rest_framework.response import Response
 
 from sentry.api.bases.organization import OrganizationReleasesBaseEndpoint
 from sentry.api.exceptions import ResourceDoesNotExist
-from sentry.api.paginator import OffsetPaginator
+from sentry.api.paginator import KeysetPaginator
 from sentry.api.serializers import serialize
-from sentry.constants import MAX_RELEASE_FILES_OFFSET
 from sentry.models import Distribution, File, Release, ReleaseFile
+from sentry.utils.cursors import StringCursor
 
 ERR_FILE_EXISTS = "A file matching this name already exists for the given release"
 _filename_re = re.compile(r"[\n\t\r\f\v\\]")
@@ -63,9 +63,9 @@ class OrganizationReleaseFilesEndpoint(OrganizationReleasesBaseEndpoint):
         return self.paginate(
             request=request,
             queryset=file_list,
-            order_by="name",
-            paginator_cls=OffsetPaginator,
-            max_offset=MAX_RELEASE_FILES_OFFSET,
+            order_by=["name", "id"],
+            paginator_cls=KeysetPaginator,
+            cursor_cls=StringCursor,
             on_results=lambda r: serialize(load_dist(r), request.user),
         )
 
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from datetime import datetime
 
 from rest_framework.response import Response
@@ -43,23 +42,19 @@ class ProjectEventDetailsEndpoint(ProjectEndpoint):
             conditions = [["event.type", "!=", "transaction"]]
 
             if requested_environments:
-                conditions.append(["environment", "IN", requested_environments])
+                conditions.append(["environment", "IN", sorted(requested_environments)])
 
+            # Search the entire retention period
             _filter = eventstore.Filter(
                 conditions=conditions, project_ids=[event.project_id], group_ids=[event.group_id]
             )
 
-            # Ignore any time params and search entire retention period
-            next_event_filter = deepcopy(_filter)
-            next_event_filter.end = datetime.utcnow()
-            next_event = eventstore.get_next_event_id(event, filter=next_event_filter)
-
-            prev_event_filter = deepcopy(_filter)
-            prev_event_filter.start = datetime.utcfromtimestamp(0)
-            prev_event = eventstore.get_prev_event_id(event, filter=prev_event_filter)
+            adjacent_events = eventstore.get_adjacent_event_ids(
+                event, filter=_filter, which=("prev", "next")
+            )
 
-            next_event_id = next_event[1] if next_event else None
-            prev_event_id = prev_event[1] if prev_event else None
+            next_event_id = adjacent_events.next[1] if adjacent_events.next else None
+            prev_event_id = adjacent_events.prev[1] if adjacent_events.prev else None
 
         data["nextEventID"] = next_event_id
         data["previousEventID"] = prev_event_id
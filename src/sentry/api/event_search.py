@@ -1,5 +1,7 @@
 import re
-from collections import namedtuple
+import threading
+from collections import OrderedDict, namedtuple
+from copy import deepcopy
 from datetime import datetime
 
 from django.utils.functional import cached_property
@@ -19,6 +21,7 @@ from sentry.search.utils import (
     parse_numeric_value,
     parse_percentage,
 )
+from sentry.utils import metrics
 from sentry.utils.compat import filter, map
 from sentry.utils.snuba import is_duration_measurement, is_measurement, is_span_op_breakdown
 
@@ -293,6 +296,9 @@ class SearchVisitor(NodeVisitor):
     def __init__(self, allow_boolean=True, params=None):
         self.allow_boolean = allow_boolean
         self.params = params if params is not None else {}
+        # Set to False when the result depends on more than the query string,
+        # i.e. on ``params`` or on the current time.
+        self.is_cacheable = True
         super().__init__()
 
     @cached_property
@@ -472,6 +478,7 @@ class SearchVisitor(NodeVisitor):
         try:
             aggregate_value = None
             if search_value.expr_name in ["duration_format", "percentage_format"]:
+                self.is_cacheable = False
                 # Even if the search value matches duration format, only act as duration for certain columns
                 function = resolve_field(
                     search_key.name, self.params, functions_acl=FUNCTIONS.keys()
@@ -515,6 +522,7 @@ class SearchVisitor(NodeVisitor):
         operator = self.handle_negation(negation, operator)
         is_date_aggregate = any(key in search_key.name for key in self.date_keys)
         if is_date_aggregate:
+            self.is_cacheable = False
             try:
                 from_val, to_val = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
@@ -564,6 +572,7 @@ class SearchVisitor(NodeVisitor):
     def visit_rel_time_filter(self, node, children):
         (search_key, _, value) = children
         if search_key.name in self.date_keys:
+            self.is_cacheable = False
             try:
                 from_val, to_val = parse_datetime_range(value.text)
             except InvalidQuery as exc:
@@ -763,7 +772,56 @@ class SearchVisitor(NodeVisitor):
         return children or node
 
 
+class ParseCache:
+    """
+    A bounded LRU cache of parsed search queries.
+
+    Only results that depend solely on the query string and the visitor
+    configuration are stored. Results are copied on the way in and out, so
+    callers are free to mutate what they get back.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return None
+            self._data.move_to_end(key)
+        return deepcopy(value)
+
+    def set(self, key, value):
+        value = deepcopy(value)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+PARSE_CACHE_SIZE = 1000
+parse_cache = ParseCache(PARSE_CACHE_SIZE)
+
+
 def parse_search_query(query, allow_boolean=True, params=None):
+    cache_key = (SearchVisitor, allow_boolean, query)
+    result = parse_cache.get(cache_key)
+    if result is not None:
+        metrics.incr("event_search.parse_cache", tags={"result": "hit"}, sample_rate=0.1)
+        return result
+
     try:
         tree = event_search_grammar.parse(query)
     except IncompleteParseError as e:
@@ -776,4 +834,12 @@ def parse_search_query(query, allow_boolean=True, params=None):
                 "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
             )
         )
-    return SearchVisitor(allow_boolean, params=params).visit(tree)
+    visitor = SearchVisitor(allow_boolean, params=params)
+    result = visitor.visit(tree)
+
+    if visitor.is_cacheable:
+        parse_cache.set(cache_key, result)
+        metrics.incr("event_search.parse_cache", tags={"result": "miss"}, sample_rate=0.1)
+    else:
+        metrics.incr("event_search.parse_cache", tags={"result": "uncacheable"}, sample_rate=0.1)
+    return result
@@ -1,16 +1,19 @@
 import bisect
 import functools
 import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import datetime
 
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import connections
+from django.db.models import Q
 from django.db.models.functions import Lower
 from django.db.models.sql.datastructures import EmptyResultSet
 from django.utils import timezone
 
+from sentry.utils import json
 from sentry.utils.compat import map, zip
-from sentry.utils.cursors import Cursor, CursorResult, build_cursor
+from sentry.utils.cursors import Cursor, CursorResult, StringCursor, build_cursor
 
 quote_name = connections["default"].ops.quote_name
 
@@ -175,20 +178,44 @@ class BasePaginator:
         return cursor
 
     def count_hits(self, max_hits):
-        if not max_hits:
-            return 0
-        hits_query = self.queryset.values()[:max_hits].query
-        # clear out any select fields (include select_related) and pull just the id
-        hits_query.clear_select_clause()
-        hits_query.add_fields(["id"])
-        hits_query.clear_ordering(force_empty=True)
-        try:
-            h_sql, h_params = hits_query.sql_with_params()
-        except EmptyResultSet:
-            return 0
-        cursor = connections[self.queryset.db].cursor()
-        cursor.execute(f"SELECT COUNT(*) FROM ({h_sql}) as t", h_params)
-        return cursor.fetchone()[0]
+        return count_hits(self.queryset, max_hits)
+
+
+def count_hits(queryset, max_hits):
+    if not max_hits:
+        return 0
+    hits_query = queryset.values()[:max_hits].query
+    # clear out any select fields (include select_related) and pull just the id
+    hits_query.clear_select_clause()
+    hits_query.add_fields(["id"])
+    hits_query.clear_ordering(force_empty=True)
+    try:
+        h_sql, h_params = hits_query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    cursor = connections[queryset.db].cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM ({h_sql}) as t", h_params)
+    return cursor.fetchone()[0]
+
+
+def estimate_hits(queryset):
+    """
+    Returns the number of rows the postgres planner expects the query to
+    return. This is based on table statistics (``reltuples``) and is only an
+    approximation, but it is cheap regardless of the size of the result set.
+    """
+    query = queryset.query.chain()
+    query.clear_ordering(force_empty=True)
+    try:
+        sql, params = query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    cursor = connections[queryset.db].cursor()
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
 
 
 class Paginator(BasePaginator):
@@ -266,6 +293,142 @@ class OffsetPaginator:
         return CursorResult(results=results, next=next_cursor, prev=prev_cursor)
 
 
+class KeysetPaginator:
+    """
+    Paginates a queryset using the values of the last row of a page (a
+    "keyset") rather than an OFFSET, so that fetching a page costs the same
+    regardless of how deep into the result set it is.
+
+    ``order_by`` is a list of model fields, each optionally prefixed with
+    ``-`` for descending order. The fields must not be nullable. If the
+    ordering does not include the primary key it is appended as a tie-breaker,
+    which makes the ordering unique and the cursors stable.
+
+    Cursors have to be parsed with ``StringCursor``, their value is an opaque
+    encoding of the keyset.
+
+    When hits are counted and ``estimate_hits_threshold`` is set, the
+    planner's row estimate is used instead of an exact count once it reaches
+    the threshold.
+    """
+
+    cursor_cls = StringCursor
+
+    def __init__(
+        self,
+        queryset,
+        order_by,
+        max_limit=MAX_LIMIT,
+        on_results=None,
+        estimate_hits_threshold=None,
+    ):
+        if not isinstance(order_by, (list, tuple)):
+            order_by = (order_by,)
+        order_by = list(order_by)
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(key.lstrip("-") in (pk_name, "pk") for key in order_by):
+            order_by.append(("-" if order_by[-1].startswith("-") else "") + pk_name)
+
+        self.order_by = order_by
+        self.keys = [(key.lstrip("-"), key.startswith("-")) for key in order_by]
+        self.fields = [queryset.model._meta.get_field(name) for name, _ in self.keys]
+        self.queryset = queryset
+        self.max_limit = max_limit
+        self.on_results = on_results
+        self.estimate_hits_threshold = estimate_hits_threshold
+
+    def get_item_key(self, item):
+        if isinstance(item, dict):
+            values = [item[name] for name, _ in self.keys]
+        else:
+            values = [getattr(item, name) for name, _ in self.keys]
+        return self.encode_key(values)
+
+    def encode_key(self, values):
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        return urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_key(self, value):
+        try:
+            value = str(value)
+            values = json.loads(urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise BadPaginationError("Invalid cursor value")
+
+    def _build_keyset_filter(self, values, is_prev):
+        # (a, b, c) > (x, y, z) with per-key directions expands to
+        # a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        condition = Q()
+        equal = Q()
+        for (name, desc), value in zip(self.keys, values):
+            operator = "lt" if desc != is_prev else "gt"
+            condition |= equal & Q(**{f"{name}__{operator}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _build_queryset(self, values, is_prev):
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._build_keyset_filter(values, is_prev))
+
+        order_by = [name if desc == is_prev else f"-{name}" for name, desc in self.keys]
+        return queryset.order_by(*order_by)
+
+    def get_hits(self, max_hits):
+        if self.estimate_hits_threshold is not None:
+            estimate = estimate_hits(self.queryset)
+            if estimate >= self.estimate_hits_threshold:
+                return estimate
+        return count_hits(self.queryset, max_hits)
+
+    def get_result(self, limit=100, cursor=None, count_hits=False, known_hits=None, max_hits=None):
+        if cursor is None:
+            cursor = self.cursor_cls("", 0, False)
+
+        limit = min(limit, self.max_limit)
+        values = self.decode_key(cursor.value) if cursor.value else None
+
+        if max_hits is None:
+            max_hits = MAX_HITS_LIMIT
+        if count_hits:
+            hits = self.get_hits(max_hits)
+        elif known_hits is not None:
+            hits = known_hits
+        else:
+            hits = None
+
+        results = list(self._build_queryset(values, cursor.is_prev)[: limit + 1])
+        has_more = len(results) > limit
+        results = results[:limit]
+        if cursor.is_prev:
+            results.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = values is not None, has_more
+
+        if results:
+            prev_value = self.get_item_key(results[0])
+            next_value = self.get_item_key(results[-1])
+        else:
+            # Keep the position, there might be results there later on.
+            prev_value = next_value = cursor.value
+
+        if self.on_results:
+            results = self.on_results(results)
+
+        return CursorResult(
+            results=results,
+            next=self.cursor_cls(next_value, 0, False, has_next and bool(results)),
+            prev=self.cursor_cls(prev_value, 0, True, has_prev and bool(prev_value)),
+            hits=hits,
+            max_hits=max_hits if count_hits and hits is not None else None,
+        )
+
+
 class MergingOffsetPaginator(OffsetPaginator):
     """This paginator uses a function to first look up items from an
     independently paginated resource to only then fall back to a query set.
@@ -1262,13 +1262,25 @@ SENTRY_TSDB_ROLLUPS = (
     (3600 * 24, 90),  # 90 days at 1 day
 )
 
-# Internal metrics
+# Internal metrics. To aggregate metrics in-process before they are sent, see
+# `sentry.metrics.aggregating.AggregatingMetricsBackend`.
 SENTRY_METRICS_BACKEND = "sentry.metrics.dummy.DummyMetricsBackend"
 SENTRY_METRICS_OPTIONS = {}
 SENTRY_METRICS_SAMPLE_RATE = 1.0
 SENTRY_METRICS_PREFIX = "sentry."
 SENTRY_METRICS_SKIP_INTERNAL_PREFIXES = []  # Order this by most frequent prefixes.
 
+# Internal metrics (written to the internal TSDB model) are queued and written
+# in batches. Metrics are dropped while the queue is full.
+SENTRY_INTERNAL_METRICS_QUEUE_SIZE = 10000
+SENTRY_INTERNAL_METRICS_BATCH_SIZE = 1000
+SENTRY_INTERNAL_METRICS_FLUSH_INTERVAL = 1
+
+# The signal that starts and stops the sampling profiler of a process (see
+# `sentry profile`), e.g. "SIGUSR2". Pick one that is not used by the process
+# manager (uWSGI, Celery) of the process.
+SENTRY_PROFILER_SIGNAL = None
+
 # Render charts on the backend. This uses the Chartcuterie external service.
 SENTRY_CHART_RENDERER = "sentry.charts.chartcuterie.Chartcuterie"
 SENTRY_CHART_RENDERER_OPTIONS = {}
@@ -1319,6 +1331,11 @@ SENTRY_SOURCE_FETCH_MAX_SIZE = 40 * 1024 * 1024
 # e.g. memcached defaults to 1MB  = 1024 * 1024
 SENTRY_CACHE_MAX_VALUE_SIZE = None
 
+# Maximum size (in bytes, measured as the size of the raw files) of parsed
+# source maps and source files kept in memory by each processing worker to be
+# reused across events.  Set to 0 to disable.
+SENTRY_PARSED_SOURCE_CACHE_SIZE = 256 * 1024 * 1024
+
 # Fields which managed users cannot change via Sentry UI. Username and password
 # cannot be changed by managed users. Optionally include 'email' and
 # 'name' in SENTRY_MANAGED_USER_FIELDS.
@@ -2142,7 +2159,8 @@ SYMBOLICATOR_PROCESS_EVENT_HARD_TIMEOUT = 600
 SYMBOLICATOR_PROCESS_EVENT_WARN_TIMEOUT = 120
 
 # Block symbolicate_event for this many seconds to wait for a initial response
-# from symbolicator after the task submission.
+# from symbolicator after the task submission, as well as for every subsequent
+# poll of a pending task.
 SYMBOLICATOR_POLL_TIMEOUT = 10
 
 # When retrying symbolication requests or querying for the result this set the
@@ -2188,6 +2206,38 @@ SENTRY_REPROCESSING_ATTACHMENT_CHUNK_SIZE = 2 ** 20
 
 SENTRY_REPROCESSING_SYNC_REDIS_CLUSTER = "default"
 
+# Redis cluster used to track the progress of sharded deletions.
+SENTRY_DELETIONS_REDIS_CLUSTER = "default"
+
+# Redis cluster used to broadcast invalidations of process-local caches (see
+# `sentry.utils.invalidation`). Set to `None` to rely on expiry alone.
+SENTRY_CACHE_INVALIDATION_REDIS_CLUSTER = "default"
+
+# How long (in seconds) options are kept in the local cache of a process while
+# it is subscribed to invalidations. Changes are pushed to subscribed
+# processes, so this only bounds the damage of a dropped message. Processes
+# without a subscription use the TTL of the individual option instead.
+SENTRY_OPTIONS_SUBSCRIBED_TTL = 300
+
+# Maximum number of model instances kept in the process-wide cache of
+# `BaseManager.get_from_cache`, for models that opt in via
+# `process_cache_ttl`. Set to 0 to disable.
+SENTRY_MODEL_PROCESS_CACHE_SIZE = 10000
+
+# Redis cluster caching the `GroupHash` lookups of event ingestion (see
+# `sentry.grouphash_cache`), and the lifetime (in seconds) and maximum number
+# of hashes of its process-local tier. Set the size to 0 to disable the
+# process-local tier.
+SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER = "default"
+SENTRY_GROUPHASH_CACHE_LOCAL_TTL = 10
+SENTRY_GROUPHASH_CACHE_LOCAL_SIZE = 100000
+
+# Redis cluster used to coalesce concurrent group creation for the same new
+# hashes (see the `store.coalesce-group-creation` option), and the time (in
+# seconds) after which the leadership of a crashed process expires.
+SENTRY_GROUP_CREATION_REDIS_CLUSTER = "default"
+SENTRY_GROUP_CREATION_LEADER_TTL = 10
+
 # Timeout for the project counter statement execution.
 # In case of contention on the project counter, prevent workers saturation with
 # save_event tasks from single project.
@@ -1,11 +1,18 @@
 import copy
+import threading
+from collections import OrderedDict
 
 import sentry_relay
 from rest_framework import serializers
 
 from sentry.utils import json, metrics
+from sentry.utils.hashlib import md5_text
 from sentry.utils.safe import safe_execute
 
+#: Maximum number of projects whose PII configs are kept in the process-wide
+#: cache of ``get_cached_pii_configs``.
+PII_CONFIG_CACHE_SIZE = 1000
+
 
 def _escape_key(key):
     """
@@ -80,24 +87,127 @@ def get_all_pii_configs(project):
     yield sentry_relay.convert_datascrubbing_config(get_datascrubbing_settings(project))
 
 
-def scrub_data(project, event):
-    for config in get_all_pii_configs(project):
-        metrics.timing(
-            "datascrubbing.config.num_applications", len(config.get("applications") or ())
+def _get_pii_config_version(project):
+    """
+    Returns a fingerprint of all options the PII configs of ``project`` are
+    built from.
+    """
+    return md5_text(
+        json.dumps(
+            [
+                project.organization.get_option("sentry:relay_pii_config"),
+                project.get_option("sentry:relay_pii_config"),
+                get_datascrubbing_settings(project),
+            ],
+            sort_keys=True,
         )
-        total_rules = 0
-        for selector, rules in (config.get("applications") or {}).items():
-            metrics.timing("datascrubbing.config.selectors.size", len(selector))
-            metrics.timing("datascrubbing.config.rules_per_selector.size", len(rules))
-            total_rules += len(rules)
+    ).hexdigest()
+
+
+def _record_pii_config_metrics(config):
+    metrics.timing("datascrubbing.config.num_applications", len(config.get("applications") or ()))
+    total_rules = 0
+    for selector, rules in (config.get("applications") or {}).items():
+        metrics.timing("datascrubbing.config.selectors.size", len(selector))
+        metrics.timing("datascrubbing.config.rules_per_selector.size", len(rules))
+        total_rules += len(rules)
+
+    metrics.timing("datascrubbing.config.rules.size", total_rules)
+
+
+class PiiConfigCache:
+    """
+    A bounded LRU cache of the merged and converted PII configs of projects.
+
+    Entries are keyed by organization, project and a fingerprint of the
+    options they were built from, so that option changes take effect
+    immediately and stale entries simply age out.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return None
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
 
-        metrics.timing("datascrubbing.config.rules.size", total_rules)
 
+pii_config_cache = PiiConfigCache(PII_CONFIG_CACHE_SIZE)
+
+
+def get_cached_pii_configs(project):
+    """
+    Returns the configs of ``get_all_pii_configs`` as a tuple, building them
+    only if the relevant organization or project options changed since they
+    were last built in this process.
+
+    The returned configs are shared and must not be mutated.
+    """
+    cache_key = (project.organization_id, project.id, _get_pii_config_version(project))
+    configs = pii_config_cache.get(cache_key)
+    if configs is not None:
+        metrics.incr("datascrubbing.config.cache", tags={"result": "hit"}, sample_rate=0.1)
+        return configs
+
+    metrics.incr("datascrubbing.config.cache", tags={"result": "miss"}, sample_rate=0.1)
+    with metrics.timer("datascrubbing.config.build"):
+        configs = tuple(get_all_pii_configs(project))
+
+    # The configs only change when options change, so they are described
+    # once when they are built rather than for every scrubbed event.
+    for config in configs:
+        _record_pii_config_metrics(config)
+
+    pii_config_cache.set(cache_key, configs)
+    return configs
+
+
+def scrub_data(project, event):
+    for config in get_cached_pii_configs(project):
         event = sentry_relay.pii_strip_event(config, event)
 
     return event
 
 
+def scrub_data_batch(project, events):
+    """
+    Scrubs many events of the same project. Equivalent to calling
+    ``scrub_data`` for each event, but looks up the PII configs only once.
+
+    Returns a list of scrubbed events in the same order as ``events``.
+    """
+    configs = get_cached_pii_configs(project)
+    rv = []
+    for event in events:
+        for config in configs:
+            event = sentry_relay.pii_strip_event(config, event)
+        rv.append(event)
+
+    metrics.timing("datascrubbing.batch.size", len(rv))
+    return rv
+
+
 def _merge_pii_configs(prefixes_and_configs):
     """
     Merge two PII configs into one, prefixing all custom rules with a prefix in the name.
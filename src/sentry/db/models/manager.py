@@ -1,6 +1,9 @@
 import logging
+import pickle
 import threading
+import time
 import weakref
+from collections import OrderedDict
 from contextlib import contextmanager
 
 from celery.signals import task_postrun
@@ -12,6 +15,7 @@ from django.db.models.manager import Manager, QuerySet
 from django.db.models.signals import class_prepared, post_delete, post_init, post_save
 from django.utils.encoding import smart_text
 
+from sentry.utils import invalidation, metrics
 from sentry.utils.cache import cache
 from sentry.utils.compat import zip
 from sentry.utils.hashlib import md5_text
@@ -28,6 +32,76 @@ _local_cache_generation = 0
 _local_cache_enabled = False
 
 
+class ProcessCache:
+    """
+    A bounded, process-wide LRU of model instances with a TTL per entry.
+
+    Instances are stored pickled, so that every lookup hands out its own
+    copy that callers are free to mutate.
+    """
+
+    topic = "modelcache"
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return None
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return pickle.loads(value)
+
+    def set(self, key, instance, ttl):
+        max_size = settings.SENTRY_MODEL_PROCESS_CACHE_SIZE
+        if not max_size:
+            return
+
+        invalidation.ensure_subscribed()
+
+        # Ensure we don't serialize the database into the cache
+        db = instance._state.db
+        instance._state.db = None
+        try:
+            value = pickle.dumps(instance)
+        finally:
+            instance._state.db = db
+
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > max_size:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def invalidate(self, keys):
+        if keys is None:
+            self.clear()
+        else:
+            self.delete_many(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_process_cache = ProcessCache()
+invalidation.register(ProcessCache.topic, _process_cache.invalidate)
+
+
 def __prep_value(model, key, value):
     if isinstance(value, Model):
         value = value.pk
@@ -85,6 +159,11 @@ class BaseManager(Manager):
         #: project slug is not.
         self.cache_fields = kwargs.pop("cache_fields", [])
         self.cache_ttl = kwargs.pop("cache_ttl", 60 * 5)
+        #: If set, instances looked up through `get_from_cache` are
+        #: additionally kept in a process-wide cache for this many seconds.
+        #: Changes are broadcast to all processes, the TTL bounds staleness
+        #: if a broadcast is lost.
+        self.process_cache_ttl = kwargs.pop("process_cache_ttl", None)
         self._cache_version = kwargs.pop("cache_version", None)
         self.__local_cache = threading.local()
         super().__init__(*args, **kwargs)
@@ -116,6 +195,11 @@ class BaseManager(Manager):
 
         return _local_cache.cache
 
+    @staticmethod
+    def clear_process_cache():
+        """Drops all instances from the process-wide cache of this process."""
+        _process_cache.clear()
+
     def _get_cache(self):
         if not hasattr(self.__local_cache, "value"):
             self.__local_cache.value = weakref.WeakKeyDictionary()
@@ -156,6 +240,10 @@ class BaseManager(Manager):
             return
 
         post_init.connect(self.__post_init, sender=sender, weak=False)
+        if self.process_cache_ttl:
+            # needs to run before `__post_save` updates the tracked state
+            post_save.connect(self.__invalidate_process_cache, sender=sender, weak=False)
+            post_delete.connect(self.__invalidate_process_cache, sender=sender, weak=False)
         post_save.connect(self.__post_save, sender=sender, weak=False)
         post_delete.connect(self.__post_delete, sender=sender, weak=False)
 
@@ -241,6 +329,23 @@ class BaseManager(Manager):
             key=self.__get_lookup_cache_key(**{pk_name: instance.pk}), version=self.cache_version
         )
 
+    def __invalidate_process_cache(self, instance, **kwargs):
+        """
+        Drops instance from the process-wide caches of all processes.
+        """
+        pk_name = instance._meta.pk.name
+        keys = {self.__get_lookup_cache_key(**{pk_name: instance.pk})}
+        tracked_state = self.__cache.get(instance, {})
+        for key in self.cache_fields:
+            if key in ("pk", pk_name):
+                continue
+            keys.add(self.__get_lookup_cache_key(**{key: self.__value_for_field(instance, key)}))
+            if key in tracked_state:
+                keys.add(self.__get_lookup_cache_key(**{key: tracked_state[key]}))
+
+        _process_cache.delete_many(keys)
+        invalidation.publish(ProcessCache.topic, keys)
+
     def __get_lookup_cache_key(self, **kwargs):
         return make_key(self.model, "modelcache", kwargs)
 
@@ -291,40 +396,65 @@ class BaseManager(Manager):
                 if result is not None:
                     return result
 
-            retval = cache.get(cache_key, version=self.cache_version)
-            if retval is None:
-                result = self.get(**kwargs)
-                # Ensure we're pushing it into the cache
-                self.__post_save(instance=result)
-                if local_cache is not None:
-                    local_cache[cache_key] = result
-                return result
+            if self.process_cache_ttl:
+                result = _process_cache.get(cache_key)
+                self.__record_process_cache_lookup(hit=result is not None)
+                if result is not None:
+                    result._state.db = router.db_for_read(self.model, **kwargs)
+                    return result
 
-            # If we didn't look up by pk we need to hit the reffed
-            # key
-            if key != pk_name:
-                result = self.get_from_cache(**{pk_name: retval})
-                if local_cache is not None:
-                    local_cache[cache_key] = result
+                result = self.__get_from_remote_cache(cache_key, key, value, **kwargs)
+                _process_cache.set(cache_key, result, self.process_cache_ttl)
                 return result
 
-            if not isinstance(retval, self.model):
-                if settings.DEBUG:
-                    raise ValueError("Unexpected value type returned from cache")
-                logger.error("Cache response returned invalid value %r", retval)
-                return self.get(**kwargs)
+            return self.__get_from_remote_cache(cache_key, key, value, **kwargs)
+        else:
+            raise ValueError("We cannot cache this query. Just hit the database.")
 
-            if key == pk_name and int(value) != retval.pk:
-                if settings.DEBUG:
-                    raise ValueError("Unexpected value returned from cache")
-                logger.error("Cache response returned invalid value %r", retval)
-                return self.get(**kwargs)
+    def __record_process_cache_lookup(self, hit, amount=1):
+        metrics.incr(
+            "modelcache.process_cache",
+            amount=amount,
+            tags={"model": self.model.__name__, "result": "hit" if hit else "miss"},
+            sample_rate=0.1,
+        )
 
-            retval._state.db = router.db_for_read(self.model, **kwargs)
+    def __get_from_remote_cache(self, cache_key, key, value, **kwargs):
+        pk_name = self.model._meta.pk.name
+        local_cache = self._get_local_cache()
 
-            return retval
-        else:
-            raise ValueError("We cannot cache this query. Just hit the database.")
+        retval = cache.get(cache_key, version=self.cache_version)
+        if retval is None:
+            result = self.get(**kwargs)
+            # Ensure we're pushing it into the cache
+            self.__post_save(instance=result)
+            if local_cache is not None:
+                local_cache[cache_key] = result
+            return result
+
+        # If we didn't look up by pk we need to hit the reffed
+        # key
+        if key != pk_name:
+            result = self.get_from_cache(**{pk_name: retval})
+            if local_cache is not None:
+                local_cache[cache_key] = result
+            return result
+
+        if not isinstance(retval, self.model):
+            if settings.DEBUG:
+                raise ValueError("Unexpected value type returned from cache")
+            logger.error("Cache response returned invalid value %r", retval)
+            return self.get(**kwargs)
+
+        if key == pk_name and int(value) != retval.pk:
+            if settings.DEBUG:
+                raise ValueError("Unexpected value returned from cache")
+            logger.error("Cache response returned invalid value %r", retval)
+            return self.get(**kwargs)
+
+        retval._state.db = router.db_for_read(self.model, **kwargs)
+
+        return retval
 
     def get_many_from_cache(self, values, key="pk"):
         """
@@ -359,18 +489,60 @@ class BaseManager(Manager):
         cache_lookup_values = []
 
         local_cache = self._get_local_cache()
+        process_cache_hits = 0
         for value in values:
             cache_key = self.__get_lookup_cache_key(**{key: value})
             result = local_cache and local_cache.get(cache_key)
+            if result is None and self.process_cache_ttl:
+                result = _process_cache.get(cache_key)
+                if result is not None:
+                    process_cache_hits += 1
+                    result._state.db = router.db_for_read(self.model)
             if result is not None:
                 final_results.append(result)
             else:
                 cache_lookup_cache_keys.append(cache_key)
                 cache_lookup_values.append(value)
 
+        if self.process_cache_ttl:
+            if process_cache_hits:
+                self.__record_process_cache_lookup(hit=True, amount=process_cache_hits)
+            if cache_lookup_cache_keys:
+                self.__record_process_cache_lookup(hit=False, amount=len(cache_lookup_cache_keys))
+
         if not cache_lookup_cache_keys:
             return final_results
 
+        num_cached = len(final_results)
+        results = self.__get_many_from_remote_cache(
+            key, cache_lookup_cache_keys, cache_lookup_values, final_results
+        )
+
+        if self.process_cache_ttl:
+            for result in results[num_cached:]:
+                _process_cache.set(
+                    self.__get_lookup_cache_key(**{key: getattr(result, key)}),
+                    result,
+                    self.process_cache_ttl,
+                )
+
+        return results
+
+    def prefetch_from_cache(self, values, key="pk"):
+        """
+        Warms the caches for all of ``values`` with a single cache round trip
+        (and at most one database query), so that subsequent calls to
+        `get_from_cache` for any of them are served from the process-wide
+        (or request-local) cache.
+        """
+        self.get_many_from_cache(values, key=key)
+
+    def __get_many_from_remote_cache(
+        self, key, cache_lookup_cache_keys, cache_lookup_values, final_results
+    ):
+        pk_name = self.model._meta.pk.name
+        local_cache = self._get_local_cache()
+
         cache_results = cache.get_many(cache_lookup_cache_keys, version=self.cache_version)
 
         db_lookup_cache_keys = []
@@ -450,6 +622,9 @@ class BaseManager(Manager):
         pk_name = self.model._meta.pk.name
         cache_key = self.__get_lookup_cache_key(**{pk_name: instance_id})
         cache.delete(cache_key, version=self.cache_version)
+        if self.process_cache_ttl:
+            _process_cache.delete_many([cache_key])
+            invalidation.publish(ProcessCache.topic, [cache_key])
 
     def post_save(self, instance, **kwargs):
         """
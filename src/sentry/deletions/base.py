@@ -17,12 +17,16 @@ class BaseRelation:
 
 
 class ModelRelation(BaseRelation):
-    def __init__(self, model, query, task=None, partition_key=None):
+    def __init__(self, model, query, task=None, partition_key=None, num_shards=None):
         params = {"model": model, "query": query}
 
         if partition_key:
             params["partition_key"] = partition_key
 
+        # When set, the relation is deleted by ``num_shards`` tasks running in
+        # parallel instead of inline (see ``sentry.deletions.sharding``).
+        self.num_shards = num_shards if num_shards and num_shards > 1 else None
+
         super().__init__(params=params, task=task)
 
 
@@ -118,6 +122,14 @@ class BaseDeletionTask:
     def delete_children(self, relations):
         # Ideally this runs through the deletion manager
         for relation in relations:
+            if getattr(relation, "num_shards", None) and self.transaction_id:
+                from sentry.deletions import sharding
+
+                # Wait for all shards to finish, then sweep up whatever was
+                # created in the meantime inline.
+                if sharding.schedule_shards(relation, self.transaction_id, self.actor_id):
+                    return True
+
             task = self.manager.get(
                 transaction_id=self.transaction_id,
                 actor_id=self.actor_id,
@@ -187,7 +199,9 @@ class ModelDeletionTask(BaseDeletionTask):
             if not queryset:
                 return False
 
-            self.delete_bulk(queryset)
+            if self.delete_bulk(queryset):
+                # Children are still being deleted elsewhere, check back later.
+                return True
             remaining -= query_limit
         return True
 
@@ -1,3 +1,5 @@
+from sentry import options
+
 from ..base import BulkModelDeletionTask, ModelDeletionTask, ModelRelation
 
 
@@ -60,11 +62,21 @@ class ProjectDeletionTask(ModelDeletionTask):
             ]
         )
 
+        # Groups make up the bulk of a large project and are deleted in
+        # parallel shards if enabled
+        relations.append(
+            ModelRelation(
+                models.Group,
+                {"project_id": instance.id},
+                ModelDeletionTask,
+                num_shards=options.get("deletions.project.group-shards"),
+            )
+        )
+
         # in bulk
         # Release needs to handle deletes after Group is cleaned up as the foreign
         # key is protected
         model_list = (
-            models.Group,
             models.ReleaseProject,
             models.ReleaseProjectEnvironment,
             models.ProjectDebugFile,
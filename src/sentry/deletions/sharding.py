@@ -0,0 +1,143 @@
+"""
+Parallel execution of large child relations.
+
+By default a deletion task walks its child relations depth-first and deletes
+each relation to completion before moving on to the next one, all within the
+task that owns the parent object. For relations that hold millions of rows
+(groups of a project, for instance) this means a single task runs for days.
+
+A ``ModelRelation`` that is created with ``num_shards`` is instead split into
+``num_shards`` disjoint partitions (using the ``num_shards`` / ``shard_id``
+support of ``ModelDeletionTask.chunk``) and every partition is deleted by its
+own ``run_sharded_deletion`` task. The number of outstanding shards is tracked
+in redis, the parent task reschedules itself until all shards have reported
+back and then does a final inline sweep of the relation.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import connections, router
+
+from sentry import options
+from sentry.utils import metrics
+from sentry.utils.redis import redis_clusters
+
+logger = logging.getLogger("sentry.deletions.async")
+
+# Shards that did not report back within this time are considered lost and
+# are scheduled again by the parent task.
+_REDIS_SHARDS_TTL = 60 * 60 * 24
+
+
+def _get_redis_client():
+    return redis_clusters.get(settings.SENTRY_DELETIONS_REDIS_CLUSTER)
+
+
+def _get_pending_key(transaction_id, model):
+    return f"deletions:shards:{transaction_id}:{model._meta.app_label}.{model._meta.model_name}"
+
+
+def get_pending_shards(transaction_id, model):
+    """
+    Returns the number of shards of ``model`` that are still running for the
+    deletion identified by ``transaction_id``, or ``None`` if the shards have
+    not been scheduled yet.
+    """
+    pending = _get_redis_client().get(_get_pending_key(transaction_id, model))
+    if pending is None:
+        return None
+    return int(pending)
+
+
+def schedule_shards(relation, transaction_id, actor_id=None):
+    """
+    Fans out the deletion of ``relation`` into one task per shard. Returns
+    ``True`` while any of the shards is still running.
+    """
+    from sentry.tasks.deletion import run_sharded_deletion
+
+    model = relation.params["model"]
+    key = _get_pending_key(transaction_id, model)
+    client = _get_redis_client()
+
+    pending = client.get(key)
+    if pending is not None:
+        return int(pending) > 0
+
+    # Only one parent task may schedule the shards of a relation.
+    if not client.set(key, relation.num_shards, ex=_REDIS_SHARDS_TTL, nx=True):
+        return True
+
+    task = relation.task
+    for shard_id in range(relation.num_shards):
+        run_sharded_deletion.apply_async(
+            kwargs={
+                "app_label": model._meta.app_label,
+                "model_name": model._meta.model_name,
+                "query": relation.params["query"],
+                "num_shards": relation.num_shards,
+                "shard_id": shard_id,
+                "transaction_id": transaction_id,
+                "actor_id": actor_id,
+                "task": f"{task.__module__}.{task.__name__}" if task is not None else None,
+            }
+        )
+
+    metrics.incr(
+        "deletions.sharded.scheduled",
+        amount=relation.num_shards,
+        tags={"model": model.__name__},
+    )
+    logger.info(
+        "object.delete.sharded",
+        extra={
+            "transaction_id": transaction_id,
+            "app_label": model._meta.app_label,
+            "model": model.__name__,
+            "num_shards": relation.num_shards,
+        },
+    )
+
+    # The shards might have completed synchronously (e.g. when tasks are
+    # executed eagerly).
+    return int(client.get(key) or 0) > 0
+
+
+def mark_shard_complete(transaction_id, model):
+    key = _get_pending_key(transaction_id, model)
+    with _get_redis_client().pipeline() as pipe:
+        pipe.decr(key)
+        pipe.expire(key, _REDIS_SHARDS_TTL)
+        pending, _ = pipe.execute()
+
+    metrics.incr("deletions.sharded.completed", tags={"model": model.__name__})
+    return pending
+
+
+def _get_active_query_count(model):
+    with connections[router.db_for_write(model)].cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE state = 'active'")
+        return cursor.fetchone()[0]
+
+
+def get_throttle_delay(model):
+    """
+    Returns the countdown (in seconds) before the next chunk of a shard may
+    run. Backs off when the database that holds ``model`` is busy.
+    """
+    delay = options.get("deletions.sharded.chunk-delay")
+    max_active_queries = options.get("deletions.sharded.max-active-queries")
+    if not max_active_queries:
+        return delay
+
+    try:
+        active_queries = _get_active_query_count(model)
+    except Exception:
+        logger.exception("deletions.sharded.load-check-failed")
+        return delay
+
+    if active_queries > max_active_queries:
+        metrics.incr("deletions.sharded.throttled", tags={"model": model.__name__})
+        return options.get("deletions.sharded.backoff-delay")
+    return delay
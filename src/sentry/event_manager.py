@@ -13,7 +13,17 @@ from django.db.models import Func
 from django.utils.encoding import force_text
 from pytz import UTC
 
-from sentry import buffer, eventstore, eventstream, eventtypes, features, options, quotas, tsdb
+from sentry import (
+    buffer,
+    eventstore,
+    eventstream,
+    eventtypes,
+    features,
+    grouphash_cache,
+    options,
+    quotas,
+    tsdb,
+)
 from sentry.attachments import MissingAttachmentChunks, attachment_cache
 from sentry.constants import (
     DEFAULT_STORE_NORMALIZER_ARGS,
@@ -71,8 +81,10 @@ from sentry.tasks.integrations import kick_off_status_syncs
 from sentry.utils import json, metrics
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.canonical import CanonicalKeyDict
+from sentry.utils.coalescing import CoalescedOperation
 from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.outcomes import Outcome, track_outcome
+from sentry.utils.redis import redis_clusters
 from sentry.utils.safe import get_path, safe_execute, setdefault_path, trim
 
 logger = logging.getLogger("sentry.events")
@@ -921,10 +933,37 @@ def get_culprit(data):
 def _save_aggregate(event, flat_hashes, hierarchical_hashes, release, **kwargs):
     project = event.project
 
+    # Hierarchical hashes can be split, which the cache does not know about.
+    use_grouphash_cache = not hierarchical_hashes and options.get("store.grouphash-cache-enabled")
+    if use_grouphash_cache:
+        cache_generation, cached_grouphashes = grouphash_cache.get_many(project.id, flat_hashes)
+        existing_group_id = _find_cached_group_id(flat_hashes, cached_grouphashes)
+
+        if existing_group_id is not None:
+            try:
+                group = Group.objects.get(id=existing_group_id)
+            except Group.DoesNotExist:
+                # The group was deleted without invalidating the cache.
+                grouphash_cache.invalidate([project.id])
+                cache_generation = None
+            else:
+                metrics.incr(
+                    "event_manager.grouphash_cache.queries_avoided",
+                    amount=len(flat_hashes) + 1,
+                    skip_internal=True,
+                )
+                is_regression = _process_existing_aggregate(
+                    group=group, event=event, data=kwargs, release=release
+                )
+                return group, False, is_regression
+
     flat_grouphashes = [
         GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in flat_hashes
     ]
 
+    if use_grouphash_cache:
+        grouphash_cache.set_many(project.id, cache_generation, flat_grouphashes)
+
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
     # which case `root_hierarchical_hash = hierarchical_hashes[n + 1]`. Chosing
@@ -947,83 +986,111 @@ def _save_aggregate(event, flat_hashes, hierarchical_hashes, release, **kwargs):
         if project.id in (options.get("store.load-shed-group-creation-projects") or ()):
             raise HashDiscarded("Load shedding group creation")
 
-        with sentry_sdk.start_span(
-            op="event_manager.create_group_transaction"
-        ) as span, metrics.timer(
-            "event_manager.create_group_transaction"
-        ) as metric_tags, transaction.atomic():
-            span.set_tag("create_group_transaction.outcome", "no_group")
-            metric_tags["create_group_transaction.outcome"] = "no_group"
-
-            all_hash_ids = [h.id for h in flat_grouphashes]
-            if root_hierarchical_grouphash is not None:
-                all_hash_ids.append(root_hierarchical_grouphash.id)
-
-            all_hashes = list(GroupHash.objects.filter(id__in=all_hash_ids).select_for_update())
-
-            flat_grouphashes = [gh for gh in all_hashes if gh.hash in flat_hashes]
-
+        group_creation = _get_group_creation_operation(project, flat_hashes, root_hierarchical_hash)
+        is_leader = group_creation.try_lead() if group_creation is not None else None
+
+        if is_leader is False and group_creation.wait(
+            options.get("store.coalesce-group-creation-timeout")
+        ):
+            # Another process has just tried to create the group for these
+            # hashes. Read them again without locks, in most cases they point
+            # to the new group now and the transaction below can be skipped.
+            flat_grouphashes = list(
+                GroupHash.objects.filter(id__in=[h.id for h in flat_grouphashes])
+            )
             existing_group_id, root_hierarchical_hash = _find_existing_group_id(
                 project, flat_grouphashes, hierarchical_hashes
             )
+            metrics.incr(
+                "event_manager.coalesce_group_creation.followed",
+                tags={"found_group": existing_group_id is not None},
+            )
 
-            if root_hierarchical_hash is not None:
-                root_hierarchical_grouphash = GroupHash.objects.get_or_create(
-                    project=project, hash=root_hierarchical_hash
-                )[0]
-            else:
-                root_hierarchical_grouphash = None
-
-            if existing_group_id is None:
-
-                try:
-                    short_id = project.next_short_id()
-                except OperationalError:
-                    metrics.incr(
-                        "next_short_id.timeout",
-                        tags={"platform": event.platform or "unknown"},
+        if existing_group_id is None:
+            try:
+                with sentry_sdk.start_span(
+                    op="event_manager.create_group_transaction"
+                ) as span, metrics.timer(
+                    "event_manager.create_group_transaction"
+                ) as metric_tags, transaction.atomic():
+                    span.set_tag("create_group_transaction.outcome", "no_group")
+                    metric_tags["create_group_transaction.outcome"] = "no_group"
+
+                    all_hash_ids = [h.id for h in flat_grouphashes]
+                    if root_hierarchical_grouphash is not None:
+                        all_hash_ids.append(root_hierarchical_grouphash.id)
+
+                    all_hashes = list(
+                        GroupHash.objects.filter(id__in=all_hash_ids).select_for_update()
                     )
-                    sentry_sdk.capture_message("short_id.timeout")
-                    raise HashDiscarded("Timeout when getting next_short_id")
-
-                # it's possible the release was deleted between
-                # when we queried for the release and now, so
-                # make sure it still exists
-                first_release = kwargs.pop("first_release", None)
-
-                group = Group.objects.create(
-                    project=project,
-                    short_id=short_id,
-                    first_release_id=Release.objects.filter(id=first_release.id)
-                    .values_list("id", flat=True)
-                    .first()
-                    if first_release
-                    else None,
-                    **kwargs,
-                )
-
-                if root_hierarchical_grouphash is not None:
-                    new_hashes = [root_hierarchical_grouphash]
-                else:
-                    new_hashes = list(flat_grouphashes)
-
-                GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
-                    state=GroupHash.State.LOCKED_IN_MIGRATION
-                ).update(group=group)
 
-                is_new = True
-                is_regression = False
+                    flat_grouphashes = [gh for gh in all_hashes if gh.hash in flat_hashes]
 
-                span.set_tag("create_group_transaction.outcome", "new_group")
-                metric_tags["create_group_transaction.outcome"] = "new_group"
-
-                metrics.incr(
-                    "group.created",
-                    skip_internal=True,
-                    tags={"platform": event.platform or "unknown"},
-                )
+                    existing_group_id, root_hierarchical_hash = _find_existing_group_id(
+                        project, flat_grouphashes, hierarchical_hashes
+                    )
 
-                return group, is_new, is_regression
+                    if root_hierarchical_hash is not None:
+                        root_hierarchical_grouphash = GroupHash.objects.get_or_create(
+                            project=project, hash=root_hierarchical_hash
+                        )[0]
+                    else:
+                        root_hierarchical_grouphash = None
+
+                    if existing_group_id is None:
+
+                        try:
+                            short_id = project.next_short_id()
+                        except OperationalError:
+                            metrics.incr(
+                                "next_short_id.timeout",
+                                tags={"platform": event.platform or "unknown"},
+                            )
+                            sentry_sdk.capture_message("short_id.timeout")
+                            raise HashDiscarded("Timeout when getting next_short_id")
+
+                        # it's possible the release was deleted between
+                        # when we queried for the release and now, so
+                        # make sure it still exists
+                        first_release = kwargs.pop("first_release", None)
+
+                        group = Group.objects.create(
+                            project=project,
+                            short_id=short_id,
+                            first_release_id=Release.objects.filter(id=first_release.id)
+                            .values_list("id", flat=True)
+                            .first()
+                            if first_release
+                            else None,
+                            **kwargs,
+                        )
+
+                        if root_hierarchical_grouphash is not None:
+                            new_hashes = [root_hierarchical_grouphash]
+                        else:
+                            new_hashes = list(flat_grouphashes)
+
+                        GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
+                            state=GroupHash.State.LOCKED_IN_MIGRATION
+                        ).update(group=group)
+
+                        is_new = True
+                        is_regression = False
+
+                        span.set_tag("create_group_transaction.outcome", "new_group")
+                        metric_tags["create_group_transaction.outcome"] = "new_group"
+
+                        metrics.incr(
+                            "group.created",
+                            skip_internal=True,
+                            tags={"platform": event.platform or "unknown"},
+                        )
+
+                        return group, is_new, is_regression
+            finally:
+                if is_leader:
+                    # Wake up the followers once the new group is committed.
+                    group_creation.release()
 
     group = Group.objects.get(id=existing_group_id)
 
@@ -1070,6 +1137,46 @@ def _save_aggregate(event, flat_hashes, hierarchical_hashes, release, **kwargs):
     return group, is_new, is_regression
 
 
+def _get_group_creation_operation(project, flat_hashes, root_hierarchical_hash):
+    """
+    Returns the coalesced operation that creates the group for a new set of
+    hashes, or ``None`` if group creation is not coalesced. Events are
+    coalesced on the hash that ``_save_aggregate`` locks first.
+    """
+    if not options.get("store.coalesce-group-creation"):
+        return None
+
+    lock_hash = root_hierarchical_hash or (flat_hashes[0] if flat_hashes else None)
+    if lock_hash is None:
+        return None
+
+    return CoalescedOperation(
+        redis_clusters.get(settings.SENTRY_GROUP_CREATION_REDIS_CLUSTER),
+        f"group-creation:{project.id}:{lock_hash}",
+        ttl=settings.SENTRY_GROUP_CREATION_LEADER_TTL,
+    )
+
+
+def _find_cached_group_id(flat_hashes, cached_grouphashes):
+    """
+    Resolves the group of an event from cached ``GroupHash`` rows, following
+    the same rules as ``_find_existing_group_id``. Returns ``None`` unless
+    the cache alone is sufficient, that is, all hashes are cached and
+    associated with a group.
+    """
+    if not flat_hashes or len(cached_grouphashes) < len(flat_hashes):
+        return None
+
+    first = cached_grouphashes[flat_hashes[0]]
+    if first.group_id is None and first.group_tombstone_id is not None:
+        raise HashDiscarded("Matches group tombstone %s" % first.group_tombstone_id)
+
+    if any(cached_grouphashes[hash].group_id is None for hash in flat_hashes):
+        return None
+
+    return first.group_id
+
+
 def _find_existing_group_id(
     project,
     flat_grouphashes,
@@ -1,6 +1,10 @@
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from itertools import islice
 
 import sentry_sdk
+from django.db import connections
 
 from sentry import nodestore
 from sentry.snuba.events import Columns
@@ -8,6 +12,14 @@ from sentry.utils.services import Service
 
 from .models import Event
 
+AdjacentEventIds = namedtuple("AdjacentEventIds", ("earliest", "prev", "next", "latest"))
+
+# Shared by all ``iter_bind_nodes`` calls of a process, this bounds the number
+# of concurrent nodestore requests.
+BIND_NODES_CONCURRENCY = 4
+
+_bind_nodes_pool = ThreadPoolExecutor(max_workers=BIND_NODES_CONCURRENCY)
+
 
 class Filter:
     """
@@ -120,7 +132,9 @@ class EventStorage(Service):
         "get_next_event_id",
         "get_earliest_event_id",
         "get_latest_event_id",
+        "get_adjacent_event_ids",
         "bind_nodes",
+        "iter_bind_nodes",
     )
 
     # The minimal list of columns we need to get from snuba to bootstrap an
@@ -229,6 +243,20 @@ class EventStorage(Service):
         """
         raise NotImplementedError
 
+    def get_adjacent_event_ids(self, event, snuba_filter, which=AdjacentEventIds._fields):  # NOQA
+        """
+        Gets the earliest, previous, next and latest event given a current
+        event and some conditions/filters, all at once. Returns an
+        ``AdjacentEventIds`` tuple of (project_id, event_id) tuples, or
+        ``None`` for each event that does not exist or was not requested.
+
+        Arguments:
+        event (Event): Event object
+        snuba_filter (Filter): Filter
+        which (Sequence[str]): The fields of ``AdjacentEventIds`` to resolve
+        """
+        raise NotImplementedError
+
     def create_event(self, project_id=None, event_id=None, group_id=None, data=None):
         """
         Returns an Event from processed data
@@ -260,3 +288,44 @@ class EventStorage(Service):
             for item, node in object_node_list:
                 data = node_results.get(node.id) or {}
                 node.bind_data(data, ref=node.get_ref(item))
+
+    def iter_bind_nodes(self, object_list, node_name="data", page_size=100, max_prefetch=1000):
+        """
+        Streaming version of ``bind_nodes`` for large scans. ``object_list``
+        can be any iterable of Event objects, including a generator that runs
+        further Snuba queries as it is consumed.
+
+        Yields lists of up to ``page_size`` objects after their nodes have
+        been bound. While a page is being consumed, the nodes of the
+        following pages are fetched in the background, until at most
+        ``max_prefetch`` objects are fetched ahead of the consumer.
+        """
+        objects = iter(object_list)
+        pending = deque()
+        pending_count = 0
+
+        def bind_page(page):
+            try:
+                self.bind_nodes(page, node_name)
+            finally:
+                # Nodestore backends may use the database, and pool threads
+                # must not keep connections open.
+                connections.close_all()
+
+        while True:
+            page = list(islice(objects, page_size))
+            if page:
+                pending.append((page, _bind_nodes_pool.submit(bind_page, page)))
+                pending_count += len(page)
+
+            # Hand out pages as soon as enough is prefetched, or there is
+            # nothing left to prefetch.
+            while pending and (not page or pending_count >= max_prefetch):
+                ready, future = pending.popleft()
+                with sentry_sdk.start_span(op="eventstore.base.iter_bind_nodes.wait"):
+                    future.result()
+                pending_count -= len(ready)
+                yield ready
+
+            if not page:
+                return
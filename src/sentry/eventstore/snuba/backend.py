@@ -4,9 +4,11 @@ from datetime import timedelta
 
 import sentry_sdk
 
-from sentry.eventstore.base import EventStorage
+from sentry.eventstore.base import AdjacentEventIds, EventStorage
 from sentry.snuba.events import Columns
-from sentry.utils import snuba
+from sentry.utils import json, metrics, snuba
+from sentry.utils.cache import cache
+from sentry.utils.hashlib import md5_text
 from sentry.utils.validators import normalize_event_id
 
 from ..models import Event
@@ -22,6 +24,9 @@ DEFAULT_OFFSET = 0
 
 NODESTORE_LIMIT = 100
 
+# Neighbours of an event rarely change, but new events keep arriving.
+ADJACENT_EVENT_IDS_CACHE_TTL = 30
+
 logger = logging.getLogger(__name__)
 
 
@@ -263,36 +268,115 @@ class SnubaEventStorage(EventStorage):
     def __get_columns(self):
         return [col.value.event_name for col in EventStorage.minimal_columns]
 
-    def __get_event_id_from_filter(self, filter=None, orderby=None):  # NOQA
-        columns = [Columns.EVENT_ID.value.alias, Columns.PROJECT_ID.value.alias]
+    def get_adjacent_event_ids(self, event, filter, which=AdjacentEventIds._fields):  # NOQA
+        """
+        Returns the earliest, previous, next and latest event of ``filter``
+        relative to ``event``, resolved with a single bulk query to Snuba.
+        Only the events named in ``which`` are queried, the others are
+        ``None``. The start and end of ``filter`` bound the earliest/previous
+        and the next/latest event respectively, and default to the whole
+        retention period. Results are cached for a short time.
+        """
+        assert filter, "You must provide a filter"  # NOQA
+
+        which = [field for field in AdjacentEventIds._fields if field in which]
+        if not event or not which:
+            return AdjacentEventIds(None, None, None, None)
+
+        cache_key = self.__get_adjacent_event_ids_cache_key(event, filter, which)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            metrics.incr("eventstore.adjacent_event_ids.cache", tags={"result": "hit"})
+            return AdjacentEventIds(*[tuple(ids) if ids else None for ids in cached])
+        metrics.incr("eventstore.adjacent_event_ids.cache", tags={"result": "miss"})
+
+        before_filter = deepcopy(filter)  # NOQA
+        before_filter.conditions = (filter.conditions or []) + get_before_event_condition(event)
+        before_filter.end = event.datetime
+
+        after_filter = deepcopy(filter)  # NOQA
+        after_filter.conditions = (filter.conditions or []) + get_after_event_condition(event)
+        after_filter.start = event.datetime
+
+        queries = {
+            "earliest": (before_filter, ASC_ORDERING),
+            "prev": (before_filter, DESC_ORDERING),
+            "next": (after_filter, ASC_ORDERING),
+            "latest": (after_filter, DESC_ORDERING),
+        }
+        queries = [queries[field] for field in which]
+
+        try:
+            results = snuba.bulk_aliased_query(
+                [self.__get_event_id_query(deepcopy(f), orderby) for f, orderby in queries],
+                referrer="eventstore.get_adjacent_event_ids",
+            )
+        except (snuba.QueryOutsideRetentionError, snuba.QueryOutsideGroupActivityError):
+            # One of the time ranges is impossible, which would fail the
+            # entire bulk query. Resolve them one by one instead.
+            results = [
+                self.__get_event_id_result(filter=deepcopy(f), orderby=orderby)
+                for f, orderby in queries
+            ]
+
+        event_ids = dict(zip(which, map(self.__get_event_id_from_result, results)))
+        rv = AdjacentEventIds(*[event_ids.get(field) for field in AdjacentEventIds._fields])
+        cache.set(cache_key, list(rv), ADJACENT_EVENT_IDS_CACHE_TTL)
+        return rv
+
+    def __get_adjacent_event_ids_cache_key(self, event, filter, which):  # NOQA
+        key = json.dumps(
+            [
+                which,
+                event.project_id,
+                event.event_id,
+                filter.conditions,
+                filter.filter_keys,
+                filter.start,
+                filter.end,
+            ]
+        )
+        return f"eventstore:adjacent-event-ids:{md5_text(key).hexdigest()}"
 
+    def __get_event_id_query(self, filter, orderby):  # NOQA
+        return dict(
+            selected_columns=[Columns.EVENT_ID.value.alias, Columns.PROJECT_ID.value.alias],
+            conditions=filter.conditions,
+            filter_keys=filter.filter_keys,
+            start=filter.start,
+            end=filter.end,
+            limit=1,
+            orderby=orderby,
+            dataset=snuba.Dataset.Discover,
+        )
+
+    def __get_event_id_result(self, filter=None, orderby=None):  # NOQA
         try:
             # This query uses the discover dataset to enable
             # getting events across both errors and transactions, which is
             # required when doing pagination in discover
-            result = snuba.aliased_query(
-                selected_columns=columns,
-                conditions=filter.conditions,
-                filter_keys=filter.filter_keys,
-                start=filter.start,
-                end=filter.end,
-                limit=1,
+            return snuba.aliased_query(
                 referrer="eventstore.get_next_or_prev_event_id",
-                orderby=orderby,
-                dataset=snuba.Dataset.Discover,
+                **self.__get_event_id_query(filter, orderby),
             )
         except (snuba.QueryOutsideRetentionError, snuba.QueryOutsideGroupActivityError):
             # This can happen when the date conditions for paging
             # and the current event generate impossible conditions.
             return None
 
-        if "error" in result or len(result["data"]) == 0:
+    def __get_event_id_from_result(self, result):
+        if result is None or "error" in result or len(result["data"]) == 0:
             return None
 
         row = result["data"][0]
 
         return (str(row["project_id"]), str(row["event_id"]))
 
+    def __get_event_id_from_filter(self, filter=None, orderby=None):  # NOQA
+        return self.__get_event_id_from_result(
+            self.__get_event_id_result(filter=filter, orderby=orderby)
+        )
+
     def __make_event(self, snuba_data):
         event_id = snuba_data[Columns.EVENT_ID.value.event_name]
         group_id = snuba_data[Columns.GROUP_ID.value.event_name]
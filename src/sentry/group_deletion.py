@@ -1,6 +1,6 @@
 from uuid import uuid4
 
-from sentry import eventstream
+from sentry import eventstream, grouphash_cache
 from sentry.models.group import Group, GroupStatus
 from sentry.models.grouphash import GroupHash
 from sentry.models.groupinbox import GroupInbox
@@ -27,6 +27,7 @@ def delete_group(group):
     GroupHash.objects.filter(project_id=group.project_id, group__id=group.id).exclude(
         state=GroupHash.State.SPLIT
     ).delete()
+    grouphash_cache.invalidate([group.project_id])
     # We remove `GroupInbox` rows here so that they don't end up influencing queries for
     # `Group` instances that are pending deletion
     GroupInbox.objects.filter(project_id=group.project.id, group__id=group.id).delete()
@@ -0,0 +1,222 @@
+"""
+Cache of ``GroupHash`` lookups for event ingestion.
+
+Almost every event that is saved belongs to an existing group, yet finding
+that group takes one query per hash of the event. This module caches the
+``GroupHash`` rows of a project in redis, with a short-lived process-local
+tier in front of it.
+
+Entries are only valid for the *generation* of the project they were read
+in. Any code that changes ``GroupHash`` rows (merge, unmerge, deletion,
+tombstones, splitting) has to call ``invalidate`` for the affected projects,
+which starts a new generation once the surrounding transaction commits and
+broadcasts the change to the local caches of other processes.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import router, transaction
+
+from sentry.utils import invalidation, json, metrics
+from sentry.utils.redis import redis_clusters
+
+logger = logging.getLogger(__name__)
+
+CachedGroupHash = namedtuple("CachedGroupHash", ("id", "group_id", "state", "group_tombstone_id"))
+
+INVALIDATION_TOPIC = "grouphash"
+
+# Entries expire after this time, generations are kept for twice as long so
+# that they never expire before the entries that were read in them.
+REDIS_TTL = 60 * 60
+
+
+def _get_client():
+    return redis_clusters.get(settings.SENTRY_GROUPHASH_CACHE_REDIS_CLUSTER)
+
+
+def _get_generation_key(project_id):
+    # All keys of a project share a hash tag, so that they can be fetched
+    # with a single MGET on redis cluster.
+    return f"gh:{{{project_id}}}:gen"
+
+
+def _get_entry_key(project_id, hash):
+    return f"gh:{{{project_id}}}:h:{hash}"
+
+
+class LocalGroupHashCache:
+    """
+    Process-local tier of the cache. Holds the entries of a project for a few
+    seconds, or until another process invalidates the project.
+    """
+
+    def __init__(self):
+        self._projects = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, project_id, hashes):
+        """
+        Returns ``(generation, entries)`` if all ``hashes`` are cached,
+        otherwise ``None``.
+        """
+        project = self._projects.get(project_id)
+        if project is None:
+            return None
+
+        generation, expires, entries = project
+        if expires < time.time():
+            return None
+
+        try:
+            return generation, {hash: entries[hash] for hash in hashes}
+        except KeyError:
+            return None
+
+    def set(self, project_id, generation, entries):
+        if not settings.SENTRY_GROUPHASH_CACHE_LOCAL_SIZE:
+            return
+
+        invalidation.ensure_subscribed()
+
+        with self._lock:
+            project = self._projects.get(project_id)
+            if project is None or project[0] != generation or project[1] < time.time():
+                expires = time.time() + settings.SENTRY_GROUPHASH_CACHE_LOCAL_TTL
+                project = self._projects[project_id] = (generation, expires, {})
+
+            project_entries = project[2]
+            self._size += len(set(entries) - set(project_entries))
+            project_entries.update(entries)
+
+            if self._size > settings.SENTRY_GROUPHASH_CACHE_LOCAL_SIZE:
+                self._projects = {project_id: project}
+                self._size = len(project_entries)
+
+    def invalidate(self, project_ids):
+        """
+        Drops the entries of ``project_ids``, or all entries if ``None``.
+        """
+        with self._lock:
+            if project_ids is None:
+                self._projects = {}
+                self._size = 0
+                return
+
+            for project_id in project_ids:
+                project = self._projects.pop(project_id, None)
+                if project is not None:
+                    self._size -= len(project[2])
+
+
+_local_cache = LocalGroupHashCache()
+invalidation.register(INVALIDATION_TOPIC, _local_cache.invalidate)
+
+
+def get_many(project_id, hashes):
+    """
+    Looks up ``hashes`` of a project. Returns a tuple of the current
+    generation of the project and a mapping of hash to ``CachedGroupHash``
+    for the hashes that were found.
+
+    The generation is ``None`` if the cache is unavailable. Otherwise it has
+    to be passed to ``set_many`` when populating the cache with rows that
+    were read *after* this call.
+    """
+    if not hashes:
+        return None, {}
+
+    local = _local_cache.get(project_id, hashes)
+    if local is not None:
+        metrics.incr("grouphash_cache.lookup", tags={"result": "local"}, sample_rate=0.1)
+        return local
+
+    keys = [_get_generation_key(project_id)] + [_get_entry_key(project_id, h) for h in hashes]
+    try:
+        values = _get_client().mget(keys)
+    except Exception:
+        logger.warning("grouphash_cache.get-failed", exc_info=True)
+        metrics.incr("grouphash_cache.lookup", tags={"result": "error"})
+        return None, {}
+
+    generation = values[0]
+    if isinstance(generation, bytes):
+        generation = generation.decode("utf-8")
+    generation = generation or ""
+
+    entries = {}
+    for hash, value in zip(hashes, values[1:]):
+        if value is None:
+            continue
+        entry_generation, *fields = json.loads(value)
+        if entry_generation == generation:
+            entries[hash] = CachedGroupHash(*fields)
+
+    if len(entries) == len(hashes):
+        metrics.incr("grouphash_cache.lookup", tags={"result": "hit"}, sample_rate=0.1)
+        _local_cache.set(project_id, generation, entries)
+    else:
+        metrics.incr("grouphash_cache.lookup", tags={"result": "miss"}, sample_rate=0.1)
+
+    return generation, entries
+
+
+def set_many(project_id, generation, grouphashes):
+    """
+    Caches ``grouphashes`` of a project that were read in ``generation``.
+    Only hashes that are associated with a group or a tombstone are cached.
+    """
+    if generation is None:
+        return
+
+    entries = {
+        grouphash.hash: CachedGroupHash(
+            grouphash.id, grouphash.group_id, grouphash.state, grouphash.group_tombstone_id
+        )
+        for grouphash in grouphashes
+        if grouphash.group_id is not None or grouphash.group_tombstone_id is not None
+    }
+    if not entries:
+        return
+
+    try:
+        with _get_client().pipeline(transaction=False) as pipe:
+            for hash, entry in entries.items():
+                pipe.setex(
+                    _get_entry_key(project_id, hash), REDIS_TTL, json.dumps([generation, *entry])
+                )
+            pipe.execute()
+    except Exception:
+        logger.warning("grouphash_cache.set-failed", exc_info=True)
+
+
+def invalidate(project_ids):
+    """
+    Invalidates all cached hashes of ``project_ids``. Must be called whenever
+    ``GroupHash`` rows of these projects are changed. If called within a
+    transaction, the invalidation happens once the transaction commits.
+    """
+    from sentry.models import GroupHash
+
+    project_ids = list(project_ids)
+    if not project_ids:
+        return
+
+    def _invalidate():
+        _local_cache.invalidate(project_ids)
+        try:
+            with _get_client().pipeline(transaction=False) as pipe:
+                for project_id in project_ids:
+                    pipe.setex(_get_generation_key(project_id), REDIS_TTL * 2, uuid.uuid4().hex)
+                pipe.execute()
+        except Exception:
+            logger.exception("grouphash_cache.invalidate-failed")
+        invalidation.publish(INVALIDATION_TOPIC, project_ids)
+
+    transaction.on_commit(_invalidate, using=router.db_for_write(GroupHash))
@@ -1,5 +1,7 @@
 import logging
 import operator
+import time
+from collections import defaultdict
 from copy import deepcopy
 from datetime import timedelta
 
@@ -39,6 +41,9 @@ ALERT_RULE_BASE_STAT_KEY = "%s:%s"
 ALERT_RULE_STAT_KEYS = ("last_update",)
 ALERT_RULE_BASE_TRIGGER_STAT_KEY = "%s:trigger:%s:%s"
 ALERT_RULE_TRIGGER_STAT_KEYS = ("alert_triggered", "resolve_triggered")
+# How long processors are kept in memory between batches before the alert rule
+# and triggers are fetched again.
+PROCESSOR_CACHE_TTL = 60
 
 
 class SubscriptionProcessor:
@@ -55,24 +60,45 @@ class SubscriptionProcessor:
         AlertRuleThresholdType.BELOW: (operator.lt, operator.gt),
     }
 
-    def __init__(self, subscription):
+    def __init__(self, subscription, alert_rule=None, triggers=None, alert_rule_stats=None):
+        """
+        The alert rule, its triggers and the stats as returned by
+        `get_alert_rule_stats` are fetched unless passed in, which allows
+        prefetching them for many subscriptions at once (see `build_processors`).
+        """
         self.subscription = subscription
-        try:
-            self.alert_rule = AlertRule.objects.get_for_subscription(subscription)
-        except AlertRule.DoesNotExist:
-            return
-
-        self.triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
-        self.triggers.sort(key=lambda trigger: trigger.alert_threshold)
-
+        if alert_rule is None:
+            try:
+                alert_rule = AlertRule.objects.get_for_subscription(subscription)
+            except AlertRule.DoesNotExist:
+                return
+        self.alert_rule = alert_rule
+
+        if triggers is None:
+            triggers = AlertRuleTrigger.objects.get_for_alert_rule(self.alert_rule)
+        self.triggers = sorted(triggers, key=lambda trigger: trigger.alert_threshold)
+
+        if alert_rule_stats is None:
+            alert_rule_stats = get_alert_rule_stats(
+                self.alert_rule, self.subscription, self.triggers
+            )
         (
             self.last_update,
             self.trigger_alert_counts,
             self.trigger_resolve_counts,
-        ) = get_alert_rule_stats(self.alert_rule, self.subscription, self.triggers)
+        ) = alert_rule_stats
         self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
         self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
 
+    def reset_incident_cache(self):
+        """
+        Drops the active incident and its triggers, so that they're fetched
+        again if needed. Used when a processor is reused across updates, since
+        incidents can be changed outside of the processor.
+        """
+        self.__dict__.pop("_active_incident", None)
+        self.__dict__.pop("_incident_triggers", None)
+
     @property
     def active_incident(self):
         if not hasattr(self, "_active_incident"):
@@ -140,7 +166,12 @@ class SubscriptionProcessor:
 
         return trigger.alert_threshold + resolve_add
 
-    def process_update(self, subscription_update):
+    def process_update(self, subscription_update, pipeline=None):
+        """
+        Processes a single subscription update. If a redis `pipeline` is passed,
+        the updated stats are queued on it and the caller is responsible for
+        executing it.
+        """
         dataset = self.subscription.snuba_query.dataset
         try:
             # Check that the project exists
@@ -229,7 +260,7 @@ class SubscriptionProcessor:
         # is killed here. The trade-off is that we might process an update twice. Mostly
         # this will have no effect, but if someone manages to close a triggered incident
         # before the next one then we might alert twice.
-        self.update_alert_rule_stats()
+        self.update_alert_rule_stats(pipeline=pipeline)
 
     def calculate_event_date_from_update_date(self, update_date):
         """
@@ -384,7 +415,7 @@ class SubscriptionProcessor:
                     status_method=IncidentStatusMethod.RULE_TRIGGERED,
                 )
 
-    def update_alert_rule_stats(self):
+    def update_alert_rule_stats(self, pipeline=None):
         """
         Updates stats about the alert rule, if they're changed.
         :return:
@@ -406,7 +437,92 @@ class SubscriptionProcessor:
             self.last_update,
             updated_trigger_alert_counts,
             updated_trigger_resolve_counts,
+            pipeline=pipeline,
         )
+        # The processor might be reused for the next update, so we only want to
+        # write the counts that change from here on.
+        self.orig_trigger_alert_counts = deepcopy(self.trigger_alert_counts)
+        self.orig_trigger_resolve_counts = deepcopy(self.trigger_resolve_counts)
+
+
+def build_processors(subscriptions):
+    """
+    Builds a `SubscriptionProcessor` for each subscription. Alert rules and
+    triggers are fetched with one query each, and stats for all of them with a
+    single redis round trip.
+    :return: A dict of subscription id to `SubscriptionProcessor`
+    """
+    subscriptions = list(subscriptions)
+    alert_rules = {
+        alert_rule.snuba_query_id: alert_rule
+        for alert_rule in AlertRule.objects.filter(
+            snuba_query_id__in={subscription.snuba_query_id for subscription in subscriptions}
+        ).select_related("snuba_query")
+    }
+    triggers = defaultdict(list)
+    for trigger in AlertRuleTrigger.objects.filter(
+        alert_rule_id__in=[alert_rule.id for alert_rule in alert_rules.values()]
+    ):
+        triggers[trigger.alert_rule_id].append(trigger)
+
+    to_build = []
+    processors = {}
+    for subscription in subscriptions:
+        alert_rule = alert_rules.get(subscription.snuba_query_id)
+        if alert_rule is None:
+            # Let the processor handle the missing rule, this is rare.
+            processors[subscription.id] = SubscriptionProcessor(subscription)
+        else:
+            to_build.append((subscription, alert_rule, triggers[alert_rule.id]))
+
+    all_stats = get_alert_rule_stats_many(to_build)
+    for (subscription, alert_rule, rule_triggers), stats in zip(to_build, all_stats):
+        processors[subscription.id] = SubscriptionProcessor(
+            subscription, alert_rule=alert_rule, triggers=rule_triggers, alert_rule_stats=stats
+        )
+    return processors
+
+
+def process_updates(updates, processor_cache=None):
+    """
+    Processes a batch of subscription updates, as passed to a batch subscriber.
+    Processors are kept in `processor_cache` for `PROCESSOR_CACHE_TTL` seconds
+    so that the alert rule, triggers and stats don't need to be fetched again
+    for the next update of the same subscription. All stats changed by the
+    batch are written with a single redis pipeline.
+    :param updates: A list of `(subscription_update, subscription)` tuples
+    :param processor_cache: A dict that is kept across batches
+    """
+    if processor_cache is None:
+        processor_cache = {}
+
+    now = time.time()
+    missing = {}
+    for _, subscription in updates:
+        cached = processor_cache.get(subscription.id)
+        if cached is None or cached[1] + PROCESSOR_CACHE_TTL < now:
+            missing[subscription.id] = subscription
+
+    metrics.incr(
+        "incidents.subscription_processor.cache",
+        amount=len(updates) - len(missing),
+        tags={"result": "hit"},
+    )
+    metrics.incr(
+        "incidents.subscription_processor.cache", amount=len(missing), tags={"result": "miss"}
+    )
+    if missing:
+        for subscription_id, processor in build_processors(missing.values()).items():
+            processor_cache[subscription_id] = (processor, now)
+
+    pipeline = get_redis_client().pipeline()
+    try:
+        for subscription_update, subscription in updates:
+            processor = processor_cache[subscription.id][0]
+            processor.reset_incident_cache()
+            processor.process_update(subscription_update, pipeline=pipeline)
+    finally:
+        pipeline.execute()
 
 
 def build_alert_rule_stat_keys(alert_rule, subscription):
@@ -463,6 +579,32 @@ def get_alert_rule_stats(alert_rule, subscription, triggers):
     alert_rule_keys = build_alert_rule_stat_keys(alert_rule, subscription)
     trigger_keys = build_trigger_stat_keys(alert_rule, subscription, triggers)
     results = get_redis_client().mget(alert_rule_keys + trigger_keys)
+    return _parse_alert_rule_stats(triggers, results)
+
+
+def get_alert_rule_stats_many(items):
+    """
+    Fetches stats for many alert rules in a single redis round trip.
+    :param items: A list of `(subscription, alert_rule, triggers)` tuples
+    :return: A list of stats, as returned by `get_alert_rule_stats`, in the same
+    order as `items`
+    """
+    if not items:
+        return []
+
+    pipeline = get_redis_client().pipeline()
+    for subscription, alert_rule, triggers in items:
+        pipeline.mget(
+            build_alert_rule_stat_keys(alert_rule, subscription)
+            + build_trigger_stat_keys(alert_rule, subscription, triggers)
+        )
+    return [
+        _parse_alert_rule_stats(triggers, results)
+        for (_, _, triggers), results in zip(items, pipeline.execute())
+    ]
+
+
+def _parse_alert_rule_stats(triggers, results):
     results = tuple(0 if result is None else int(result) for result in results)
     last_update = to_datetime(results[0])
     trigger_results = results[1:]
@@ -477,11 +619,16 @@ def get_alert_rule_stats(alert_rule, subscription, triggers):
     return last_update, trigger_alert_counts, trigger_resolve_counts
 
 
-def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts, resolve_counts):
+def update_alert_rule_stats(
+    alert_rule, subscription, last_update, alert_counts, resolve_counts, pipeline=None
+):
     """
     Updates stats about the alert rule, subscription and triggers if they've changed.
+    If a `pipeline` is passed the writes are only queued on it.
     """
-    pipeline = get_redis_client().pipeline()
+    execute = pipeline is None
+    if pipeline is None:
+        pipeline = get_redis_client().pipeline()
 
     counts_with_stat_keys = zip(ALERT_RULE_TRIGGER_STAT_KEYS, (alert_counts, resolve_counts))
     for stat_key, trigger_counts in counts_with_stat_keys:
@@ -496,7 +643,8 @@ def update_alert_rule_stats(alert_rule, subscription, last_update, alert_counts,
 
     last_update_key = build_alert_rule_stat_keys(alert_rule, subscription)[0]
     pipeline.set(last_update_key, int(to_timestamp(last_update)), ex=REDIS_TTL)
-    pipeline.execute()
+    if execute:
+        pipeline.execute()
 
 
 def get_redis_client():
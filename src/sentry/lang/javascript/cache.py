@@ -1,8 +1,12 @@
+import threading
+from collections import OrderedDict
+
 from symbolic import SourceView
 
+from sentry.utils import metrics
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "ParsedSourceCache"]
 
 
 def is_utf8(codec):
@@ -10,6 +14,23 @@ def is_utf8(codec):
     return name in ("utf-8", "ascii")
 
 
+def to_source_view(source, encoding=None):
+    if isinstance(source, SourceView):
+        return source
+
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    # If an encoding is provided and it's not utf-8 compatible
+    # we try to re-encoding the source and create a source view
+    # from it.
+    elif encoding is not None and not is_utf8(encoding):
+        try:
+            source = source.decode(encoding).encode("utf-8")
+        except UnicodeError:
+            pass
+    return SourceView.from_bytes(source)
+
+
 class SourceCache:
     def __init__(self):
         self._cache = {}
@@ -38,20 +59,7 @@ class SourceCache:
 
     def add(self, url, source, encoding=None):
         url = self._get_canonical_url(url)
-
-        if not isinstance(source, SourceView):
-            if isinstance(source, str):
-                source = source.encode("utf-8")
-            # If an encoding is provided and it's not utf-8 compatible
-            # we try to re-encoding the source and create a source view
-            # from it.
-            elif encoding is not None and not is_utf8(encoding):
-                try:
-                    source = source.decode(encoding).encode("utf-8")
-                except UnicodeError:
-                    pass
-            source = SourceView.from_bytes(source)
-        self._cache[url] = source
+        self._cache[url] = to_source_view(source, encoding)
 
     def add_error(self, url, error):
         url = self._get_canonical_url(url)
@@ -90,3 +98,84 @@ class SourceMapCache:
             sourcemap = self.get(sourcemap_url)
             return (sourcemap_url, sourcemap)
         return (None, None)
+
+
+class ParsedSourceCache:
+    """
+    A process-wide LRU of parsed source maps and source views, shared between
+    events.
+
+    Unlike the caches above, which only live for the duration of processing a
+    single event, this one keeps the (expensive to build) views of large
+    bundles around. Keys must include a checksum of the raw file so that
+    re-uploaded artifacts never resolve to a stale view.
+
+    The cache is bounded by ``max_size`` bytes, approximated by the size of
+    the raw files the views were parsed from.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value, _ = self._cache[key]
+            except KeyError:
+                value = None
+            else:
+                self._cache.move_to_end(key)
+
+        metrics.incr(
+            "sourcemaps.parsed_cache",
+            tags={"kind": key[0], "result": "miss" if value is None else "hit"},
+            skip_internal=True,
+        )
+        return value
+
+    def set(self, key, value, size):
+        # Never let a single entry flush the whole cache.
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._cache:
+                self.size -= self._cache.pop(key)[1]
+            self._cache[key] = (value, size)
+            self.size += size
+
+            evicted = 0
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._cache.popitem(last=False)
+                self.size -= evicted_size
+                evicted += 1
+
+        if evicted:
+            metrics.incr("sourcemaps.parsed_cache.evicted", amount=evicted, skip_internal=True)
+        metrics.timing("sourcemaps.parsed_cache.size", self.size)
+
+    def get_or_set(self, key, default, size):
+        """
+        Returns the cached value for ``key``, building it with ``default()``
+        on a miss. ``default`` is not called under the lock, so concurrent
+        misses may build the same view twice.
+        """
+        value = self.get(key)
+        if value is None:
+            value = default()
+            self.set(key, value, size)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.size = 0
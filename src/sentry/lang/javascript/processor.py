@@ -4,6 +4,7 @@ __all__ = ["JavaScriptStacktraceProcessor"]
 
 import base64
 import errno
+import hashlib
 import logging
 import re
 import sys
@@ -33,7 +34,7 @@ from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import ParsedSourceCache, SourceCache, SourceMapCache, to_source_view
 
 # number of surrounding lines (on each side) to fetch
 LINES_OF_CONTEXT = 5
@@ -66,6 +67,9 @@ MAX_RESOURCE_FETCHES = 100
 
 CACHE_MAX_VALUE_SIZE = settings.SENTRY_CACHE_MAX_VALUE_SIZE
 
+# shared between all events processed by this process, see `ParsedSourceCache`
+parsed_source_cache = ParsedSourceCache(settings.SENTRY_PARSED_SOURCE_CACHE_SIZE)
+
 logger = logging.getLogger(__name__)
 
 
@@ -221,11 +225,15 @@ def should_retry_fetch(attempt: int, e: Exception) -> bool:
 fetch_retry_policy = ConditionalRetryPolicy(should_retry_fetch, exponential_delay(0.05))
 
 
-def fetch_release_file(filename, release, dist=None):
+def fetch_release_file(filename, release, dist=None, artifact_index=None):
     """
     Attempt to retrieve a release artifact from the database.
 
-    Caches the result of that attempt (whether successful or not).
+    Caches the contents of found artifacts. Missing artifacts are answered by
+    the artifact index of the release, which is cached as well.
+
+    ``artifact_index`` can be passed to reuse an index obtained from
+    ``ReleaseFile.get_artifact_index`` for looking up multiple files.
     """
 
     dist_name = dist and dist.name or None
@@ -244,39 +252,35 @@ def fetch_release_file(filename, release, dist=None):
     logger.debug("Checking cache for release artifact %r (release_id=%s)", filename, release.id)
     result = cache.get(cache_key)
 
-    # not in the cache (meaning we haven't checked the database recently), so check the database
+    # not in the cache (meaning we haven't checked the database recently), so check the index
     if result is None:
         filename_choices = ReleaseFile.normalize(filename)
         filename_idents = [ReleaseFile.get_ident(f, dist_name) for f in filename_choices]
 
         logger.debug(
-            "Checking database for release artifact %r (release_id=%s)", filename, release.id
+            "Checking artifact index for release artifact %r (release_id=%s)", filename, release.id
         )
 
-        possible_files = list(
-            ReleaseFile.objects.filter(
-                release=release, dist=dist, ident__in=filename_idents
-            ).select_related("file")
+        if artifact_index is None:
+            artifact_index = ReleaseFile.get_artifact_index(release, dist)
+
+        # Pick first one that matches in priority order.
+        releasefile_id = next(
+            (artifact_index[ident] for ident in filename_idents if ident in artifact_index), None
         )
 
-        if len(possible_files) == 0:
+        releasefile = None
+        if releasefile_id is not None:
+            releasefile = (
+                ReleaseFile.objects.filter(id=releasefile_id).select_related("file").first()
+            )
+
+        if releasefile is None:
             logger.debug(
                 "Release artifact %r not found in database (release_id=%s)", filename, release.id
             )
-            cache.set(cache_key, -1, 60)
             return None
 
-        elif len(possible_files) == 1:
-            releasefile = possible_files[0]
-
-        else:
-            # Pick first one that matches in priority order.
-            # This is O(N*M) but there are only ever at most 4 things here
-            # so not really worth optimizing.
-            releasefile = next(
-                rf for ident in filename_idents for rf in possible_files if rf.ident == ident
-            )
-
         logger.debug(
             "Found release artifact %r (id=%s, release_id=%s)", filename, releasefile.id, release.id
         )
@@ -341,7 +345,9 @@ def fetch_release_file(filename, release, dist=None):
     return result
 
 
-def fetch_file(url, project=None, release=None, dist=None, allow_scraping=True):
+def fetch_file(
+    url, project=None, release=None, dist=None, allow_scraping=True, artifact_index=None
+):
     """
     Pull down a URL, returning a UrlResult object.
 
@@ -359,7 +365,7 @@ def fetch_file(url, project=None, release=None, dist=None, allow_scraping=True):
     # if we've got a release to look on, try that first (incl associated cache)
     if release:
         with metrics.timer("sourcemaps.release_file"):
-            result = fetch_release_file(url, release, dist)
+            result = fetch_release_file(url, release, dist, artifact_index=artifact_index)
     else:
         result = None
 
@@ -477,7 +483,32 @@ def get_max_age(headers):
     return min(max_age, CACHE_CONTROL_MAX)
 
 
-def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=True):
+def get_parsed_source_cache_key(kind, url, body, release=None, dist=None):
+    return (
+        kind,
+        release.id if release else None,
+        dist.id if dist else None,
+        url,
+        hashlib.sha1(body).hexdigest(),
+    )
+
+
+def get_source_view(result, release=None, dist=None):
+    """
+    Returns a `SourceView` of the fetched file, reusing a view that was
+    already built for the same file by an earlier event.
+    """
+    return parsed_source_cache.get_or_set(
+        get_parsed_source_cache_key("source", result.url, result.body, release, dist),
+        lambda: to_source_view(result.body, result.encoding),
+        len(result.body),
+    )
+
+
+def fetch_sourcemap(
+    url, project=None, release=None, dist=None, allow_scraping=True, artifact_index=None
+):
+    cache_key = None
     if is_data_uri(url):
         try:
             body = base64.b64decode(
@@ -489,16 +520,34 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
     else:
         # look in the database and, if not found, optionally try to scrape the web
         result = fetch_file(
-            url, project=project, release=release, dist=dist, allow_scraping=allow_scraping
+            url,
+            project=project,
+            release=release,
+            dist=dist,
+            allow_scraping=allow_scraping,
+            artifact_index=artifact_index,
         )
         body = result.body
+
+        # inlined source maps are cheap compared to a lookup, only cache the
+        # ones that were fetched
+        cache_key = get_parsed_source_cache_key("sourcemap", url, body, release, dist)
+        sourcemap_view = parsed_source_cache.get(cache_key)
+        if sourcemap_view is not None:
+            return sourcemap_view
+
     try:
-        return SourceMapView.from_json_bytes(body)
+        with metrics.timer("sourcemaps.parse"):
+            sourcemap_view = SourceMapView.from_json_bytes(body)
     except Exception as exc:
         # This is in debug because the product shows an error already.
         logger.debug(str(exc), exc_info=True)
         raise UnparseableSourcemap({"url": http.expose_url(url)})
 
+    if cache_key is not None:
+        parsed_source_cache.set(cache_key, sourcemap_view, len(body))
+    return sourcemap_view
+
 
 def is_data_uri(url):
     return url[:BASE64_PREAMBLE_LENGTH] == BASE64_SOURCEMAP_PREAMBLE
@@ -575,6 +624,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
 
         self.release = None
         self.dist = None
+        self.artifact_index = None
 
     def get_stacktraces(self, data):
         exceptions = get_path(data, "exception", "values", filter=True, default=())
@@ -605,6 +655,8 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             self.release = self.get_release(create=True)
             if self.data.get("dist") and self.release:
                 self.dist = self.release.get_dist(self.data["dist"])
+            if self.release:
+                self.artifact_index = ReleaseFile.get_artifact_index(self.release, self.dist)
 
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.preprocess_step.populate_source_cache"
@@ -892,6 +944,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                     release=self.release,
                     dist=self.dist,
                     allow_scraping=self.allow_scraping,
+                    artifact_index=self.artifact_index,
                 )
         except http.BadSource as exc:
             # most people don't upload release artifacts for their third-party libraries,
@@ -904,7 +957,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # either way, there's no more for us to do here, since we don't have
             # a valid file to cache
             return
-        cache.add(filename, result.body, result.encoding)
+        cache.add(filename, get_source_view(result, self.release, self.dist))
         cache.alias(result.url, filename)
 
         sourcemap_url = discover_sourcemap(result)
@@ -930,6 +983,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                     release=self.release,
                     dist=self.dist,
                     allow_scraping=self.allow_scraping,
+                    artifact_index=self.artifact_index,
                 )
         except http.BadSource as exc:
             # we don't perform the same check here as above, because if someone has
@@ -1,6 +1,7 @@
 import base64
 import logging
 import sys
+import threading
 import time
 from urllib.parse import urljoin
 
@@ -96,6 +97,20 @@ SOURCES_SCHEMA = {
 }
 
 
+_session_pool = threading.local()
+
+
+def _get_pooled_session():
+    """
+    Returns an HTTP session that is shared by all symbolication requests of
+    this thread, so that polling does not reconnect to symbolicator.
+    """
+    session = getattr(_session_pool, "session", None)
+    if session is None:
+        session = _session_pool.session = Session()
+    return session
+
+
 def _task_id_cache_key_for_event(project_id, event_id):
     return f"symbolicator:{event_id}:{project_id}"
 
@@ -128,13 +143,18 @@ class Symbolicator:
         task_id = default_cache.get(self.task_id_cache_key)
         json_response = None
 
+        request_start = time.time()
+
         with self.sess:
             try:
                 if task_id:
                     # Processing has already started and we need to poll
-                    # symbolicator for an update. This in turn may put us back into
-                    # the queue.
-                    json_response = self.sess.query_task(task_id)
+                    # symbolicator for an update. Symbolicator holds on to the
+                    # request until it is done or the timeout passes, this in
+                    # turn may put us back into the queue.
+                    json_response = self.sess.query_task(
+                        task_id, timeout=settings.SYMBOLICATOR_POLL_TIMEOUT
+                    )
 
                 if json_response is None:
                     # This is a new task, so we compute all request parameters
@@ -158,12 +178,15 @@ class Symbolicator:
 
             # Symbolication is still in progress. Bail out and try again
             # after some timeout. Symbolicator keeps the response for the
-            # first one to poll it.
+            # first one to poll it. Time spent waiting for symbolicator
+            # counts towards the suggested delay, so that long-polled
+            # requests are resumed right away.
             if json_response["status"] == "pending":
                 default_cache.set(
                     self.task_id_cache_key, json_response["request_id"], REQUEST_CACHE_TIMEOUT
                 )
-                raise RetrySymbolication(retry_after=json_response["retry_after"])
+                retry_after = json_response["retry_after"] - (time.time() - request_start)
+                raise RetrySymbolication(retry_after=max(0, retry_after))
             else:
                 # Once we arrive here, we are done processing. Clean up the
                 # task id from the cache.
@@ -391,12 +414,11 @@ class SymbolicatorSession:
 
     def open(self):
         if self.session is None:
-            self.session = Session()
+            self.session = _get_pooled_session()
 
     def close(self):
-        if self.session is not None:
-            self.session.close()
-            self.session = None
+        # The underlying session is pooled and stays open for reuse.
+        self.session = None
 
     def _ensure_open(self):
         if not self.session:
@@ -523,11 +545,11 @@ class SymbolicatorSession:
             files={"apple_crash_report": report},
         )
 
-    def query_task(self, task_id):
+    def query_task(self, task_id, timeout=0):
         task_url = f"requests/{task_id}"
 
         params = {
-            "timeout": 0,  # Only wait when creating, but not when querying tasks
+            "timeout": timeout,
             "scope": self.project_id,
         }
 
@@ -0,0 +1,169 @@
+"""
+Metrics backend that aggregates in-process before sending to another backend.
+
+Every call to ``incr`` or ``timing`` of the regular backends results in a
+packet to statsd (or a call into the datadog client). Hot code paths emit
+millions of them per minute. ``AggregatingMetricsBackend`` instead merges
+counters by key, instance and tags, and collects timings in logarithmic
+histograms. A background thread flushes the aggregates to the wrapped
+backend every ``flush_interval`` seconds.
+
+Configure it as the metrics backend and move the previous backend into its
+options::
+
+    SENTRY_METRICS_BACKEND = "sentry.metrics.aggregating.AggregatingMetricsBackend"
+    SENTRY_METRICS_OPTIONS = {
+        "backend": "sentry.metrics.dogstatsd.DogStatsdMetricsBackend",
+        "backend_options": {"statsd_host": "localhost"},
+        "flush_interval": 10,
+    }
+
+Counters are forwarded exactly (and without client-side sampling). Timings
+are quantized to buckets with a relative error of at most
+``RELATIVE_ACCURACY`` and keep their sample rate.
+"""
+
+__all__ = ["AggregatingMetricsBackend"]
+
+import atexit
+import logging
+import math
+import os
+import threading
+import time
+
+from sentry.utils import json
+from sentry.utils.imports import import_string
+
+from .base import MetricsBackend
+
+logger = logging.getLogger("sentry.metrics")
+
+RELATIVE_ACCURACY = 0.01
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+def _get_bucket(value):
+    """
+    Returns the value that represents the bucket of ``value``. All values of
+    a bucket are within ``RELATIVE_ACCURACY`` of it.
+    """
+    if value <= 0:
+        return 0
+    index = math.ceil(math.log(value) / _LOG_GAMMA)
+    return 2 * _GAMMA ** index / (_GAMMA + 1)
+
+
+def _get_tags_key(tags):
+    if not tags:
+        return ()
+    return tuple(sorted(tags.items()))
+
+
+class MetricsAggregator:
+    """
+    Aggregates of one process. Shared by all threads, unlike the backends
+    themselves (see ``MetricsBackend``).
+    """
+
+    def __init__(self, backend, flush_interval):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+        self._flusher_pid = None
+
+    def incr(self, key, instance, tags, amount):
+        metric = (key, instance, _get_tags_key(tags))
+        with self._lock:
+            self._counters[metric] = self._counters.get(metric, 0) + amount
+        self._ensure_flusher()
+
+    def timing(self, key, value, instance, tags, sample_rate):
+        metric = (key, instance, _get_tags_key(tags), sample_rate)
+        bucket = _get_bucket(value)
+        with self._lock:
+            histogram = self._timings.get(metric)
+            if histogram is None:
+                histogram = self._timings[metric] = {}
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        self._ensure_flusher()
+
+    def flush(self):
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            timings, self._timings = self._timings, {}
+
+        # Backends modify the tags they are passed, every call gets a copy.
+        for (key, instance, tags), amount in counters.items():
+            try:
+                self.backend.incr(key, instance, dict(tags), amount, 1)
+            except Exception:
+                logger.exception("Unable to flush metric")
+
+        for (key, instance, tags, sample_rate), histogram in timings.items():
+            try:
+                self.backend.timing_histogram(key, histogram, instance, dict(tags), sample_rate)
+            except Exception:
+                logger.exception("Unable to flush metric")
+
+    def _ensure_flusher(self):
+        # Threads do not survive forking, every process starts its own.
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            # Aggregates inherited from the parent are flushed by the parent.
+            self._counters = {}
+            self._timings = {}
+            thread = threading.Thread(target=self._run, name="metrics-aggregator")
+            thread.daemon = True
+            thread.start()
+            self._flusher_pid = pid
+
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Unable to flush metrics")
+
+
+_aggregators = {}
+_aggregators_lock = threading.Lock()
+
+
+def _get_aggregator(backend, backend_options, flush_interval):
+    config = (backend, json.dumps(backend_options, sort_keys=True), flush_interval)
+    with _aggregators_lock:
+        aggregator = _aggregators.get(config)
+        if aggregator is None:
+            cls = import_string(backend)
+            aggregator = _aggregators[config] = MetricsAggregator(
+                cls(**backend_options), flush_interval
+            )
+    return aggregator
+
+
+class AggregatingMetricsBackend(MetricsBackend):
+    def __init__(self, backend, backend_options=None, flush_interval=10, **kwargs):
+        self.aggregator = _get_aggregator(backend, backend_options or {}, flush_interval)
+        super().__init__(**kwargs)
+
+    def incr(self, key, instance=None, tags=None, amount=1, sample_rate=1):
+        self.aggregator.incr(key, instance, tags, amount)
+
+    def timing(self, key, value, instance=None, tags=None, sample_rate=1):
+        self.aggregator.timing(key, value, instance, tags, sample_rate)
+
+    def flush(self):
+        self.aggregator.flush()
@@ -25,3 +25,14 @@ class MetricsBackend(local):
 
     def timing(self, key, value, instance=None, tags=None, sample_rate=1):
         raise NotImplementedError
+
+    def timing_histogram(self, key, histogram, instance=None, tags=None, sample_rate=1):
+        """
+        Records pre-aggregated timings. ``histogram`` maps each value to the
+        number of times it was observed. Backends that can batch writes
+        should override this, the default records every observation on its
+        own.
+        """
+        for value, count in histogram.items():
+            for _ in range(count):
+                self.timing(key, value, instance, tags and dict(tags), sample_rate)
@@ -57,3 +57,22 @@ class DatadogMetricsBackend(MetricsBackend):
         self.stats.timing(
             self._get_key(key), value, sample_rate=sample_rate, tags=tags, host=self.host
         )
+
+    def timing_histogram(self, key, histogram, instance=None, tags=None, sample_rate=1):
+        # ThreadStats already aggregates in-process and submits batches to the
+        # API periodically, this only saves building the key and tags for
+        # every observation.
+        if tags is None:
+            tags = {}
+        if self.tags:
+            tags.update(self.tags)
+        if instance:
+            tags["instance"] = instance
+        if tags:
+            tags = [f"{k}:{v}" for k, v in tags.items()]
+        full_key = self._get_key(key)
+        for value, count in histogram.items():
+            for _ in range(count):
+                self.stats.timing(
+                    full_key, value, sample_rate=sample_rate, tags=tags, host=self.host
+                )
@@ -33,3 +33,22 @@ class DogStatsdMetricsBackend(MetricsBackend):
         if tags:
             tags = [f"{k}:{v}" for k, v in tags.items()]
         statsd.timing(self._get_key(key), value, sample_rate=sample_rate, tags=tags)
+
+    def timing_histogram(self, key, histogram, instance=None, tags=None, sample_rate=1):
+        if tags is None:
+            tags = {}
+        if self.tags:
+            tags.update(self.tags)
+        if instance:
+            tags["instance"] = instance
+        if tags:
+            tags = [f"{k}:{v}" for k, v in tags.items()]
+        full_key = self._get_key(key)
+        # Buffered mode packs as many timings into a single packet as possible.
+        statsd.open_buffer()
+        try:
+            for value, count in histogram.items():
+                for _ in range(count):
+                    statsd.timing(full_key, value, sample_rate=sample_rate, tags=tags)
+        finally:
+            statsd.close_buffer()
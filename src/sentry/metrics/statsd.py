@@ -20,3 +20,11 @@ class StatsdMetricsBackend(MetricsBackend):
 
     def timing(self, key, value, instance=None, tags=None, sample_rate=1):
         self.client.timing(self._full_key(self._get_key(key)), value, sample_rate)
+
+    def timing_histogram(self, key, histogram, instance=None, tags=None, sample_rate=1):
+        full_key = self._full_key(self._get_key(key))
+        # Pipelines pack as many timings into a single packet as possible.
+        with self.client.pipeline() as pipe:
+            for value, count in histogram.items():
+                for _ in range(count):
+                    pipe.timing(full_key, value, sample_rate)
@@ -1,4 +1,3 @@
-import errno
 import hashlib
 import logging
 import os
@@ -10,10 +9,9 @@ import uuid
 from django.db import models
 from symbolic import Archive, ObjectErrorUnsupportedObject, SymbolicError, normalize_debug_id
 
-from sentry import options
 from sentry.constants import KNOWN_DIF_FORMATS
 from sentry.db.models import BaseManager, FlexibleForeignKey, JSONField, Model, sane_repr
-from sentry.models.file import File, clear_cached_files
+from sentry.models.file import File, LocalFileCache
 from sentry.reprocessing import bump_reprocessing_revision, resolve_processing_issue
 from sentry.utils.zip import safe_extract_zip
 
@@ -391,13 +389,9 @@ def create_files_from_dif_zip(fileobj, project):
         shutil.rmtree(scratchpad)
 
 
-class DIFCache:
-    @property
-    def cache_path(self):
-        return options.get("dsym.cache-path")
-
-    def get_project_path(self, project):
-        return os.path.join(self.cache_path, str(project.id))
+class DIFCache(LocalFileCache):
+    cache_path_option = "dsym.cache-path"
+    max_size_option = "dsym.cache-max-size"
 
     def fetch_difs(self, project, debug_ids, features=None):
         """Given some ids returns an id to path mapping for where the
@@ -406,21 +400,7 @@ class DIFCache:
         debug_ids = [str(debug_id).lower() for debug_id in debug_ids]
         difs = ProjectDebugFile.objects.find_by_debug_ids(project, debug_ids, features)
 
-        rv = {}
-        for debug_id, dif in difs.items():
-            dif_path = os.path.join(self.get_project_path(project), debug_id)
-            try:
-                os.stat(dif_path)
-            except OSError as e:
-                if e.errno != errno.ENOENT:
-                    raise
-                dif.file.save_to(dif_path)
-            rv[debug_id] = dif_path
-
-        return rv
-
-    def clear_old_entries(self):
-        clear_cached_files(self.cache_path)
+        return {debug_id: self.fetch(dif.file) for debug_id, dif in difs.items()}
 
 
 ProjectDebugFile.difcache = DIFCache()
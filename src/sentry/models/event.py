@@ -1,7 +1,8 @@
+from django.conf import settings
 from sentry_relay.processing import StoreNormalizer
 
 from sentry.db.models import NodeData
-from sentry.utils.canonical import CanonicalKeyDict
+from sentry.utils.canonical import CanonicalKeyDict, get_canonical_name, get_legacy_name
 
 
 class EventDict(CanonicalKeyDict):
@@ -12,15 +13,57 @@ class EventDict(CanonicalKeyDict):
     This is used as a wrapper type for `Event.data` such that creating an event
     object (or loading it from the DB) will ensure the data fits the type
     schema.
+
+    Both re-normalization and copying the payload are deferred until the data
+    is accessed for the first time, so that events whose payload is never
+    read (for instance because everything needed is in Snuba) do not pay for
+    it.
     """
 
-    def __init__(self, data, skip_renormalization=False, **kwargs):
+    legacy = None
+    # The payload that has not been materialized yet.
+    _lazy_data = None
+
+    def __init__(self, data, skip_renormalization=False, legacy=None):
+        self.legacy = legacy
+        # Needed for key lookups before the data is materialized.
+        if legacy is None:
+            legacy = settings.PREFER_CANONICAL_LEGACY_KEYS
+        self._norm_func = legacy and get_legacy_name or get_canonical_name
+        self._data = None
+        self._lazy_data = data
+        self._skip_renormalization = skip_renormalization
+
+    def _materialize(self):
+        data, self._lazy_data = self._lazy_data, None
+
         is_renormalized = isinstance(data, EventDict) or (
             isinstance(data, NodeData) and isinstance(data.data, EventDict)
         )
 
-        if not skip_renormalization and not is_renormalized:
+        if not self._skip_renormalization and not is_renormalized:
             normalizer = StoreNormalizer(is_renormalize=True, enable_trimming=False)
             data = normalizer.normalize_event(dict(data))
 
-        CanonicalKeyDict.__init__(self, data, **kwargs)
+        CanonicalKeyDict.__init__(self, data, legacy=self.legacy)
+
+    def _get_data(self):
+        if self._lazy_data is not None:
+            self._materialize()
+        return self._data
+
+    def _set_data(self, data):
+        self._lazy_data = None
+        self._data = data
+
+    data = property(_get_data, _set_data)
+
+    @property
+    def is_materialized(self):
+        return self._lazy_data is None
+
+    def __getstate__(self):
+        return {"legacy": self.legacy, "data": self.data}
+
+    def __setstate__(self, state):
+        CanonicalKeyDict.__init__(self, state["data"], legacy=state.get("legacy"))
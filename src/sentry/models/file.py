@@ -1,7 +1,8 @@
+import errno
+import fcntl
 import mmap
 import os
 import tempfile
-import time
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from hashlib import sha1
@@ -15,6 +16,7 @@ from django.core.files.storage import get_storage_class
 from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 
+from sentry import options
 from sentry.app import locks
 from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, JSONField, Model
 from sentry.tasks.files import delete_file as delete_file_task
@@ -23,7 +25,6 @@ from sentry.utils import metrics
 from sentry.utils.retries import TimedRetryPolicy
 
 ONE_DAY = 60 * 60 * 24
-ONE_DAY_AND_A_HALF = int(ONE_DAY * 1.5)
 
 UPLOAD_RETRY_TIME = getattr(settings, "SENTRY_UPLOAD_RETRY_TIME", 60)  # 1min
 
@@ -632,28 +633,112 @@ class FileBlobOwner(Model):
         unique_together = (("blob", "organization"),)
 
 
-def clear_cached_files(cache_path):
-    try:
-        cache_folders = os.listdir(cache_path)
-    except OSError:
-        return
+class LocalFileCache:
+    """
+    A cache of `File` contents on the local file system, shared by all
+    processes of a host.
 
-    cutoff = int(time.time()) - ONE_DAY_AND_A_HALF
+    Entries are addressed by the checksum of their contents, so a file is
+    stored only once regardless of how many `File` rows refer to it. Fetches
+    are serialized through a file lock per entry, so concurrent processes
+    wait for the first download instead of starting their own. Every use of
+    an entry bumps its modification time and `clear_old_entries` evicts the
+    least recently used entries once the cache exceeds its maximum size.
 
-    for cache_folder in cache_folders:
-        cache_folder = os.path.join(cache_path, cache_folder)
-        try:
-            items = os.listdir(cache_folder)
-        except OSError:
-            continue
-        for cached_file in items:
-            cached_file = os.path.join(cache_folder, cached_file)
+    Subclasses configure the location and size through options.
+    """
+
+    cache_path_option = None
+    max_size_option = None
+
+    @property
+    def cache_path(self):
+        return options.get(self.cache_path_option)
+
+    def get_path(self, file):
+        key = file.checksum or f"id-{file.id}"
+        return os.path.join(self.cache_path, key[:2], key)
+
+    def fetch(self, file):
+        """
+        Returns the path of a local copy of ``file``, downloading it first if
+        it is not cached yet.
+        """
+        path = self.get_path(file)
+        hit = self._touch(path)
+
+        if not hit:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # Another process might have completed the download while
+                    # we were waiting for the lock.
+                    hit = self._touch(path)
+                    if not hit:
+                        file.save_to(path)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        metrics.incr("filecache.fetch", tags={"cache": self.cache_path_option, "hit": hit})
+        return path
+
+    def open(self, file):
+        """
+        Returns a read-only file object of a local copy of ``file``. The
+        contents are memory mapped, so they are shared between readers.
+        """
+        path = self.fetch(file)
+        with open(path, "rb") as fp:
             try:
-                mtime = os.path.getmtime(cached_file)
-            except OSError:
-                continue
-            if mtime < cutoff:
+                mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                return FileObj(open(path, "rb"), name=path)
+        return FileObj(mapped, name=path)
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return False
+        return True
+
+    def clear_old_entries(self):
+        """
+        Evicts the least recently used entries until the cache fits into its
+        maximum size. Entries that are still open remain readable.
+        """
+        max_size = options.get(self.max_size_option)
+
+        entries = []
+        total_size = 0
+        for dirpath, _, filenames in os.walk(self.cache_path):
+            for filename in filenames:
+                if filename.endswith(".lock"):
+                    continue
+                path = os.path.join(dirpath, filename)
                 try:
-                    os.remove(cached_file)
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        entries.sort()
+        evicted = 0
+        for _, size, path in entries:
+            if total_size <= max_size:
+                break
+            for p in (path, path + ".lock"):
+                try:
+                    os.remove(p)
                 except OSError:
                     pass
+            total_size -= size
+            evicted += 1
+
+        metrics.incr("filecache.evicted", amount=evicted, tags={"cache": self.cache_path_option})
+        metrics.timing("filecache.size", total_size, tags={"cache": self.cache_path_option})
@@ -1,6 +1,8 @@
 from django.db import models
+from django.db.models.signals import post_save
 from django.utils.translation import ugettext_lazy as _
 
+from sentry import grouphash_cache
 from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, Model
 
 
@@ -28,3 +30,18 @@ class GroupHash(Model):
         app_label = "sentry"
         db_table = "sentry_grouphash"
         unique_together = (("project", "hash"),)
+
+
+def invalidate_grouphash_cache(instance, created=False, **kwargs):
+    # Newly created hashes are not associated with any group yet, and bulk
+    # updates have to invalidate the cache themselves.
+    if not created:
+        grouphash_cache.invalidate([instance.project_id])
+
+
+post_save.connect(
+    invalidate_grouphash_cache,
+    sender=GroupHash,
+    dispatch_uid="invalidate_grouphash_cache",
+    weak=False,
+)
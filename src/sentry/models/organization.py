@@ -131,7 +131,7 @@ class Organization(Model):
         default=1,
     )
 
-    objects = OrganizationManager(cache_fields=("pk", "slug"))
+    objects = OrganizationManager(cache_fields=("pk", "slug"), process_cache_ttl=60)
 
     class Meta:
         app_label = "sentry"
@@ -112,7 +112,7 @@ class Project(Model, PendingDeletionMixin):
         null=True,
     )
 
-    objects = ProjectManager(cache_fields=["pk"])
+    objects = ProjectManager(cache_fields=["pk"], process_cache_ttl=60)
     platform = models.CharField(max_length=64, null=True)
 
     class Meta:
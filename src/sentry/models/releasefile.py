@@ -1,16 +1,17 @@
-import errno
-import os
 from urllib.parse import urlsplit, urlunsplit
 
-from django.core.files.base import File as FileObj
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.signals import post_delete, post_save
 
 from sentry import options
 from sentry.db.models import BoundedPositiveIntegerField, FlexibleForeignKey, Model, sane_repr
-from sentry.models import clear_cached_files
+from sentry.models import LocalFileCache
 from sentry.utils import metrics
+from sentry.utils.cache import cache
 from sentry.utils.hashlib import sha1_text
 
+ARTIFACT_INDEX_CACHE_TTL = 3600
+
 
 class ReleaseFile(Model):
     r"""
@@ -59,6 +60,35 @@ class ReleaseFile(Model):
             return sha1_text(name + "\x00\x00" + dist).hexdigest()
         return sha1_text(name).hexdigest()
 
+    @classmethod
+    def get_artifact_index_cache_key(cls, release_id, dist_id=None):
+        return f"releasefile:index:v1:{release_id}:{dist_id or ''}"
+
+    @classmethod
+    def get_artifact_index(cls, release, dist=None):
+        """
+        Returns a mapping of ``ident`` to release file id of all artifacts of
+        the given release and dist.
+
+        The index is built with a single query and then kept in cache until
+        an artifact of the release is added, changed or removed, so that the
+        absence of a file can be determined without hitting the database.
+        """
+        cache_key = cls.get_artifact_index_cache_key(release.id, dist and dist.id)
+        index = cache.get(cache_key)
+        if index is None:
+            index = dict(cls.objects.filter(release=release, dist=dist).values_list("ident", "id"))
+            cache.set(cache_key, index, ARTIFACT_INDEX_CACHE_TTL)
+            metrics.timing("release_file.artifact_index.size", len(index))
+        return index
+
+    @classmethod
+    def clear_artifact_index(cls, instance, **kwargs):
+        # Uploads save artifacts in transactions. An index that is built
+        # before they commit must not survive the commit.
+        cache_key = cls.get_artifact_index_cache_key(instance.release_id, instance.dist_id)
+        transaction.on_commit(lambda: cache.delete(cache_key), using=router.db_for_write(cls))
+
     @classmethod
     def normalize(cls, url):
         """Transforms a full absolute url into 2 or 4 generalized options
@@ -85,10 +115,9 @@ class ReleaseFile(Model):
         return urls
 
 
-class ReleaseFileCache:
-    @property
-    def cache_path(self):
-        return options.get("releasefile.cache-path")
+class ReleaseFileCache(LocalFileCache):
+    cache_path_option = "releasefile.cache-path"
+    max_size_option = "releasefile.cache-max-size"
 
     def getfile(self, releasefile):
         cutoff = options.get("releasefile.cache-limit")
@@ -97,24 +126,11 @@ class ReleaseFileCache:
             metrics.timing("release_file.cache.get.size", file_size, tags={"cutoff": True})
             return releasefile.file.getfile()
 
-        file_id = str(releasefile.file_id)
-        organization_id = str(releasefile.organization_id)
-        file_path = os.path.join(self.cache_path, organization_id, file_id)
-
-        hit = True
-        try:
-            os.stat(file_path)
-        except OSError as e:
-            if e.errno != errno.ENOENT:
-                raise
-            releasefile.file.save_to(file_path)
-            hit = False
-
-        metrics.timing("release_file.cache.get.size", file_size, tags={"hit": hit, "cutoff": False})
-        return FileObj(open(file_path, "rb"))
-
-    def clear_old_entries(self):
-        clear_cached_files(self.cache_path)
+        metrics.timing("release_file.cache.get.size", file_size, tags={"cutoff": False})
+        return self.open(releasefile.file)
 
 
 ReleaseFile.cache = ReleaseFileCache()
+
+post_save.connect(ReleaseFile.clear_artifact_index, sender=ReleaseFile, weak=False)
+post_delete.connect(ReleaseFile.clear_artifact_index, sender=ReleaseFile, weak=False)
@@ -116,7 +116,7 @@ class Team(Model):
     )
     date_added = models.DateTimeField(default=timezone.now, null=True)
 
-    objects = TeamManager(cache_fields=("pk", "slug"))
+    objects = TeamManager(cache_fields=("pk", "slug"), process_cache_ttl=60)
 
     class Meta:
         app_label = "sentry"
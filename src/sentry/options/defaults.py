@@ -51,6 +51,12 @@ register(
     flags=FLAG_PRIORITIZE_DISK,
 )
 register("releasefile.cache-limit", type=Int, default=10 * 1024 * 1024, flags=FLAG_PRIORITIZE_DISK)
+register(
+    "releasefile.cache-max-size", type=Int, default=1024 * 1024 * 1024, flags=FLAG_PRIORITIZE_DISK
+)
+register(
+    "dsym.cache-max-size", type=Int, default=10 * 1024 * 1024 * 1024, flags=FLAG_PRIORITIZE_DISK
+)
 
 # Mail
 register("mail.backend", default="smtp", flags=FLAG_NOSTORE)
@@ -313,5 +319,36 @@ register("store.load-shed-group-creation-projects", type=Sequence, default=[])
 # Killswitch for dropping events in ingest consumer or really anywhere
 register("store.load-shed-pipeline-projects", type=Sequence, default=[])
 
+# Resolve the group of events through `sentry.grouphash_cache` instead of
+# querying `GroupHash` rows for every event.
+register("store.grouphash-cache-enabled", default=True)
+
+# Let a single process create the group when many events with the same new
+# hashes arrive at once. All other processes wait (for at most the timeout, in
+# seconds) for that group instead of contending on the `GroupHash` row locks.
+register("store.coalesce-group-creation", default=False)
+register("store.coalesce-group-creation-timeout", default=2)
+
+# Cache the buckets of `SnubaTSDB` series that have ended, so that only the
+# recent buckets are queried from snuba.
+register("tsdb.snuba.bucket-cache-enabled", default=True)
+
 # Switch for more performant project counter incr
 register("store.projectcounter-modern-upsert-sample-rate", default=0.0)
+
+# Parallel deletion of large relations. Number of shards a project's groups are
+# split into (values below 2 delete them inline) and the countdown between two
+# chunks of a shard. When the database has more than `max-active-queries`
+# active queries (0 disables the check) shards back off for `backoff-delay`
+# seconds instead.
+register("deletions.project.group-shards", default=1)
+register("deletions.sharded.chunk-delay", default=1)
+register("deletions.sharded.max-active-queries", default=0)
+register("deletions.sharded.backoff-delay", default=60)
+
+# High-throughput unmerge. When enabled, an unmerge task keeps processing
+# batches of events for up to `task-duration` seconds and writes their
+# denormalizations at once, rather than handling a single batch per task.
+register("unmerge.high-throughput", default=False)
+register("unmerge.high-throughput.batch-size", default=5000)
+register("unmerge.high-throughput.task-duration", default=300)
@@ -3,10 +3,12 @@ from collections import namedtuple
 from random import random
 from time import time
 
+from django.conf import settings
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
 from django.utils.functional import cached_property
 
+from sentry.utils import invalidation
 from sentry.utils.hashlib import md5_text
 
 Key = namedtuple("Key", ("name", "default", "type", "flags", "ttl", "grace", "cache_key"))
@@ -23,7 +25,14 @@ def _make_cache_key(key):
 
 def _make_cache_value(key, value):
     now = int(time())
-    return (value, now + key.ttl, now + key.ttl + key.grace)
+    ttl = key.ttl
+    # While this process is subscribed to invalidations, changes are pushed
+    # to us and the local copy can be kept for much longer. The local cache
+    # is flushed whenever the subscription is (re)established or lost, so
+    # entries stored with the extended TTL never outlive the subscription.
+    if invalidation.is_connected():
+        ttl = max(ttl, settings.SENTRY_OPTIONS_SUBSCRIBED_TTL)
+    return (value, now + ttl, now + ttl + key.grace)
 
 
 class OptionsStore:
@@ -38,6 +47,8 @@ class OptionsStore:
     OptionsManager instead, unless you need raw access to something.
     """
 
+    invalidation_topic = "options"
+
     def __init__(self, cache=None, ttl=None):
         self.cache = cache
         self.ttl = ttl
@@ -89,6 +100,7 @@ class OptionsStore:
             value = None
 
         if value is not None and key.ttl > 0:
+            invalidation.ensure_subscribed()
             self._local_cache[cache_key] = _make_cache_value(key, value)
 
         return value
@@ -180,7 +192,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value)
-        return self.set_cache(key, value)
+        result = self.set_cache(key, value)
+        invalidation.publish(self.invalidation_topic, [key.cache_key])
+        return result
 
     def set_store(self, key, value):
         from sentry.db.models.query import create_or_update
@@ -196,6 +210,7 @@ class OptionsStore:
         cache_key = key.cache_key
 
         if key.ttl > 0:
+            invalidation.ensure_subscribed()
             self._local_cache[cache_key] = _make_cache_value(key, value)
 
         try:
@@ -215,7 +230,9 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
-        return self.delete_cache(key)
+        result = self.delete_cache(key)
+        invalidation.publish(self.invalidation_topic, [key.cache_key])
+        return result
 
     def delete_store(self, key):
         self.model.objects.filter(key=key.name).delete()
@@ -268,6 +285,18 @@ class OptionsStore:
         """
         self._local_cache = {}
 
+    def handle_invalidation(self, cache_keys):
+        """
+        Drops options changed by another process from the local cache. A
+        value of ``None`` flushes the local cache entirely.
+        """
+        if cache_keys is None:
+            self.flush_local_cache()
+            return
+
+        for cache_key in cache_keys:
+            self._local_cache.pop(cache_key, None)
+
     def maybe_clean_local_cache(self, **kwargs):
         # Periodically force an expire on the local cache.
         # This cleanup is purely to keep memory low and garbage collect
@@ -286,3 +315,4 @@ class OptionsStore:
 
         task_postrun.connect(self.maybe_clean_local_cache)
         request_finished.connect(self.maybe_clean_local_cache)
+        invalidation.register(self.invalidation_topic, self.handle_invalidation)
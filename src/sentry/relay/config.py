@@ -45,6 +45,33 @@ def get_exposed_features(project: Project) -> List[str]:
     return active_features
 
 
+class SectionCache:
+    """
+    Memoizes sections of project configs by the inputs they are derived from.
+
+    When the configs of many projects are generated at once (for instance for
+    an entire organization), sections that only depend on the organization
+    are computed once instead of once per project.
+    """
+
+    def __init__(self):
+        self._sections = {}
+
+    def get_or_compute(self, section, key, compute):
+        cache_key = (section, key)
+        try:
+            return self._sections[cache_key]
+        except KeyError:
+            rv = self._sections[cache_key] = compute()
+            return rv
+
+
+def _get_exposed_features_key(project):
+    if all(feature.startswith("organizations:") for feature in EXPOSABLE_FEATURES):
+        return project.organization_id
+    return project.organization_id, project.id
+
+
 def get_project_key_config(project_key):
     """Returns a dict containing the information for a specific project key"""
     return {"dsn": project_key.dsn_public}
@@ -105,7 +132,7 @@ def get_quotas(project, keys=None):
     return [quota.to_json() for quota in quotas.get_quotas(project, keys=keys)]
 
 
-def get_project_config(project, full_config=True, project_keys=None):
+def get_project_config(project, full_config=True, project_keys=None, section_cache=None):
     """
     Constructs the ProjectConfig information.
 
@@ -119,9 +146,14 @@ def get_project_config(project, full_config=True, project_keys=None):
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param section_cache: A ``SectionCache`` to share organization-level
+        sections between the configs of multiple projects.
 
     :return: a ProjectConfig object for the given project
     """
+    if section_cache is None:
+        section_cache = SectionCache()
+
     with configure_scope() as scope:
         scope.set_tag("project", project.id)
 
@@ -141,28 +173,42 @@ def get_project_config(project, full_config=True, project_keys=None):
             "publicKeys": public_keys,
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": section_cache.get_or_compute(
+                    "trustedRelays",
+                    project.organization_id,
+                    lambda: [
+                        r["public_key"]
+                        for r in project.organization.get_option("sentry:trusted-relays", [])
+                        if r
+                    ],
+                ),
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
-                "features": get_exposed_features(project),
+                "features": section_cache.get_or_compute(
+                    "features",
+                    _get_exposed_features_key(project),
+                    lambda: get_exposed_features(project),
+                ),
             },
             "organizationId": project.organization_id,
             "projectId": project.id,  # XXX: Unused by Relay, required by Python store
         }
-    allow_dynamic_sampling = features.has(
+    allow_dynamic_sampling = section_cache.get_or_compute(
         "organizations:filters-and-sampling",
-        project.organization,
+        project.organization_id,
+        lambda: features.has("organizations:filters-and-sampling", project.organization),
     )
     if allow_dynamic_sampling:
         dynamic_sampling = project.get_option("sentry:dynamic_sampling")
         if dynamic_sampling is not None:
             cfg["config"]["dynamicSampling"] = dynamic_sampling
 
-    if features.has("organizations:performance-ops-breakdown", project.organization):
+    allow_breakdowns = section_cache.get_or_compute(
+        "organizations:performance-ops-breakdown",
+        project.organization_id,
+        lambda: features.has("organizations:performance-ops-breakdown", project.organization),
+    )
+    if allow_breakdowns:
         breakdowns_config = project.get_option("sentry:breakdowns")
         if breakdowns_config is not None:
             cfg["config"]["breakdowns"] = breakdowns_config
@@ -176,13 +222,42 @@ def get_project_config(project, full_config=True, project_keys=None):
     with Hub.current.start_span(op="get_grouping_config_dict_for_project"):
         cfg["config"]["groupingConfig"] = get_grouping_config_dict_for_project(project)
     with Hub.current.start_span(op="get_event_retention"):
-        cfg["config"]["eventRetention"] = quotas.get_event_retention(project.organization)
+        cfg["config"]["eventRetention"] = section_cache.get_or_compute(
+            "eventRetention",
+            project.organization_id,
+            lambda: quotas.get_event_retention(project.organization),
+        )
     with Hub.current.start_span(op="get_all_quotas"):
         cfg["config"]["quotas"] = get_quotas(project, keys=project_keys)
 
     return ProjectConfig(project, **cfg)
 
 
+def get_project_config_for_key(project, project_config, project_key):
+    """
+    Derives the config of a single project key from the full config of its
+    project.
+
+    This is equivalent to calling ``get_project_config`` with just
+    ``project_key``, but only recomputes the sections that depend on the
+    key (public keys and quotas) instead of building the entire config again.
+
+    :param project: The project the key belongs to.
+    :param project_config: The full ProjectConfig of ``project``, as returned
+        by ``get_project_config(project, full_config=True)``.
+    :param project_key: The project key to derive the config for.
+
+    :return: a ProjectConfig object for the given project key
+    """
+    if project_config.disabled:
+        return project_config
+
+    cfg = project_config.to_dict()
+    cfg["publicKeys"] = get_public_key_configs(project, True, project_keys=[project_key])
+    cfg["config"] = dict(cfg["config"], quotas=get_quotas(project, keys=[project_key]))
+    return ProjectConfig(project, **cfg)
+
+
 class _ConfigBase:
     """
     Base class for configuration objects
@@ -83,7 +83,7 @@ import logging
 import sentry_sdk
 from django.conf import settings
 
-from sentry import eventstore, models, nodestore, options
+from sentry import eventstore, grouphash_cache, models, nodestore, options
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.deletions.defaults.group import DIRECT_GROUP_RELATED_MODELS
 from sentry.eventstore.models import Event
@@ -370,6 +370,9 @@ def start_group_reprocessing(
         for model in GROUP_MODELS_TO_MIGRATE:
             model.objects.filter(group_id=group_id).update(group_id=new_group.id)
 
+        # The bulk update above does not invalidate the cached hashes.
+        grouphash_cache.invalidate([project_id])
+
     # Get event counts of issue (for all environments etc). This was copypasted
     # and simplified from groupserializer.
     event_count = snuba.aliased_query(
@@ -64,6 +64,7 @@ list(
             "sentry.runner.commands.init.init",
             "sentry.runner.commands.migrations.migrations",
             "sentry.runner.commands.plugins.plugins",
+            "sentry.runner.commands.profile.profile",
             "sentry.runner.commands.queues.queues",
             "sentry.runner.commands.repair.repair",
             "sentry.runner.commands.run.run",
@@ -0,0 +1,75 @@
+import os
+import stat
+import time
+
+import click
+
+from sentry.runner.decorators import configuration
+
+
+def check_output_file(path):
+    """
+    Refuses to touch anything at ``path`` (which is in the shared temporary
+    directory) that is not a regular file owned by the current user.
+    """
+    st = os.lstat(path)
+    if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid():
+        raise click.ClickException(f"{path} is not a regular file owned by the current user")
+
+
+@click.command()
+@click.option("--pid", type=int, required=True, help="The process to profile.")
+@click.option(
+    "--duration", default=30, show_default=True, help="The number of seconds to profile for."
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w"),
+    default="-",
+    help="Where to write the stacks to, defaults to stdout.",
+)
+@configuration
+def profile(pid, duration, output):
+    """Profile a running Sentry process.
+
+    Samples the stacks of the process and writes them in collapsed form, as
+    used by flamegraph.pl and speedscope. The process must run with
+    SENTRY_PROFILER_SIGNAL configured.
+    """
+    from django.conf import settings
+
+    from sentry.utils.profiler import get_output_path, get_signal
+
+    if not settings.SENTRY_PROFILER_SIGNAL:
+        raise click.ClickException("SENTRY_PROFILER_SIGNAL is not configured")
+
+    signum = get_signal(settings.SENTRY_PROFILER_SIGNAL)
+    path = get_output_path(pid)
+    if os.path.lexists(path):
+        check_output_file(path)
+        os.remove(path)
+
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        raise click.ClickException(f"No process with pid {pid}")
+
+    click.echo(f"Profiling {pid} for {duration} seconds...", err=True)
+    try:
+        time.sleep(duration)
+    finally:
+        os.kill(pid, signum)
+
+    # The process writes the stacks as soon as it handles the signal, which
+    # waits for the current bytecode instruction to finish.
+    deadline = time.time() + 10
+    while not os.path.lexists(path):
+        if time.time() > deadline:
+            raise click.ClickException(f"Process {pid} did not write its profile to {path}")
+        time.sleep(0.1)
+
+    check_output_file(path)
+    with os.fdopen(os.open(path, os.O_RDONLY | os.O_NOFOLLOW)) as f:
+        output.write(f.read())
+    os.remove(path)
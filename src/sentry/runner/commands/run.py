@@ -353,6 +353,12 @@ def post_process_forwarder(**options):
     type=int,
     help="How many messages to process before committing offsets.",
 )
+@click.option(
+    "--batch-size",
+    default=1,
+    type=int,
+    help="How many messages to process at once. Subscriptions, alert rules and stats are fetched in bulk for a batch.",
+)
 @click.option(
     "--initial-offset-reset",
     default="latest",
@@ -376,6 +382,7 @@ def query_subscription_consumer(**options):
         commit_batch_size=options["commit_batch_size"],
         initial_offset_reset=options["initial_offset_reset"],
         force_offset_reset=options["force_offset_reset"],
+        batch_size=options["batch_size"],
     )
 
     def handler(signum, frame):
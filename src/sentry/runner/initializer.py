@@ -370,6 +370,11 @@ def initialize_app(config, skip_service_validation=False):
 
     configure_sdk()
 
+    if settings.SENTRY_PROFILER_SIGNAL:
+        from sentry.utils.profiler import install_signal_handler
+
+        install_signal_handler(settings.SENTRY_PROFILER_SIGNAL)
+
     setup_services(validate=not skip_service_validation)
 
     from django.utils import timezone
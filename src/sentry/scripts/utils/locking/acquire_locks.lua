@@ -0,0 +1,19 @@
+-- Sets all lock KEYS to the uuid, or none of them if any is already taken.
+-- Returns the keys that are taken, an empty table if the locks were acquired.
+local uuid = ARGV[1]
+local duration = tonumber(ARGV[2])
+
+local conflicts = {}
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        table.insert(conflicts, key)
+    end
+end
+
+if #conflicts == 0 then
+    for _, key in ipairs(KEYS) do
+        redis.call('SET', key, uuid, 'EX', duration)
+    end
+end
+
+return conflicts
@@ -0,0 +1,14 @@
+-- Deletes the lock KEYS that are held by the uuid. Returns the keys that are
+-- not held by it.
+local uuid = ARGV[1]
+
+local missing = {}
+for _, key in ipairs(KEYS) do
+    if redis.call('GET', key) == uuid then
+        redis.call('DEL', key)
+    else
+        table.insert(missing, key)
+    end
+end
+
+return missing
@@ -46,6 +46,7 @@ __all__ = (
     "get_facets",
     "transform_data",
     "zerofill",
+    "zerofill_series",
     "histogram_query",
     "check_multihistogram_fields",
 )
@@ -87,31 +88,80 @@ def resolve_discover_aliases(snuba_filter, function_translations=None):
     )
 
 
-def zerofill(data, start, end, rollup, orderby):
-    rv = []
+def _get_zerofill_range(start, end, rollup):
     start = int(to_naive_timestamp(naiveify_datetime(start)) / rollup) * rollup
     end = (int(to_naive_timestamp(naiveify_datetime(end)) / rollup) * rollup) + rollup
-    data_by_time = {}
+    return start, end
 
-    for obj in data:
-        if obj["time"] in data_by_time:
-            data_by_time[obj["time"]].append(obj)
-        else:
-            data_by_time[obj["time"]] = [obj]
 
-    for key in range(start, end, rollup):
-        if key in data_by_time and len(data_by_time[key]) > 0:
-            rv = rv + data_by_time[key]
-            data_by_time[key] = []
+def _bucket_index(time, start, end, rollup):
+    """
+    Returns the index of the bucket a row with `time` belongs to, or `None` if
+    it doesn't fall on a bucket between `start` and `end`.
+    """
+    if not isinstance(time, (int, float)) or not start <= time < end:
+        return None
+    index, remainder = divmod(time - start, rollup)
+    if remainder:
+        return None
+    return int(index)
+
+
+def _fill_buckets(buckets, start, rollup):
+    rv = []
+    for index, bucket in enumerate(buckets):
+        if bucket:
+            rv.extend(bucket)
         else:
-            rv.append({"time": key})
+            rv.append({"time": start + index * rollup})
+    return rv
+
 
+def zerofill(data, start, end, rollup, orderby):
+    start, end = _get_zerofill_range(start, end, rollup)
+    buckets = [[] for _ in range((end - start) // rollup)]
+
+    for obj in data:
+        index = _bucket_index(obj["time"], start, end, rollup)
+        if index is not None:
+            buckets[index].append(obj)
+
+    rv = _fill_buckets(buckets, start, rollup)
     if "-time" in orderby:
         return list(reversed(rv))
 
     return rv
 
 
+def zerofill_series(data, get_key, keys, start, end, rollup):
+    """
+    Splits `data` into one zerofilled series per key in a single pass over the
+    rows. Each row is placed into the bucket array of the series `get_key(row)`
+    returns.
+
+    Returns a tuple of a dictionary of key to the zerofilled rows of that series
+    (ordered by time ascending), and a list of the rows whose key isn't in `keys`.
+    """
+    start, end = _get_zerofill_range(start, end, rollup)
+    num_buckets = (end - start) // rollup
+    series = {key: [[] for _ in range(num_buckets)] for key in keys}
+    unmatched = []
+
+    for row in data:
+        buckets = series.get(get_key(row))
+        if buckets is None:
+            unmatched.append(row)
+            continue
+        index = _bucket_index(row["time"], start, end, rollup)
+        if index is not None:
+            buckets[index].append(row)
+
+    return (
+        {key: _fill_buckets(buckets, start, rollup) for key, buckets in series.items()},
+        unmatched,
+    )
+
+
 def transform_results(results, function_alias_map, translated_columns, snuba_filter):
     results = transform_data(results, translated_columns, snuba_filter)
     results["meta"] = transform_meta(results, function_alias_map)
@@ -567,28 +617,34 @@ def top_events_timeseries(
         # so the result key is consistent
         translated_groupby.sort()
 
-        results = {}
         # Using the top events add the order to the results
+        order = {}
         for index, item in enumerate(top_events["data"]):
-            result_key = create_result_key(item, translated_groupby, issues)
-            results[result_key] = {"order": index, "data": []}
-        for row in result["data"]:
-            result_key = create_result_key(row, translated_groupby, issues)
-            if result_key in results:
-                results[result_key]["data"].append(row)
-            else:
-                logger.warning(
-                    "discover.top-events.timeseries.key-mismatch",
-                    extra={"result_key": result_key, "top_event_keys": list(results.keys())},
-                )
-        for key, item in results.items():
-            results[key] = SnubaTSResult(
-                {
-                    "data": zerofill(
-                        item["data"], snuba_filter.start, snuba_filter.end, rollup, "time"
+            order[create_result_key(item, translated_groupby, issues)] = index
+
+        series, unmatched = zerofill_series(
+            result["data"],
+            lambda row: create_result_key(row, translated_groupby, issues),
+            order.keys(),
+            snuba_filter.start,
+            snuba_filter.end,
+            rollup,
+        )
+        if unmatched:
+            logger.warning(
+                "discover.top-events.timeseries.key-mismatch",
+                extra={
+                    "result_keys": list(
+                        {create_result_key(row, translated_groupby, issues) for row in unmatched}
                     ),
-                    "order": item["order"],
+                    "top_event_keys": list(order.keys()),
                 },
+            )
+
+        results = {}
+        for key, data in series.items():
+            results[key] = SnubaTSResult(
+                {"data": data, "order": order[key]},
                 snuba_filter.start,
                 snuba_filter.end,
                 rollup,
@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Callable, Dict, Iterable, List, Optional, cast
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
 
 import jsonschema
 import pytz
@@ -18,8 +19,12 @@ from sentry.utils.batching_kafka_consumer import wait_for_topics
 logger = logging.getLogger(__name__)
 
 TQuerySubscriptionCallable = Callable[[Dict[str, Any], QuerySubscription], None]
+TQuerySubscriptionBatchCallable = Callable[
+    [List[Tuple[Dict[str, Any], QuerySubscription]], Dict[str, Any]], None
+]
 
 subscriber_registry: Dict[str, TQuerySubscriptionCallable] = {}
+batch_subscriber_registry: Dict[str, TQuerySubscriptionBatchCallable] = {}
 
 
 def register_subscriber(
@@ -34,6 +39,29 @@ def register_subscriber(
     return inner
 
 
+def register_batch_subscriber(
+    subscriber_key: str,
+) -> Callable[[TQuerySubscriptionBatchCallable], TQuerySubscriptionBatchCallable]:
+    """
+    Registers a callback that receives all updates for subscriptions of type
+    `subscriber_key` read from a partition in one batch, as a list of
+    `(subscription_update, subscription)` tuples. The callback also receives a
+    dict that it can use to keep state across batches. The state is specific to
+    the partition and is dropped when the partition is revoked.
+
+    Only used when the consumer runs with a `batch_size` greater than one, and
+    a regular subscriber has to be registered for the same key as well.
+    """
+
+    def inner(func: TQuerySubscriptionBatchCallable) -> TQuerySubscriptionBatchCallable:
+        if subscriber_key in batch_subscriber_registry:
+            raise Exception("Batch handler already registered for %s" % subscriber_key)
+        batch_subscriber_registry[subscriber_key] = func
+        return func
+
+    return inner
+
+
 class InvalidMessageError(Exception):
     pass
 
@@ -61,6 +89,7 @@ class QuerySubscriptionConsumer:
         commit_batch_size: int = 100,
         initial_offset_reset: str = "earliest",
         force_offset_reset: Optional[str] = None,
+        batch_size: int = 1,
     ):
         self.group_id = group_id
         if not topic:
@@ -70,8 +99,11 @@ class QuerySubscriptionConsumer:
         self.topic = topic
         cluster_name: str = settings.KAFKA_TOPICS[topic]["cluster"]
         self.commit_batch_size = commit_batch_size
+        self.batch_size = batch_size
         self.initial_offset_reset = initial_offset_reset
         self.offsets: Dict[int, Optional[int]] = {}
+        self.batch: List[Message] = []
+        self.partition_state: Dict[int, Dict[str, Any]] = {}
         self.consumer: Consumer = None
         self.cluster_options = kafka_config.get_kafka_consumer_cluster_options(
             cluster_name,
@@ -136,9 +168,13 @@ class QuerySubscriptionConsumer:
 
         def on_revoke(consumer: Consumer, partitions: List[TopicPartition]) -> None:
             partition_numbers = [partition.partition for partition in partitions]
+            # Finish the messages we already read from the revoked partitions
+            # before handing them over to another consumer.
+            self.flush_batch()
             self.commit_offsets(partition_numbers)
             for partition_number in partition_numbers:
                 self.offsets.pop(partition_number, None)
+                self.partition_state.pop(partition_number, None)
             logger.info(
                 "query-subscription-consumer.on_revoke",
                 extra={
@@ -158,31 +194,37 @@ class QuerySubscriptionConsumer:
 
         self.consumer.subscribe([self.topic], on_assign=on_assign, on_revoke=on_revoke)
 
-        i = 0
+        uncommitted = 0
         while not self.__shutdown_requested:
             message = self.consumer.poll(0.1)
             if message is None:
-                continue
-
-            error = message.error()
-            if error is not None:
-                raise KafkaException(error)
-
-            i = i + 1
-
-            with sentry_sdk.start_transaction(
-                op="handle_message",
-                name="query_subscription_consumer_process_message",
-                sampled=True,
-            ), metrics.timer("snuba_query_subscriber.handle_message"):
-                self.handle_message(message)
-
-            # Track latest completed message here, for use in `shutdown` handler.
-            self.offsets[message.partition()] = message.offset() + 1
-
-            if i % self.commit_batch_size == 0:
+                # Don't hold on to a partial batch while the topic is idle
+                uncommitted += self.flush_batch()
+            else:
+                error = message.error()
+                if error is not None:
+                    raise KafkaException(error)
+
+                if self.batch_size > 1:
+                    self.batch.append(message)
+                    if len(self.batch) >= self.batch_size:
+                        uncommitted += self.flush_batch()
+                else:
+                    with sentry_sdk.start_transaction(
+                        op="handle_message",
+                        name="query_subscription_consumer_process_message",
+                        sampled=True,
+                    ), metrics.timer("snuba_query_subscriber.handle_message"):
+                        self.handle_message(message)
+
+                    # Track latest completed message here, for use in `shutdown` handler.
+                    self.offsets[message.partition()] = message.offset() + 1
+                    uncommitted += 1
+
+            if uncommitted >= self.commit_batch_size:
                 logger.debug("Committing offsets")
                 self.commit_offsets()
+                uncommitted = 0
 
         logger.debug("Committing offsets and closing consumer")
         self.commit_offsets()
@@ -210,6 +252,131 @@ class QuerySubscriptionConsumer:
     def shutdown(self) -> None:
         self.__shutdown_requested = True
 
+    def flush_batch(self) -> int:
+        """
+        Handles all messages collected in the current batch and records their
+        offsets. Returns the number of messages handled.
+        """
+        messages, self.batch = self.batch, []
+        if not messages:
+            return 0
+
+        with sentry_sdk.start_transaction(
+            op="handle_batch",
+            name="query_subscription_consumer_process_batch",
+            sampled=True,
+        ), metrics.timer("snuba_query_subscriber.handle_batch"):
+            self.handle_batch(messages)
+
+        metrics.timing("snuba_query_subscriber.batch_size", len(messages))
+        for message in messages:
+            self.offsets[message.partition()] = message.offset() + 1
+        return len(messages)
+
+    def handle_batch(self, messages: List[Message]) -> None:
+        """
+        Handles a batch of messages. Subscriptions for all messages are fetched
+        with a single query, and updates for subscription types that have a
+        batch subscriber registered are passed to it per partition. Other
+        updates are passed to the regular subscriber one by one.
+        :param messages:
+        :return:
+        """
+        parsed_messages = []
+        for message in messages:
+            contents = self._parse_message(message)
+            if contents is not None:
+                parsed_messages.append((message, contents))
+
+        with metrics.timer("snuba_query_subscriber.fetch_subscriptions"):
+            subscriptions = {
+                subscription.subscription_id: subscription
+                for subscription in QuerySubscription.objects.filter(
+                    subscription_id__in={
+                        contents["subscription_id"] for _, contents in parsed_messages
+                    }
+                ).select_related("snuba_query")
+            }
+
+        batches: Dict[Tuple[int, str], List[Tuple[Dict[str, Any], QuerySubscription]]]
+        batches = defaultdict(list)
+        for message, contents in parsed_messages:
+            subscription = subscriptions.get(contents["subscription_id"])
+            if subscription is None:
+                self._handle_missing_subscription(message, contents)
+                continue
+
+            if not self._is_valid_subscription(message, subscription):
+                continue
+
+            if subscription.type in batch_subscriber_registry:
+                batches[(message.partition(), subscription.type)].append((contents, subscription))
+            else:
+                with metrics.timer(
+                    "snuba_query_subscriber.callback.duration", instance=subscription.type
+                ):
+                    subscriber_registry[subscription.type](contents, subscription)
+
+        for (partition, subscription_type), updates in batches.items():
+            callback = batch_subscriber_registry[subscription_type]
+            with sentry_sdk.start_span(op="process_batch") as span, metrics.timer(
+                "snuba_query_subscriber.batch_callback.duration", instance=subscription_type
+            ):
+                span.set_data("message_partition", partition)
+                span.set_data("batch_size", len(updates))
+                callback(updates, self.partition_state.setdefault(partition, {}))
+
+    def _parse_message(self, message: Message) -> Optional[Dict[str, Any]]:
+        try:
+            with metrics.timer("snuba_query_subscriber.parse_message_value"):
+                return self.parse_message_value(message.value())
+        except InvalidMessageError:
+            # If the message is in an invalid format, just log the error
+            # and continue
+            logger.exception(
+                "Subscription update could not be parsed",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            return None
+
+    def _handle_missing_subscription(self, message: Message, contents: Dict[str, Any]) -> None:
+        metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
+        logger.error(
+            "Received subscription update, but subscription does not exist",
+            extra={
+                "offset": message.offset(),
+                "partition": message.partition(),
+                "value": message.value(),
+            },
+        )
+        try:
+            _delete_from_snuba(self.topic_to_dataset[message.topic()], contents["subscription_id"])
+        except Exception:
+            logger.exception("Failed to delete unused subscription from snuba.")
+
+    def _is_valid_subscription(self, message: Message, subscription: QuerySubscription) -> bool:
+        if subscription.status != QuerySubscription.Status.ACTIVE.value:
+            metrics.incr("snuba_query_subscriber.subscription_inactive")
+            return False
+
+        if subscription.type not in subscriber_registry:
+            metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
+            logger.error(
+                "Received subscription update, but no subscription handler registered",
+                extra={
+                    "offset": message.offset(),
+                    "partition": message.partition(),
+                    "value": message.value(),
+                },
+            )
+            return False
+
+        return True
+
     def handle_message(self, message: Message) -> None:
         """
         Parses the value from Kafka, and if valid passes the payload to the callback defined by the
@@ -219,20 +386,8 @@ class QuerySubscriptionConsumer:
         :return:
         """
         with sentry_sdk.push_scope() as scope:
-            try:
-                with metrics.timer("snuba_query_subscriber.parse_message_value"):
-                    contents = self.parse_message_value(message.value())
-            except InvalidMessageError:
-                # If the message is in an invalid format, just log the error
-                # and continue
-                logger.exception(
-                    "Subscription update could not be parsed",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
+            contents = self._parse_message(message)
+            if contents is None:
                 return
             scope.set_tag("query_subscription_id", contents["subscription_id"])
 
@@ -241,37 +396,11 @@ class QuerySubscriptionConsumer:
                     subscription: QuerySubscription = QuerySubscription.objects.get_from_cache(
                         subscription_id=contents["subscription_id"]
                     )
-                    if subscription.status != QuerySubscription.Status.ACTIVE.value:
-                        metrics.incr("snuba_query_subscriber.subscription_inactive")
-                        return
             except QuerySubscription.DoesNotExist:
-                metrics.incr("snuba_query_subscriber.subscription_doesnt_exist")
-                logger.error(
-                    "Received subscription update, but subscription does not exist",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
-                try:
-                    _delete_from_snuba(
-                        self.topic_to_dataset[message.topic()], contents["subscription_id"]
-                    )
-                except Exception:
-                    logger.exception("Failed to delete unused subscription from snuba.")
+                self._handle_missing_subscription(message, contents)
                 return
 
-            if subscription.type not in subscriber_registry:
-                metrics.incr("snuba_query_subscriber.subscription_type_not_registered")
-                logger.error(
-                    "Received subscription update, but no subscription handler registered",
-                    extra={
-                        "offset": message.offset(),
-                        "partition": message.partition(),
-                        "value": message.value(),
-                    },
-                )
+            if not self._is_valid_subscription(message, subscription):
                 return
 
             sentry_sdk.set_tag("project_id", subscription.project_id)
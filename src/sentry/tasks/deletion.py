@@ -69,7 +69,62 @@ def run_deletion(deletion_id):
     has_more = task.chunk()
     if has_more:
         run_deletion.apply_async(kwargs={"deletion_id": deletion_id}, countdown=15)
-    deletion.delete()
+    else:
+        deletion.delete()
+
+
+@instrumented_task(
+    name="sentry.tasks.deletion.run_sharded_deletion",
+    queue="cleanup",
+    default_retry_delay=60 * 5,
+    max_retries=MAX_RETRIES,
+)
+@retry(exclude=(DeleteAborted,))
+def run_sharded_deletion(
+    app_label,
+    model_name,
+    query,
+    num_shards,
+    shard_id,
+    transaction_id,
+    actor_id=None,
+    task=None,
+    **kwargs,
+):
+    """
+    Deletes the rows of one shard of a relation that has been fanned out by
+    ``sentry.deletions.sharding.schedule_shards``.
+    """
+    from sentry import deletions
+    from sentry.deletions import sharding
+    from sentry.utils.imports import import_string
+
+    model = apps.get_model(app_label, model_name)
+
+    deletion_task = deletions.get(
+        model=model,
+        query=query,
+        task=import_string(task) if task else None,
+        transaction_id=transaction_id,
+        actor_id=actor_id,
+    )
+    has_more = deletion_task.chunk(num_shards=num_shards, shard_id=shard_id)
+    if has_more:
+        run_sharded_deletion.apply_async(
+            kwargs={
+                "app_label": app_label,
+                "model_name": model_name,
+                "query": query,
+                "num_shards": num_shards,
+                "shard_id": shard_id,
+                "transaction_id": transaction_id,
+                "actor_id": actor_id,
+                "task": task,
+            },
+            countdown=sharding.get_throttle_delay(model),
+        )
+    else:
+        sharding.mark_shard_complete(transaction_id, model)
 
 
 @instrumented_task(
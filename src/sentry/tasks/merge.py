@@ -3,7 +3,7 @@ import logging
 from django.db import DataError, IntegrityError, router, transaction
 from django.db.models import F
 
-from sentry import eventstream, similarity
+from sentry import eventstream, grouphash_cache, similarity
 from sentry.app import tsdb
 from sentry.tasks.base import instrumented_task, track_group_async_operation
 
@@ -104,6 +104,7 @@ def merge_groups(
         has_more = merge_objects(
             model_list, group, new_group, logger=logger, transaction_id=transaction_id
         )
+        grouphash_cache.invalidate([group.project_id])
 
         if not has_more:
             # There are no more objects to merge for *this* "from" group, remove it
@@ -28,7 +28,7 @@ def update_config_cache(generate, organization_id=None, project_id=None, update_
 
     from sentry.models import Project, ProjectKey, ProjectKeyStatus
     from sentry.relay import projectconfig_cache
-    from sentry.relay.config import get_project_config
+    from sentry.relay.config import SectionCache, get_project_config, get_project_config_for_key
 
     if project_id:
         set_current_event_project(project_id)
@@ -54,31 +54,42 @@ def update_config_cache(generate, organization_id=None, project_id=None, update_
     elif organization_id:
         # XXX(markus): I feel like we should be able to cache this but I don't
         # want to add another method to src/sentry/db/models/manager.py
-        projects = Project.objects.filter(organization_id=organization_id)
+        projects = Project.objects.filter(organization_id=organization_id).select_related(
+            "organization"
+        )
 
     project_keys = {}
     for key in ProjectKey.objects.filter(project_id__in=[project.id for project in projects]):
         project_keys.setdefault(key.project_id, []).append(key)
 
     if generate:
+        # Organization-level sections are shared between all projects, and
+        # the configs of individual keys are derived from the config of their
+        # project rather than built from scratch.
+        section_cache = SectionCache()
         config_cache = {}
         for project in projects:
             project_config = get_project_config(
-                project, project_keys=project_keys.get(project.id, []), full_config=True
+                project,
+                project_keys=project_keys.get(project.id, []),
+                full_config=True,
+                section_cache=section_cache,
             )
             config_cache[project.id] = project_config.to_dict()
 
             for key in project_keys.get(project.id) or ():
-                # XXX(markus): This is currently the cleanest way to get only
-                # state for a single projectkey (considering quotas and
-                # everything)
                 if key.status != ProjectKeyStatus.ACTIVE:
                     continue
 
-                project_config = get_project_config(project, project_keys=[key], full_config=True)
-                config_cache[key.public_key] = project_config.to_dict()
+                key_config = get_project_config_for_key(project, project_config, key)
+                config_cache[key.public_key] = key_config.to_dict()
 
         projectconfig_cache.set_many(config_cache)
+        metrics.timing(
+            "relay.projectconfig_cache.generated",
+            len(config_cache),
+            tags={"update_reason": update_reason},
+        )
     else:
         cache_keys_to_delete = []
         for project in projects:
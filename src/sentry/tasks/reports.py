@@ -26,6 +26,7 @@ from sentry.app import tsdb
 from sentry.constants import DataCategory
 from sentry.models import (
     Activity,
+    Group,
     GroupStatus,
     Organization,
     OrganizationStatus,
@@ -52,6 +53,10 @@ logger = logging.getLogger(__name__)
 
 BATCH_SIZE = 20000
 
+# Number of projects whose reports are prepared together by
+# ``prepare_organization_reports``.
+PROJECT_BATCH_SIZE = 500
+
 ONE_DAY = int(timedelta(days=1).total_seconds())
 
 project_breakdown_colors = ["#422C6E", "#895289", "#D6567F", "#F38150", "#F2B713"]
@@ -212,15 +217,30 @@ def merge_series(target, other, function=operator.add):
     return results
 
 
-def _query_tsdb_groups_chunked(func, issue_ids, start, stop, rollup):
+def _query_tsdb_chunked(func, model, keys, start, stop, rollup):
     combined = {}
 
-    for chunk in chunked(issue_ids, BATCH_SIZE):
-        combined.update(func(tsdb.models.group, chunk, start, stop, rollup=rollup))
+    for chunk in chunked(keys, BATCH_SIZE):
+        combined.update(func(model, chunk, start, stop, rollup=rollup))
 
     return combined
 
 
+def _query_tsdb_groups_chunked(func, issue_ids, start, stop, rollup):
+    return _query_tsdb_chunked(func, tsdb.models.group, issue_ids, start, stop, rollup)
+
+
+def add_columns(target, other):
+    """
+    Adds the values of ``other`` to the list ``target`` in place. Both must
+    have the same length.
+    """
+    assert len(target) == len(other), "column lengths must match"
+    for i, value in enumerate(other):
+        target[i] += value
+    return target
+
+
 def prepare_project_series(start__stop, project):
     start, stop = start__stop
     rollup = ONE_DAY
@@ -436,6 +456,220 @@ def prepare_project_calendar_series(interval, project):
     return clean_calendar_data(project, series, start, stop, rollup)
 
 
+def prepare_organization_series(interval, projects):
+    """
+    Batched version of ``prepare_project_series``, returning the series of
+    every project in ``projects`` keyed by project ID.
+    """
+    start, stop = interval
+    rollup = ONE_DAY
+
+    resolution, series = tsdb.get_optimal_rollup_series(start, stop, rollup)
+    assert resolution == rollup, "resolution does not match requested value"
+
+    clean = partial(clean_series, start, stop, rollup)
+    timestamps = [timestamp for timestamp, _ in clean([(timestamp, 0) for timestamp in series])]
+
+    # Series are handled as columns of values rather than lists of
+    # (timestamp, value) pairs, all of them share the same timestamps.
+    resolved = {project.id: [0] * len(timestamps) for project in projects}
+
+    issue_projects = dict(
+        Group.objects.filter(
+            project_id__in=list(resolved),
+            status=GroupStatus.RESOLVED,
+            resolved_at__gte=start,
+            resolved_at__lt=stop,
+        ).values_list("id", "project_id")
+    )
+    tsdb_range = _query_tsdb_groups_chunked(
+        tsdb.get_range, list(issue_projects), start, stop, rollup
+    )
+    for issue_id, issue_series in tsdb_range.items():
+        add_columns(resolved[issue_projects[issue_id]], [value for _, value in clean(issue_series)])
+
+    totals = _query_tsdb_chunked(
+        tsdb.get_range, tsdb.models.project, list(resolved), start, stop, rollup
+    )
+
+    return {
+        project_id: [
+            (timestamp, (resolved_count, total - resolved_count))  # unresolved
+            for timestamp, resolved_count, (_, total) in zip(
+                timestamps, resolved_counts, clean(totals[project_id])
+            )
+        ]
+        for project_id, resolved_counts in resolved.items()
+    }
+
+
+def prepare_organization_aggregates(ignore__stop, projects):
+    """
+    Batched version of ``prepare_project_aggregates``.
+    """
+    _, stop = ignore__stop
+    segments = 4
+    period = timedelta(days=7)
+    start = stop - (period * segments)
+    project_ids = [project.id for project in projects]
+
+    sums = [
+        _query_tsdb_chunked(
+            tsdb.get_sums,
+            tsdb.models.project,
+            project_ids,
+            start + (period * i),
+            start + (period * (i + 1) - timedelta(seconds=1)),
+            ONE_DAY,
+        )
+        for i in range(segments)
+    ]
+
+    return {project_id: [segment[project_id] for segment in sums] for project_id in project_ids}
+
+
+def prepare_organization_issue_summaries(interval, projects):
+    """
+    Batched version of ``prepare_project_issue_summaries``.
+    """
+    start, stop = interval
+    project_ids = [project.id for project in projects]
+
+    queryset = Group.objects.filter(project_id__in=project_ids).exclude(status=GroupStatus.IGNORED)
+
+    new_issue_projects = dict(
+        queryset.filter(first_seen__gte=start, first_seen__lt=stop).values_list("id", "project_id")
+    )
+
+    # See ``prepare_project_issue_summaries`` regarding this query.
+    reopened_issue_projects = dict(
+        Activity.objects.filter(
+            group__in=queryset.filter(
+                last_seen__gte=start,
+                last_seen__lt=stop,
+                resolved_at__isnull=False,
+            ),
+            type__in=(Activity.SET_REGRESSION, Activity.SET_UNRESOLVED),
+            datetime__gte=start,
+            datetime__lt=stop,
+        )
+        .distinct()
+        .values_list("group_id", "project_id")
+    )
+
+    rollup = ONE_DAY
+    event_counts = _query_tsdb_groups_chunked(
+        tsdb.get_sums, set(new_issue_projects) | set(reopened_issue_projects), start, stop, rollup
+    )
+    totals = _query_tsdb_chunked(
+        tsdb.get_sums, tsdb.models.project, project_ids, start, stop, rollup
+    )
+
+    new_issue_counts = dict.fromkeys(project_ids, 0)
+    for issue_id, project_id in new_issue_projects.items():
+        new_issue_counts[project_id] += event_counts[issue_id]
+
+    reopened_issue_counts = dict.fromkeys(project_ids, 0)
+    for issue_id, project_id in reopened_issue_projects.items():
+        reopened_issue_counts[project_id] += event_counts[issue_id]
+
+    return {
+        project_id: [
+            new_issue_counts[project_id],
+            reopened_issue_counts[project_id],
+            max(
+                totals[project_id]
+                - new_issue_counts[project_id]
+                - reopened_issue_counts[project_id],
+                0,
+            ),
+        ]
+        for project_id in project_ids
+    }
+
+
+def prepare_organization_usage_outcomes(start__stop, projects):
+    """
+    Batched version of ``prepare_project_usage_outcomes``, issuing a single
+    Snuba query for all projects.
+    """
+    start, stop = start__stop
+    project_ids = [project.id for project in projects]
+    if not project_ids:
+        return {}
+
+    # See ``prepare_project_usage_outcomes`` regarding the end of the range.
+    end = stop + timedelta(days=1)
+
+    query = Query(
+        dataset=Dataset.Outcomes.value,
+        match=Entity("outcomes"),
+        select=[
+            Column("project_id"),
+            Column("outcome"),
+            Column("category"),
+            Function("sum", [Column("quantity")], "total"),
+        ],
+        where=[
+            Condition(Column("timestamp"), Op.GTE, start),
+            Condition(Column("timestamp"), Op.LT, end),
+            Condition(Column("project_id"), Op.IN, project_ids),
+            Condition(Column("org_id"), Op.EQ, projects[0].organization_id),
+            Condition(
+                Column("outcome"), Op.IN, [Outcome.ACCEPTED, Outcome.FILTERED, Outcome.RATE_LIMITED]
+            ),
+            Condition(
+                Column("category"),
+                Op.IN,
+                [*DataCategory.error_categories(), DataCategory.TRANSACTION],
+            ),
+        ],
+        groupby=[Column("project_id"), Column("outcome"), Column("category")],
+        granularity=Granularity(ONE_DAY),
+    )
+    data = raw_snql_query(query, referrer="reports.outcomes")["data"]
+
+    error_categories = DataCategory.error_categories()
+    # accepted errors, dropped errors, accepted transactions, dropped transactions
+    results = {project_id: [0, 0, 0, 0] for project_id in project_ids}
+    for row in data:
+        if row["category"] in error_categories:
+            offset = 0
+        elif row["category"] == DataCategory.TRANSACTION:
+            offset = 2
+        else:
+            continue
+
+        if row["outcome"] == Outcome.ACCEPTED:
+            results[row["project_id"]][offset] += row["total"]
+        elif row["outcome"] == Outcome.RATE_LIMITED:
+            results[row["project_id"]][offset + 1] += row["total"]
+
+    return {project_id: tuple(values) for project_id, values in results.items()}
+
+
+def prepare_organization_calendar_series(interval, projects):
+    """
+    Batched version of ``prepare_project_calendar_series``.
+    """
+    start, stop = get_calendar_query_range(interval, 3)
+
+    rollup = ONE_DAY
+    series = _query_tsdb_chunked(
+        tsdb.get_range,
+        tsdb.models.project,
+        [project.id for project in projects],
+        start,
+        stop,
+        rollup,
+    )
+
+    return {
+        project.id: clean_calendar_data(project, series[project.id], start, stop, rollup)
+        for project in projects
+    }
+
+
 def build_report(name, fields):
     names, prepare_fields, merge_fields = zip(*fields)
 
@@ -474,10 +708,38 @@ Report, prepare_project_report, merge_reports = build_report(
 )
 
 
+def prepare_organization_reports(interval, projects):
+    """
+    Builds the reports of many projects of an organization at once. This is
+    equivalent to calling ``prepare_project_report`` for every project, but
+    issues a constant number of (chunked) TSDB and Snuba queries per batch
+    of projects rather than a handful per project.
+
+    Returns a mapping of project ID to ``Report``.
+    """
+    reports = {}
+
+    for batch in chunked(projects, PROJECT_BATCH_SIZE):
+        fields = [
+            prepare_organization_series(interval, batch),
+            prepare_organization_aggregates(interval, batch),
+            prepare_organization_issue_summaries(interval, batch),
+            prepare_organization_usage_outcomes(interval, batch),
+            prepare_organization_calendar_series(interval, batch),
+        ]
+        for project in batch:
+            reports[project.id] = Report(*[field[project.id] for field in fields])
+
+    return reports
+
+
 class ReportBackend:
     def build(self, timestamp, duration, project):
         return prepare_project_report(_to_interval(timestamp, duration), project)
 
+    def build_many(self, timestamp, duration, projects):
+        return prepare_organization_reports(_to_interval(timestamp, duration), projects)
+
     def prepare(self, timestamp, duration, organization):
         """
         Build and store reports for all projects in the organization.
@@ -524,9 +786,12 @@ class RedisReportBackend(ReportBackend):
         return Report(*json.loads(zlib.decompress(value)))
 
     def prepare(self, timestamp, duration, organization):
-        reports = {}
-        for project in organization.project_set.all():
-            reports[project.id] = self.__encode(self.build(timestamp, duration, project))
+        reports = {
+            project_id: self.__encode(report)
+            for project_id, report in self.build_many(
+                timestamp, duration, list(organization.project_set.all())
+            ).items()
+        }
 
         if not reports:
             # XXX: HMSET requires at least one key/value pair, so we need to
@@ -1,10 +1,11 @@
 import logging
+import time
 from collections import OrderedDict, defaultdict
 from functools import reduce
 
 from django.db import transaction
 
-from sentry import eventstore, eventstream, similarity
+from sentry import eventstore, eventstream, grouphash_cache, options, similarity
 from sentry.app import tsdb
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.event_manager import generate_culprit
@@ -22,6 +23,8 @@ from sentry.models import (
     UserReport,
 )
 from sentry.tasks.base import instrumented_task
+from sentry.utils import metrics
+from sentry.utils.dates import to_datetime
 from sentry.utils.query import celery_run_batch_query
 
 logger = logging.getLogger(__name__)
@@ -189,6 +192,7 @@ def migrate_events(
         GroupHash.objects.filter(project_id=project.id, hash__in=fingerprints).update(
             group=destination_id
         )
+        grouphash_cache.invalidate([project.id])
 
         # Create activity records for the source and destination group.
         Activity.objects.create(
@@ -418,6 +422,160 @@ def repair_denormalizations(caches, project, events):
         similarity.record(project, [event])
 
 
+class UnmergeDeltas:
+    """
+    Accumulates the denormalizations of many batches of events, so that they
+    can be written at once instead of once per batch.
+
+    This computes the same data as ``repair_denormalizations``, except that
+    timestamps are truncated to the smallest TSDB rollup. Events that fall
+    into the same bucket are then collapsed into a single counter instead of
+    one per distinct event timestamp.
+    """
+
+    def __init__(self, caches, project):
+        self.caches = caches
+        self.project = project
+        self.rollup = min(tsdb.get_rollups())
+        self.reset()
+
+    def reset(self):
+        # (group_id, environment name) -> release of the oldest event
+        self.group_environments = OrderedDict()
+        # (group_id, environment name, release_id) -> (first_seen, last_seen)
+        self.releases = OrderedDict()
+        # (environment_id, timestamp, group_id) -> count
+        self.counters = defaultdict(int)
+        # (environment_id, timestamp, group_id) -> user tag values
+        self.users = defaultdict(set)
+        # (timestamp, group_id, environment_id) -> count
+        self.environment_frequencies = defaultdict(int)
+        # (timestamp, group_id, environment name, release_id) -> count
+        self.release_frequencies = defaultdict(int)
+        self.num_events = 0
+
+    def __len__(self):
+        return self.num_events
+
+    def add(self, events):
+        """
+        Adds a batch of events. Events need to be sorted by date, descending,
+        across all batches.
+        """
+        caches, organization_id = self.caches, self.project.organization_id
+
+        for event in events:
+            environment_name = get_environment_name(event)
+            environment_id = caches["Environment"](organization_id, environment_name).id
+            timestamp = tsdb.normalize_to_epoch(event.datetime, self.rollup)
+            release = event.get_tag("sentry:release")
+
+            self.group_environments[(event.group_id, environment_name)] = release
+
+            self.counters[(environment_id, timestamp, event.group_id)] += 1
+
+            user = event.data.get("user")
+            if user:
+                self.users[(environment_id, timestamp, event.group_id)].add(
+                    get_event_user_from_interface(user).tag_value
+                )
+
+            self.environment_frequencies[(timestamp, event.group_id, environment_id)] += 1
+
+            if release:
+                release_id = caches["Release"](organization_id, release).id
+                key = (event.group_id, environment_name, release_id)
+                if key in self.releases:
+                    self.releases[key] = (event.datetime, self.releases[key][1])
+                else:
+                    self.releases[key] = (event.datetime, event.datetime)
+
+                self.release_frequencies[(timestamp,) + key] += 1
+
+        self.num_events += len(events)
+
+    def flush(self):
+        """
+        Writes all accumulated denormalizations and resets the accumulator.
+        """
+        if not self.num_events:
+            return
+
+        with metrics.timer("unmerge.deltas.flush"):
+            self._flush()
+        metrics.timing("unmerge.deltas.events", self.num_events)
+        self.reset()
+
+    def _flush(self):
+        caches, project = self.caches, self.project
+
+        for (group_id, environment_name), first_release in self.group_environments.items():
+            fields = {}
+            if first_release:
+                fields["first_release"] = caches["Release"](project.organization_id, first_release)
+
+            GroupEnvironment.objects.create_or_update(
+                environment_id=caches["Environment"](project.organization_id, environment_name).id,
+                group_id=group_id,
+                defaults=fields,
+                values=fields,
+            )
+
+        grouprelease_ids = {}
+        for (group_id, environment, release_id), (first_seen, last_seen) in self.releases.items():
+            instance, created = GroupRelease.objects.get_or_create(
+                project_id=project.id,
+                group_id=group_id,
+                environment=environment,
+                release_id=release_id,
+                defaults={"first_seen": first_seen, "last_seen": last_seen},
+            )
+
+            if not created:
+                instance.update(first_seen=first_seen)
+
+            grouprelease_ids[(group_id, environment, release_id)] = instance.id
+
+        # All counters of an environment go out in a single pipeline.
+        counters = defaultdict(list)
+        for (environment_id, timestamp, group_id), count in self.counters.items():
+            counters[environment_id].append(
+                (tsdb.models.group, group_id, {"timestamp": to_datetime(timestamp), "count": count})
+            )
+
+        for environment_id, items in counters.items():
+            tsdb.incr_multi(items, environment_id=environment_id)
+
+        users = defaultdict(list)
+        for (environment_id, timestamp, group_id), values in self.users.items():
+            users[(environment_id, timestamp)].append(
+                (tsdb.models.users_affected_by_group, group_id, values)
+            )
+
+        for (environment_id, timestamp), items in users.items():
+            tsdb.record_multi(items, to_datetime(timestamp), environment_id=environment_id)
+
+        frequencies = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+        for (timestamp, group_id, environment_id), count in self.environment_frequencies.items():
+            frequencies[timestamp][tsdb.models.frequent_environments_by_group][group_id][
+                environment_id
+            ] = count
+
+        for (
+            timestamp,
+            group_id,
+            environment,
+            release_id,
+        ), count in self.release_frequencies.items():
+            grouprelease_id = grouprelease_ids[(group_id, environment, release_id)]
+            frequencies[timestamp][tsdb.models.frequent_releases_by_group][group_id][
+                grouprelease_id
+            ] = count
+
+        for timestamp, data in frequencies.items():
+            tsdb.record_frequency_multi(data.items(), to_datetime(timestamp))
+
+
 def lock_hashes(project_id, source_id, fingerprints):
     with transaction.atomic():
         eligible_hashes = list(
@@ -431,6 +589,7 @@ def lock_hashes(project_id, source_id, fingerprints):
         GroupHash.objects.filter(id__in=[h.id for h in eligible_hashes]).update(
             state=GroupHash.State.LOCKED_IN_MIGRATION
         )
+        grouphash_cache.invalidate([project_id])
 
     return [h.hash for h in eligible_hashes]
 
@@ -439,6 +598,7 @@ def unlock_hashes(project_id, fingerprints):
     GroupHash.objects.filter(
         project_id=project_id, hash__in=fingerprints, state=GroupHash.State.LOCKED_IN_MIGRATION
     ).update(state=GroupHash.State.UNLOCKED)
+    grouphash_cache.invalidate([project_id])
 
 
 @instrumented_task(name="sentry.tasks.unmerge", queue="unmerge")
@@ -452,7 +612,18 @@ def unmerge(
     batch_size=500,
     source_fields_reset=False,
     eventstream_state=None,
+    high_throughput=False,
+    events_processed=0,
 ):
+    """
+    Moves the events of ``fingerprints`` from the group ``source_id`` into
+    a new group (or ``destination_id``), one batch of events per task.
+
+    In ``high_throughput`` mode a task instead keeps fetching batches until
+    ``unmerge.high-throughput.task-duration`` seconds have passed. The
+    denormalizations of all of its batches are accumulated in
+    ``UnmergeDeltas`` and written at the end of the task.
+    """
     source = Group.objects.get(project_id=project_id, id=source_id)
 
     caches = get_caches()
@@ -466,50 +637,86 @@ def unmerge(
         fingerprints = lock_hashes(project_id, source_id, fingerprints)
         truncate_denormalizations(project, source)
 
-    last_event, events = celery_run_batch_query(
-        filter=eventstore.Filter(project_ids=[project_id], group_ids=[source.id]),
-        batch_size=batch_size,
-        state=last_event,
-        referrer="unmerge",
-    )
+    if high_throughput:
+        deltas = UnmergeDeltas(caches, project)
+        deadline = time.time() + options.get("unmerge.high-throughput.task-duration")
+    else:
+        deltas = None
+
+    while True:
+        last_event, events = celery_run_batch_query(
+            filter=eventstore.Filter(project_ids=[project_id], group_ids=[source.id]),
+            batch_size=batch_size,
+            state=last_event,
+            referrer="unmerge",
+        )
 
-    # If there are no more events to process, we're done with the migration.
-    if not events:
-        unlock_hashes(project_id, fingerprints)
-        logger.warning("Unmerge complete (eventstream state: %s)", eventstream_state)
-        if eventstream_state:
-            eventstream.end_unmerge(eventstream_state)
+        # If there are no more events to process, we're done with the migration.
+        if not events:
+            if deltas is not None:
+                deltas.flush()
 
-        return destination_id
+            unlock_hashes(project_id, fingerprints)
+            logger.warning("Unmerge complete (eventstream state: %s)", eventstream_state)
+            if eventstream_state:
+                eventstream.end_unmerge(eventstream_state)
 
-    source_events = []
-    destination_events = []
+            return destination_id
 
-    for event in events:
-        (destination_events if get_fingerprint(event) in fingerprints else source_events).append(
-            event
+        source_events = []
+        destination_events = []
+
+        for event in events:
+            (
+                destination_events if get_fingerprint(event) in fingerprints else source_events
+            ).append(event)
+
+        if source_events:
+            if not source_fields_reset:
+                source.update(**get_group_creation_attributes(caches, source_events))
+                source_fields_reset = True
+            else:
+                source.update(**get_group_backfill_attributes(caches, source, source_events))
+
+        (destination_id, eventstream_state) = migrate_events(
+            caches,
+            project,
+            source_id,
+            destination_id,
+            fingerprints,
+            destination_events,
+            actor_id,
+            eventstream_state,
         )
 
-    if source_events:
-        if not source_fields_reset:
-            source.update(**get_group_creation_attributes(caches, source_events))
-            source_fields_reset = True
-        else:
-            source.update(**get_group_backfill_attributes(caches, source, source_events))
+        events_processed += len(events)
+        metrics.incr(
+            "unmerge.events", amount=len(events), tags={"high_throughput": high_throughput}
+        )
 
-    (destination_id, eventstream_state) = migrate_events(
-        caches,
-        project,
-        source_id,
-        destination_id,
-        fingerprints,
-        destination_events,
-        actor_id,
-        eventstream_state,
+        if deltas is None:
+            repair_denormalizations(caches, project, events)
+            break
+
+        deltas.add(events)
+        for event in events:
+            similarity.record(project, [event])
+
+        if time.time() >= deadline:
+            deltas.flush()
+            break
+
+    logger.info(
+        "unmerge.progress",
+        extra={
+            "project_id": project_id,
+            "source_id": source_id,
+            "destination_id": destination_id,
+            "events_processed": events_processed,
+            "last_event": last_event,
+        },
     )
 
-    repair_denormalizations(caches, project, events)
-
     unmerge.delay(
         project_id,
         source_id,
@@ -520,4 +727,6 @@ def unmerge(
         batch_size=batch_size,
         source_fields_reset=source_fields_reset,
         eventstream_state=eventstream_state,
+        high_throughput=high_throughput,
+        events_processed=events_processed,
     )
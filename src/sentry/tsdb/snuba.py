@@ -1,13 +1,24 @@
 import collections
 import itertools
+import time
 from copy import deepcopy
 
+from sentry import options
 from sentry.constants import DataCategory
 from sentry.ingest.inbound_filters import FILTER_STAT_KEYS_TO_VALUES
 from sentry.tsdb.base import BaseTSDB, TSDBModel
 from sentry.utils import outcomes, snuba
+from sentry.utils.cache import cache
 from sentry.utils.compat import map, zip
 from sentry.utils.dates import to_datetime
+from sentry.utils.hashlib import md5_text
+
+# Buckets are cached once they ended at least this many seconds ago. Events
+# may still arrive for a bucket shortly after it ended.
+BUCKET_CACHE_SETTLE_TIME = 5 * 60
+BUCKET_CACHE_TTL = 60 * 60
+# The maximum number of buckets cached per key, the oldest are dropped first.
+BUCKET_CACHE_MAX_BUCKETS = 1000
 
 SnubaModelQuerySettings = collections.namedtuple(
     # `dataset` - the dataset in Snuba that we want to query
@@ -295,6 +306,28 @@ class SnubaTSDB(BaseTSDB):
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
         start = to_datetime(series[0])
         end = to_datetime(series[-1] + rollup)
+
+        # Plain series of one key each can be served from the bucket cache,
+        # then snuba is only queried from the first bucket that is missing
+        # (or still open) onwards.
+        cached = None
+        if (
+            keys
+            and groupby == [model_group, "time"]
+            and not conditions
+            and not isinstance(keys, collections.Mapping)
+            and options.get("tsdb.snuba.bucket-cache-enabled")
+        ):
+            cache_keys = {
+                key: self._get_bucket_cache_key(model, key, environment_ids, rollup, aggregation)
+                for key in keys
+            }
+            closed_series = self._get_closed_series(series, rollup)
+            cached = self._get_cached_buckets(cache_keys)
+            query_start = self._get_query_start(series, closed_series, cached)
+            if query_start is not None:
+                start = to_datetime(query_start)
+
         limit = min(10000, int(len(keys) * ((end - start).total_seconds() / rollup)))
 
         conditions = conditions if conditions is not None else []
@@ -309,7 +342,7 @@ class SnubaTSDB(BaseTSDB):
         if group_on_model and model_group is not None:
             orderby.append(model_group)
 
-        if keys:
+        if keys and (cached is None or query_start is not None):
             result = snuba.query(
                 dataset=model_query_settings.dataset,
                 start=start,
@@ -328,14 +361,91 @@ class SnubaTSDB(BaseTSDB):
         else:
             result = {}
 
+        if cached is not None:
+            for key, buckets in cached.items():
+                key_result = result.setdefault(key, {})
+                for bucket in series:
+                    if bucket == query_start:
+                        break
+                    key_result[bucket] = buckets[bucket][0]
+
         if group_on_time:
             keys_map["time"] = series
 
         self.zerofill(result, groupby, keys_map)
         self.trim(result, groupby, keys)
 
+        if cached is not None and query_start is not None:
+            self._set_cached_buckets(
+                cache_keys,
+                cached,
+                result,
+                [bucket for bucket in closed_series if bucket >= query_start],
+            )
+
         return result
 
+    def _get_bucket_cache_key(self, model, key, environment_ids, rollup, aggregation):
+        environment_ids = sorted(environment_ids) if environment_ids is not None else None
+        return "tsdb:snuba:buckets:v2:{}:{}".format(
+            model.value, md5_text(repr((key, environment_ids, rollup, aggregation))).hexdigest()
+        )
+
+    def _get_closed_series(self, series, rollup):
+        """
+        Returns the buckets of `series` that will not change anymore.
+        """
+        closed_until = time.time() - BUCKET_CACHE_SETTLE_TIME
+        return [bucket for bucket in series if bucket + rollup <= closed_until]
+
+    def _get_cached_buckets(self, cache_keys):
+        """
+        Returns the cached buckets of every key as
+        `{key: {bucket: (value, written_at)}}`.
+
+        Buckets that were written more than `BUCKET_CACHE_TTL` ago are
+        dropped. Past buckets change when groups are merged, unmerged,
+        reprocessed or deleted, and series that are viewed regularly would
+        otherwise never be queried again.
+        """
+        values = cache.get_many(list(cache_keys.values()))
+        expired = time.time() - BUCKET_CACHE_TTL
+        return {
+            key: {
+                bucket: entry
+                for bucket, entry in (values.get(cache_key) or {}).items()
+                if entry[1] > expired
+            }
+            for key, cache_key in cache_keys.items()
+        }
+
+    def _get_query_start(self, series, closed_series, cached):
+        """
+        Returns the first bucket that has to be queried from snuba, or `None`
+        if every bucket is cached.
+        """
+        for bucket in closed_series:
+            if any(bucket not in buckets for buckets in cached.values()):
+                return bucket
+        if len(closed_series) < len(series):
+            return series[len(closed_series)]
+        return None
+
+    def _set_cached_buckets(self, cache_keys, cached, result, buckets):
+        if not buckets:
+            return
+
+        now = time.time()
+        values = {}
+        for key, cache_key in cache_keys.items():
+            # Buckets that are carried over keep the time they were written.
+            value = dict(cached[key])
+            value.update((bucket, (result[key][bucket], now)) for bucket in buckets)
+            if len(value) > BUCKET_CACHE_MAX_BUCKETS:
+                value = dict(sorted(value.items())[-BUCKET_CACHE_MAX_BUCKETS:])
+            values[cache_key] = value
+        cache.set_many(values, BUCKET_CACHE_TTL)
+
     def zerofill(self, result, groups, flat_keys):
         """
         Fills in missing keys in the nested result with zeroes.
@@ -48,7 +48,7 @@ def get_legacy_name(key):
 class CanonicalKeyView(collections.Mapping):
     def __init__(self, data):
         self.data = data
-        self._len = len({get_canonical_name(key) for key in self.data})
+        self._len = None
 
     def copy(self):
         return self
@@ -56,6 +56,8 @@ class CanonicalKeyView(collections.Mapping):
     __copy__ = copy
 
     def __len__(self):
+        if self._len is None:
+            self._len = len({get_canonical_name(key) for key in self.data})
         return self._len
 
     def __iter__(self):
@@ -0,0 +1,94 @@
+"""
+Coalescing of concurrent operations through redis.
+
+When many processes are about to perform the same expensive operation at
+the same time (creating the group of a new issue, for instance), only one
+of them -- the leader -- should actually do it. All other processes become
+followers: they block on a redis list until the leader is done and then
+read the result of the operation from wherever the leader stored it.
+
+Coalescing is purely an optimization. Followers give up waiting after a
+timeout and callers are expected to fall back to performing the operation
+themselves (under whatever synchronization they would use otherwise) if
+waiting fails for any reason.
+"""
+
+import logging
+
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescedOperation:
+    """
+    A single operation identified by ``key``, coordinated through the redis
+    ``client``. The leadership expires after ``ttl`` seconds in case the
+    leader dies without calling ``release``.
+    """
+
+    def __init__(self, client, key, ttl=10):
+        self.client = client
+        # Both keys share a hash tag so that they end up on the same node of
+        # a redis cluster.
+        self.leader_key = f"coalesce:{{{key}}}:leader"
+        self.done_key = f"coalesce:{{{key}}}:done"
+        self.ttl = ttl
+
+    def __repr__(self):
+        return f"<CoalescedOperation: {self.leader_key!r}>"
+
+    def try_lead(self):
+        """
+        Attempts to become the leader of the operation. Returns ``True`` if
+        this process has to perform the operation and call ``release`` once
+        it is done, ``False`` if another process is already performing it,
+        and ``None`` if redis is unavailable.
+        """
+        try:
+            if not self.client.set(self.leader_key, 1, ex=self.ttl, nx=True):
+                return False
+            # Drop the notification of a previous leader, followers of this
+            # leader must not wake up before it is done.
+            self.client.delete(self.done_key)
+        except Exception:
+            logger.warning("coalesce.lead-failed", exc_info=True)
+            return None
+        return True
+
+    def wait(self, timeout):
+        """
+        Blocks until the leader has released the operation, for at most
+        ``timeout`` seconds. Returns ``True`` if the leader completed within
+        the timeout.
+        """
+        try:
+            with metrics.timer("coalesce.wait") as metric_tags:
+                result = self.client.blpop([self.done_key], timeout=timeout)
+                metric_tags["result"] = "done" if result is not None else "timeout"
+                if result is None:
+                    return False
+                # Pass the notification on to the next waiting follower. The
+                # pop deleted the list if it was empty, so the expiry has to
+                # be set again.
+                with self.client.pipeline(transaction=False) as pipe:
+                    pipe.rpush(self.done_key, 1)
+                    pipe.expire(self.done_key, self.ttl)
+                    pipe.execute()
+                return True
+        except Exception:
+            logger.warning("coalesce.wait-failed", exc_info=True)
+            return False
+
+    def release(self):
+        """
+        Ends the leadership of this process and wakes up all followers.
+        """
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                pipe.delete(self.leader_key)
+                pipe.rpush(self.done_key, 1)
+                pipe.expire(self.done_key, self.ttl)
+                pipe.execute()
+        except Exception:
+            logger.warning("coalesce.release-failed", exc_info=True)
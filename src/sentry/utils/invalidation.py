@@ -0,0 +1,140 @@
+"""
+Broadcasts invalidations of process-local caches.
+
+Process-local caches (such as the process cache of `BaseManager`) cannot be
+purged through the shared cache backend. Instead, writers publish the keys
+they invalidated on a redis channel, and every process that holds a local
+cache runs a background thread that subscribes to the channel and passes the
+keys on to the handler registered for their topic.
+
+Delivery is best effort. Messages are dropped if redis is unavailable, which
+is why local caches must still expire their entries on their own. Whenever
+the subscription has to be re-established all handlers are asked to clear
+their caches entirely, since invalidations might have been missed.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from sentry.utils import json, metrics
+from sentry.utils.pubsub import QueuedPublisherService
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sentry:cache-invalidation"
+RECONNECT_DELAY = 5
+
+_handlers = {}
+_subscriber_pid = None
+_connected_pid = None
+_subscriber_lock = threading.Lock()
+
+
+def _get_client():
+    from sentry.utils.redis import redis_clusters
+
+    return redis_clusters.get(settings.SENTRY_CACHE_INVALIDATION_REDIS_CLUSTER)
+
+
+def is_enabled():
+    return settings.SENTRY_CACHE_INVALIDATION_REDIS_CLUSTER is not None
+
+
+def is_connected():
+    """
+    Returns ``True`` while the subscriber thread of this process holds a live
+    subscription, i.e. while invalidations published by other processes are
+    guaranteed to be seen (modulo messages dropped by the publisher).
+    """
+    return _connected_pid == os.getpid()
+
+
+class RedisClusterPublisher:
+    def publish(self, channel, value, key=None):
+        _get_client().publish(channel, value)
+
+
+_publisher = QueuedPublisherService(RedisClusterPublisher())
+
+
+def register(topic, handler):
+    """
+    Registers ``handler`` for invalidations of ``topic``. The handler is
+    called with a list of invalidated keys, or with ``None`` if the entire
+    cache should be cleared.
+    """
+    _handlers[topic] = handler
+
+
+def publish(topic, keys):
+    """
+    Tells all other processes to drop ``keys`` from their local caches for
+    ``topic``. Does not block.
+    """
+    if not is_enabled() or not keys:
+        return
+    _publisher.publish(CHANNEL, json.dumps({"topic": topic, "keys": list(keys)}))
+
+
+def ensure_subscribed():
+    """
+    Starts the subscriber thread of this process unless it is already
+    running. Needs to be called by local caches before they store anything,
+    since threads do not survive forking.
+    """
+    global _subscriber_pid
+
+    pid = os.getpid()
+    if _subscriber_pid == pid or not is_enabled():
+        return
+
+    with _subscriber_lock:
+        if _subscriber_pid == pid:
+            return
+        thread = threading.Thread(target=_subscribe, name="cache-invalidation")
+        thread.daemon = True
+        thread.start()
+        _subscriber_pid = pid
+
+
+def dispatch(message):
+    try:
+        payload = json.loads(message)
+        handler = _handlers.get(payload["topic"])
+        if handler is not None:
+            handler(payload["keys"])
+    except Exception:
+        logger.exception("cache-invalidation.dispatch-failed")
+
+
+def _clear_all():
+    for handler in _handlers.values():
+        handler(None)
+
+
+def _subscribe():
+    global _connected_pid
+
+    while True:
+        try:
+            pubsub = _get_client().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            # We might have missed invalidations while (re)connecting.
+            _clear_all()
+            _connected_pid = os.getpid()
+            for message in pubsub.listen():
+                if message["type"] == "message":
+                    dispatch(message["data"])
+        except Exception:
+            logger.warning("cache-invalidation.subscribe-failed", exc_info=True)
+            metrics.incr("cache-invalidation.subscribe-failed")
+
+        # Mark the subscription as down before clearing, so that caches
+        # fall back to their regular expiry for anything stored from now on.
+        _connected_pid = None
+        _clear_all()
+        time.sleep(RECONNECT_DELAY)
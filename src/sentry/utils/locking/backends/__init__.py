@@ -24,6 +24,40 @@ class LockBackend:
         """
         raise NotImplementedError
 
+    def acquire_many(self, keys, duration, routing_key=None):
+        """
+        Acquire the locks of all given keys, or none of them. Like
+        ``acquire``, this attempts to acquire the locks once and raises an
+        exception if any of them cannot be acquired.
+
+        This implementation acquires the locks one by one (in a consistent
+        order) and releases them again on failure. Backends should override
+        it if they can do better.
+        """
+        acquired = []
+        try:
+            for key in sorted(set(keys)):
+                self.acquire(key, duration, routing_key)
+                acquired.append(key)
+        except Exception:
+            self.release_many(acquired, routing_key)
+            raise
+
+    def release_many(self, keys, routing_key=None):
+        """
+        Release the locks of all given keys. The return value is not used. If
+        any lock cannot be released, the others are still released before
+        the exception is raised.
+        """
+        error = None
+        for key in sorted(set(keys)):
+            try:
+                self.release(key, routing_key)
+            except Exception as e:
+                error = e
+        if error is not None:
+            raise error
+
     def locked(self, key, routing_key=None):
         """
         Check if a lock has been taken.
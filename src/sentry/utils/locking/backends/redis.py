@@ -1,9 +1,12 @@
+from collections import defaultdict
 from uuid import uuid4
 
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.locking.backends import LockBackend
 
 delete_lock = redis.load_script("utils/locking/delete_lock.lua")
+acquire_locks = redis.load_script("utils/locking/acquire_locks.lua")
+delete_locks = redis.load_script("utils/locking/delete_locks.lua")
 
 
 class RedisLockBackend(LockBackend):
@@ -16,6 +19,9 @@ class RedisLockBackend(LockBackend):
         self.uuid = uuid
 
     def get_client(self, key, routing_key=None):
+        return self.cluster.get_local_client(self.get_host(key, routing_key))
+
+    def get_host(self, key, routing_key=None):
         # This is a bit of an abstraction leak, but if an integer is provided
         # we use that value to determine placement rather than the cluster
         # router. This leaking allows us us to have more fine-grained control
@@ -27,19 +33,25 @@ class RedisLockBackend(LockBackend):
         # different keys that would otherwise be placed on different
         # partitions.)
         if isinstance(routing_key, int):
-            index = routing_key % len(self.cluster.hosts)
-            return self.cluster.get_local_client(index)
+            return routing_key % len(self.cluster.hosts)
 
         if routing_key is not None:
             key = routing_key
         else:
             key = self.prefix_key(key)
 
-        return self.cluster.get_local_client_for_key(key)
+        return self.cluster.get_router().get_host_for_key(key)
 
     def prefix_key(self, key):
         return f"{self.prefix}{key}"
 
+    def _get_keys_by_host(self, keys, routing_key):
+        keys_by_host = defaultdict(list)
+        for key in sorted(set(keys)):
+            keys_by_host[self.get_host(key, routing_key)].append(self.prefix_key(key))
+        # Hosts are always locked in the same order, like the keys.
+        return sorted(keys_by_host.items())
+
     def acquire(self, key, duration, routing_key=None):
         client = self.get_client(key, routing_key)
         full_key = self.prefix_key(key)
@@ -53,3 +65,31 @@ class RedisLockBackend(LockBackend):
     def locked(self, key, routing_key=None):
         client = self.get_client(key, routing_key)
         return client.get(self.prefix_key(key)) is not None
+
+    def acquire_many(self, keys, duration, routing_key=None):
+        # The locks of every host are acquired atomically by a script. If the
+        # locks of a host cannot be acquired, the ones already acquired on the
+        # other hosts are released again.
+        acquired = []
+        try:
+            for host, host_keys in self._get_keys_by_host(keys, routing_key):
+                client = self.cluster.get_local_client(host)
+                conflicts = acquire_locks(client, host_keys, (self.uuid, duration))
+                if conflicts:
+                    metrics.incr("locks.acquire_many.conflicts", amount=len(conflicts))
+                    raise Exception(
+                        f"Could not set {len(conflicts)} of {len(host_keys)} keys: {conflicts[0]!r}"
+                    )
+                acquired.append((client, host_keys))
+        except Exception:
+            for client, host_keys in acquired:
+                delete_locks(client, host_keys, (self.uuid,))
+            raise
+
+    def release_many(self, keys, routing_key=None):
+        missing = []
+        for host, host_keys in self._get_keys_by_host(keys, routing_key):
+            client = self.cluster.get_local_client(host)
+            missing.extend(delete_locks(client, host_keys, (self.uuid,)))
+        if missing:
+            raise Exception(f"Could not delete {len(missing)} keys: {missing[0]!r}")
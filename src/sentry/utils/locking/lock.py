@@ -1,6 +1,8 @@
 import logging
+import time
 from contextlib import contextmanager
 
+from sentry.utils import metrics
 from sentry.utils.locking import UnableToAcquireLock
 
 logger = logging.getLogger(__name__)
@@ -58,3 +60,73 @@ class Lock:
         See if the lock has been taken somewhere else.
         """
         return self.backend.locked(self.key, self.routing_key)
+
+
+class MultiLock:
+    """
+    The locks of many keys, which are acquired and released together.
+    """
+
+    def __init__(self, backend, keys, duration, routing_key=None):
+        self.backend = backend
+        self.keys = sorted(set(keys))
+        self.duration = duration
+        self.routing_key = routing_key
+        self._first_attempt = None
+        self._attempts = 0
+
+    def __repr__(self):
+        return f"<MultiLock: {len(self.keys)} keys, {self.keys[:3]!r}>"
+
+    def acquire(self):
+        """
+        Attempt to acquire all locks at once.
+
+        If the locks are successfully acquired, this method returns a context
+        manager that will automatically release them when exited. If any lock
+        cannot be acquired, none are and an ``UnableToAcquireLock`` error will
+        be raised.
+        """
+        # Retry policies call this repeatedly. The number of attempts and the
+        # time they took until the locks were acquired show how fairly the
+        # locks are handed out under contention.
+        now = time.time()
+        if self._first_attempt is None:
+            self._first_attempt = now
+        self._attempts += 1
+
+        try:
+            self.backend.acquire_many(self.keys, self.duration, self.routing_key)
+        except Exception as error:
+            metrics.incr("locks.acquire_many", tags={"result": "failed"})
+            raise UnableToAcquireLock(
+                f"Unable to acquire {self!r} due to error: {error}"
+            ) from error
+
+        metrics.incr("locks.acquire_many", tags={"result": "acquired"})
+        metrics.timing("locks.acquire_many.keys", len(self.keys))
+        metrics.timing("locks.acquire_many.attempts", self._attempts)
+        metrics.timing("locks.acquire_many.wait", now - self._first_attempt)
+        self._first_attempt = None
+        self._attempts = 0
+
+        @contextmanager
+        def releaser():
+            try:
+                yield
+            finally:
+                self.release()
+
+        return releaser()
+
+    def release(self):
+        """
+        Attempt to release all locks.
+
+        Any exceptions raised when attempting to release the locks are logged
+        and suppressed.
+        """
+        try:
+            self.backend.release_many(self.keys, self.routing_key)
+        except Exception as error:
+            logger.warning("Failed to release %r due to error: %r", self, error, exc_info=True)
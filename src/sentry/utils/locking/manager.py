@@ -1,4 +1,4 @@
-from sentry.utils.locking.lock import Lock
+from sentry.utils.locking.lock import Lock, MultiLock
 
 
 class LockManager:
@@ -10,3 +10,9 @@ class LockManager:
         Retrieve a ``Lock`` instance.
         """
         return Lock(self.backend, key, duration, routing_key)
+
+    def get_many(self, keys, duration, routing_key=None):
+        """
+        Retrieve a ``MultiLock`` instance for the locks of all ``keys``.
+        """
+        return MultiLock(self.backend, keys, duration, routing_key)
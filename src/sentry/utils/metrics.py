@@ -5,7 +5,7 @@ import functools
 import logging
 import time
 from contextlib import contextmanager
-from queue import Queue
+from queue import Empty, Full, Queue
 from random import random
 from threading import Thread, local
 from typing import Mapping, Optional
@@ -77,36 +77,75 @@ def _sampled_value(value, sample_rate):
 
 
 class InternalMetrics:
+    """
+    Writes metrics to the internal TSDB model from a background thread.
+
+    The queue is bounded, metrics are dropped (and counted as
+    ``internal_metrics.dropped``) when it is full. The worker merges the
+    counts of each key per rollup window and writes a whole batch with a
+    single ``tsdb.incr_multi`` call.
+    """
+
     def __init__(self):
         self._started = False
 
     def _start(self):
-        self.q = q = Queue()
-
-        def worker():
-            from sentry import tsdb
-
-            while True:
-                key, instance, tags, amount, sample_rate = q.get()
-                amount = _sampled_value(amount, sample_rate)
-                if instance:
-                    full_key = f"{key}.{instance}"
-                else:
-                    full_key = key
-                try:
-                    tsdb.incr(tsdb.models.internal, full_key, count=amount)
-                except Exception:
-                    logger = logging.getLogger("sentry.errors")
-                    logger.exception("Unable to incr internal metric")
-                finally:
-                    q.task_done()
-
-        t = Thread(target=worker)
+        self.q = Queue(maxsize=settings.SENTRY_INTERNAL_METRICS_QUEUE_SIZE)
+
+        t = Thread(target=self._worker)
         t.setDaemon(True)
         t.start()
 
         self._started = True
 
+    def _worker(self):
+        while True:
+            batch = self._get_batch()
+            try:
+                self._flush(batch)
+            except Exception:
+                logger = logging.getLogger("sentry.errors")
+                logger.exception("Unable to incr internal metric")
+            finally:
+                for _ in batch:
+                    self.q.task_done()
+
+    def _get_batch(self):
+        # Block until there is something to write, then keep collecting for
+        # a moment so that repeated keys can be merged.
+        batch = [self.q.get()]
+        deadline = time.monotonic() + settings.SENTRY_INTERNAL_METRICS_FLUSH_INTERVAL
+        while len(batch) < settings.SENTRY_INTERNAL_METRICS_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.q.get(timeout=timeout))
+            except Empty:
+                break
+        return batch
+
+    def _flush(self, batch):
+        from sentry import tsdb
+        from sentry.utils.dates import to_datetime
+
+        rollup = min(tsdb.get_rollups())
+        counts = {}
+        for key, instance, tags, amount, sample_rate, timestamp in batch:
+            if instance:
+                full_key = f"{key}.{instance}"
+            else:
+                full_key = key
+            bucket = (full_key, int(timestamp // rollup) * rollup)
+            counts[bucket] = counts.get(bucket, 0) + _sampled_value(amount, sample_rate)
+
+        tsdb.incr_multi(
+            [
+                (tsdb.models.internal, full_key, {"timestamp": to_datetime(ts), "count": count})
+                for (full_key, ts), count in counts.items()
+            ]
+        )
+
     def incr(
         self,
         key,
@@ -117,7 +156,14 @@ class InternalMetrics:
     ):
         if not self._started:
             self._start()
-        self.q.put((key, instance, tags, amount, sample_rate))
+        try:
+            self.q.put_nowait((key, instance, tags, amount, sample_rate, time.time()))
+        except Full:
+            try:
+                backend.incr("internal_metrics.dropped", key, None, 1, 1)
+            except Exception:
+                logger = logging.getLogger("sentry.errors")
+                logger.exception("Unable to record backend metric")
 
 
 internal = InternalMetrics()
@@ -0,0 +1,186 @@
+"""
+Statistical sampling profiler.
+
+While the profiler runs, a ``SIGPROF`` timer interrupts the process after
+every ``interval`` seconds of CPU time and the stacks of all threads that
+are running Python code are recorded. Stacks are aggregated in folded form
+(``outer;inner count``), as understood by ``flamegraph.pl`` and speedscope.
+
+Python only runs signal handlers on the main thread, so the profiler has to
+be started there. Once started, it can be stopped from any thread.
+
+Processes only pay for the timer while they are profiled. At the default
+interval of 10ms a sample costs well below one percent of CPU time.
+
+Profiling is controlled through ``/api/0/internal/profiler/``, which only
+ever targets the single web process that serves the request (identified by
+its pid), or through ``sentry profile --pid`` for any process that was
+started with ``SENTRY_PROFILER_SIGNAL`` configured.
+"""
+
+__all__ = ["SamplingProfiler", "profiler", "install_signal_handler"]
+
+import logging
+import os
+import signal
+import sys
+import tempfile
+import threading
+
+logger = logging.getLogger("sentry.profiler")
+
+DEFAULT_INTERVAL = 0.01
+# Deeper stacks are truncated at the root.
+MAX_DEPTH = 128
+# Samples of any further distinct stack are counted as truncated.
+MAX_STACKS = 10000
+TRUNCATED_STACK = ("[truncated]",)
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self.interval = None
+        self.stacks = {}
+        self._labels = {}
+        self._previous_handler = None
+        # The top frame and instruction of every thread at the last sample.
+        self._positions = {}
+
+    @property
+    def running(self):
+        return self.interval is not None
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+    def start(self, interval=DEFAULT_INTERVAL):
+        """
+        Starts sampling. Signal handlers can only be set from the main
+        thread, anywhere else this raises `ValueError`.
+        """
+        if self.running:
+            return
+
+        # The handler stays installed if the profiler was stopped on another
+        # thread.
+        if signal.getsignal(signal.SIGPROF) != self._sample:
+            if threading.current_thread() is not threading.main_thread():
+                raise ValueError("The profiler can only be started from the main thread")
+            self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+
+        self.interval = interval
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+
+    def stop(self):
+        if not self.running:
+            return
+
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        self.interval = None
+        self._positions = {}
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            self._previous_handler = None
+
+    def reset(self):
+        self.stacks = {}
+        self._labels = {}
+
+    def get_folded(self):
+        """
+        Returns the collapsed stacks, most frequent first.
+        """
+        return "".join(
+            "{} {}\n".format(";".join(stack), count)
+            for stack, count in sorted(self.stacks.items(), key=lambda x: -x[1])
+        )
+
+    def _get_label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = "{} ({}:{})".format(
+                code.co_name, code.co_filename, code.co_firstlineno
+            )
+        return label
+
+    def _sample(self, signum, frame):
+        if not self.running:
+            return
+
+        main_thread_id = threading.main_thread().ident
+        positions = {}
+        for thread_id, thread_frame in sys._current_frames().items():
+            # The frame of the main thread is the one this handler interrupted.
+            if thread_id == main_thread_id:
+                thread_frame = frame
+            if thread_frame is None:
+                continue
+
+            # Threads that have not moved since the last sample are waiting
+            # (on a lock, a socket or a sleep), not using the CPU.
+            position = (id(thread_frame), thread_frame.f_lasti)
+            positions[thread_id] = position
+            if self._positions.get(thread_id) == position:
+                continue
+
+            self._record(thread_frame)
+
+        self._positions = positions
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            stack.append(self._get_label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        stack = tuple(stack)
+
+        if stack not in self.stacks and len(self.stacks) >= MAX_STACKS:
+            stack = TRUNCATED_STACK
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+
+profiler = SamplingProfiler()
+
+
+def get_output_path(pid):
+    return os.path.join(tempfile.gettempdir(), f"sentry-profile-{pid}.folded")
+
+
+def get_signal(name):
+    return getattr(signal, name) if isinstance(name, str) else name
+
+
+def _toggle(signum, frame):
+    if not profiler.running:
+        profiler.reset()
+        profiler.start()
+        return
+
+    profiler.stop()
+    pid = os.getpid()
+    # The temporary directory is shared with other users. The stacks are
+    # written to a new file that nobody else can have created or linked, which
+    # then replaces whatever is at the final path.
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=tempfile.gettempdir(), prefix=f"sentry-profile-{pid}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(profiler.get_folded())
+            os.replace(temp_path, get_output_path(pid))
+        except OSError:
+            os.remove(temp_path)
+            raise
+    except OSError:
+        logger.exception("profiler.write-failed")
+    profiler.reset()
+
+
+def install_signal_handler(signum):
+    """
+    Starts the profiler when the process receives `signum`, and stops it and
+    writes the stacks to `get_output_path` when it receives `signum` again.
+    """
+    signal.signal(get_signal(signum), _toggle)
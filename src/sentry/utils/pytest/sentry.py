@@ -118,6 +118,12 @@ def pytest_configure(config):
     settings.SENTRY_RATELIMITER = "sentry.ratelimits.redis.RedisRateLimiter"
     settings.SENTRY_RATELIMITER_OPTIONS = {}
 
+    # Process-local caches outlive the test database. Tests that exercise
+    # them enable them explicitly.
+    settings.SENTRY_MODEL_PROCESS_CACHE_SIZE = 0
+    settings.SENTRY_CACHE_INVALIDATION_REDIS_CLUSTER = None
+    settings.SENTRY_GROUPHASH_CACHE_LOCAL_SIZE = 0
+
     if os.environ.get("USE_SNUBA", False):
         settings.SENTRY_SEARCH = "sentry.search.snuba.EventsDatasetSnubaSearchBackend"
         settings.SENTRY_TSDB = "sentry.tsdb.redissnuba.RedisSnubaTSDB"
@@ -158,6 +164,11 @@ def pytest_configure(config):
             "aws-lambda.node.layer-version": "3",
             "aws-lambda.python.layer-name": "my-python-layer",
             "aws-lambda.python.layer-version": "34",
+            # Tests change GroupHash rows directly, without invalidating
+            # the cache.
+            "store.grouphash-cache-enabled": False,
+            # Tests store events into buckets they have queried before.
+            "tsdb.snuba.bucket-cache-enabled": False,
         }
     )
 
@@ -1225,10 +1225,26 @@ def aliased_query(**kwargs):
     sentry.tagstore, or sentry.snuba.discover instead when reading data.
     """
     with sentry_sdk.start_span(op="sentry.snuba.aliased_query"):
-        return _aliased_query_impl(**kwargs)
+        return raw_query(**_aliased_query_params(**kwargs))
 
 
-def _aliased_query_impl(
+def bulk_aliased_query(query_list, referrer=None, use_cache=False):
+    """
+    Runs several aliased queries at once (in parallel), see ``aliased_query``.
+    ``query_list`` contains the keyword arguments of each query, except for
+    the referrer. Returns the results in the same order.
+    """
+    with sentry_sdk.start_span(op="sentry.snuba.bulk_aliased_query"):
+        snuba_params = [SnubaQueryParams(**_aliased_query_params(**query)) for query in query_list]
+        return bulk_raw_query(
+            snuba_params,
+            referrer=referrer,
+            use_cache=use_cache,
+            snql_option=should_use_snql(referrer),
+        )
+
+
+def _aliased_query_params(
     start=None,
     end=None,
     groupby=None,
@@ -1281,7 +1297,7 @@ def _aliased_query_impl(
             updated_order.append("{}{}".format("-" if order.startswith("-") else "", order_field))
         orderby = updated_order
 
-    return raw_query(
+    return dict(
         start=start,
         end=end,
         groupby=groupby,
@@ -0,0 +1,73 @@
+import os
+
+from sentry.testutils import APITestCase
+from sentry.utils.compat import mock
+from sentry.utils.profiler import profiler
+
+
+class InternalProfilerTest(APITestCase):
+    url = "/api/0/internal/profiler/"
+
+    def setUp(self):
+        super().setUp()
+        self.login_as(self.user, superuser=True)
+
+    def tearDown(self):
+        profiler.stop()
+        profiler.reset()
+        super().tearDown()
+
+    def test_start_stop(self):
+        response = self.client.put(self.url, {"running": True, "interval": 0.001}, format="json")
+        assert response.status_code == 200
+        assert response.data["running"] is True
+        assert response.data["interval"] == 0.001
+        assert profiler.running
+
+        pid = response.data["pid"]
+        assert pid == os.getpid()
+
+        # stopping requires the pid of the process
+        response = self.client.put(self.url, {"running": False}, format="json")
+        assert response.status_code == 400
+        assert profiler.running
+
+        response = self.client.put(self.url, {"running": False, "pid": pid}, format="json")
+        assert response.status_code == 200
+        assert response.data["running"] is False
+        assert not profiler.running
+
+        response = self.client.get(self.url, {"pid": pid})
+        assert response.status_code == 200
+        assert response.data["samples"] == profiler.sample_count
+
+    def test_other_process(self):
+        response = self.client.put(
+            self.url, {"running": True, "pid": os.getpid() + 1}, format="json"
+        )
+        assert response.status_code == 409
+        assert response.data["pid"] == os.getpid()
+        assert not profiler.running
+
+        response = self.client.get(self.url, {"pid": os.getpid() + 1})
+        assert response.status_code == 409
+
+    def test_not_main_thread(self):
+        with mock.patch.object(profiler, "start", side_effect=ValueError):
+            response = self.client.put(self.url, {"running": True}, format="json")
+        assert response.status_code == 409
+        assert "main thread" in response.data["detail"]
+        assert response.data["pid"] == os.getpid()
+
+    def test_invalid(self):
+        response = self.client.put(self.url, {"running": "yes"}, format="json")
+        assert response.status_code == 400
+
+        response = self.client.put(self.url, {"running": True, "interval": 5}, format="json")
+        assert response.status_code == 400
+        assert not profiler.running
+
+    def test_requires_superuser(self):
+        self.login_as(self.create_user())
+        response = self.client.get(self.url)
+        assert response.status_code == 403
@@ -12,9 +12,11 @@ from sentry.api.event_search import (
     SearchValue,
     SearchVisitor,
     event_search_grammar,
+    parse_cache,
     parse_search_query,
 )
 from sentry.exceptions import InvalidSearchQuery
+from sentry.utils.compat import mock
 
 
 class ParseSearchQueryTest(unittest.TestCase):
@@ -1283,3 +1285,65 @@ class ParseSearchQueryTest(unittest.TestCase):
     def test_empty_string(self):
         # Empty quotations become a dropped term
         assert parse_search_query("") == []
+
+
+class ParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        parse_cache.clear()
+
+    def tearDown(self):
+        parse_cache.clear()
+
+    @mock.patch("sentry.api.event_search.event_search_grammar")
+    def test_hit(self, grammar):
+        grammar.parse.side_effect = event_search_grammar.parse
+        expected = [
+            SearchFilter(key=SearchKey(name="release"), operator="=", value=SearchValue("1.2.1"))
+        ]
+        assert parse_search_query("release:1.2.1") == expected
+        assert parse_search_query("release:1.2.1") == expected
+        assert grammar.parse.call_count == 1
+
+        # allow_boolean is part of the key
+        parse_search_query("release:1.2.1", allow_boolean=False)
+        assert grammar.parse.call_count == 2
+
+    def test_copy_on_read(self):
+        result = parse_search_query("release:[1.2.1, 1.2.2]")
+        result[0].value.raw_value.append("1.2.3")
+        result.append("junk")
+        assert parse_search_query("release:[1.2.1, 1.2.2]") == [
+            SearchFilter(
+                key=SearchKey(name="release"),
+                operator="IN",
+                value=SearchValue(["1.2.1", "1.2.2"]),
+            )
+        ]
+
+    def test_eviction(self):
+        with mock.patch.object(parse_cache, "max_size", 2):
+            parse_search_query("a:1")
+            parse_search_query("b:1")
+            parse_search_query("a:1")
+            parse_search_query("c:1")
+            assert len(parse_cache) == 2
+            assert parse_cache.get((SearchVisitor, True, "a:1")) is not None
+            assert parse_cache.get((SearchVisitor, True, "b:1")) is None
+
+    def test_relative_dates_not_cached(self):
+        with freeze_time("2018-01-01"):
+            first = parse_search_query("timestamp:-24h")
+        with freeze_time("2018-01-02"):
+            second = parse_search_query("timestamp:-24h")
+        assert first != second
+        assert len(parse_cache) == 0
+
+    def test_params_not_cached(self):
+        parse_search_query("p95():>1s", params={"project_id": [1]})
+        assert len(parse_cache) == 0
+
+    def test_invalid_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(InvalidSearchQuery):
+                parse_search_query("is:unassigned")
+        assert len(parse_cache) == 0
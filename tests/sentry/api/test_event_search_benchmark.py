@@ -0,0 +1,40 @@
+import pytest
+
+from sentry.api.event_search import parse_cache, parse_search_query
+from sentry.testutils.skips import requires_pytest_benchmark
+
+TYPICAL_QUERY = (
+    'event.type:transaction transaction:"/api/0/organizations/" !user.email:*@example.com'
+)
+PATHOLOGICAL_QUERY = " OR ".join(
+    f'(tags[key_{i}]:"value {i}" AND release:[1.{i}.0, 1.{i}.1] AND message:"*foo {i}*")'
+    for i in range(50)
+)
+
+
+@pytest.fixture
+def empty_parse_cache():
+    parse_cache.clear()
+    yield
+    parse_cache.clear()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "query", [TYPICAL_QUERY, PATHOLOGICAL_QUERY], ids=["typical", "pathological"]
+)
+def test_benchmark_parse_uncached(benchmark, empty_parse_cache, query):
+    def parse():
+        parse_cache.clear()
+        return parse_search_query(query)
+
+    assert benchmark(parse)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "query", [TYPICAL_QUERY, PATHOLOGICAL_QUERY], ids=["typical", "pathological"]
+)
+def test_benchmark_parse_cached(benchmark, empty_parse_cache, query):
+    parse_search_query(query)
+    assert benchmark(parse_search_query, query)
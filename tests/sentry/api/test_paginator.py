@@ -10,15 +10,17 @@ from sentry.api.paginator import (
     CombinedQuerysetPaginator,
     DateTimePaginator,
     GenericOffsetPaginator,
+    KeysetPaginator,
     OffsetPaginator,
     Paginator,
     SequencePaginator,
+    estimate_hits,
     reverse_bisect_left,
 )
 from sentry.incidents.models import AlertRule
 from sentry.models import Rule, User
 from sentry.testutils import APITestCase, TestCase
-from sentry.utils.cursors import Cursor
+from sentry.utils.cursors import Cursor, StringCursor
 
 
 class PaginatorTest(TestCase):
@@ -175,6 +177,94 @@ class OffsetPaginatorTest(TestCase):
             paginator.get_result()
 
 
+class KeysetPaginatorTest(TestCase):
+    def get_result(self, paginator, limit, cursor):
+        if cursor is not None:
+            # make sure cursors survive being passed around as strings
+            cursor = StringCursor.from_string(str(cursor))
+        return paginator.get_result(limit=limit, cursor=cursor)
+
+    def test_simple(self):
+        res1 = self.create_user("foo@example.com")
+        res2 = self.create_user("bar@example.com")
+        res3 = self.create_user("baz@example.com")
+
+        paginator = KeysetPaginator(User.objects.all(), "id")
+        result1 = self.get_result(paginator, 1, None)
+        assert list(result1) == [res1]
+        assert result1.next
+        assert not result1.prev
+
+        result2 = self.get_result(paginator, 1, result1.next)
+        assert list(result2) == [res2]
+        assert result2.next
+        assert result2.prev
+
+        result3 = self.get_result(paginator, 1, result2.next)
+        assert list(result3) == [res3]
+        assert not result3.next
+        assert result3.prev
+
+        result4 = self.get_result(paginator, 1, result3.prev)
+        assert list(result4) == [res2]
+        assert result4.next
+        assert result4.prev
+
+        result5 = self.get_result(paginator, 2, result4.prev)
+        assert list(result5) == [res1]
+        assert result5.next
+        assert not result5.prev
+
+    def test_composite_order(self):
+        joined = timezone.now()
+        res1 = self.create_user("foo@example.com", date_joined=joined)
+        res2 = self.create_user("bar@example.com", date_joined=joined)
+        res3 = self.create_user("baz@example.com", date_joined=joined - timedelta(days=1))
+        res4 = self.create_user("qux@example.com", date_joined=joined + timedelta(days=1))
+
+        paginator = KeysetPaginator(User.objects.all(), ["-date_joined", "id"])
+        result1 = self.get_result(paginator, 2, None)
+        assert list(result1) == [res4, res1]
+
+        result2 = self.get_result(paginator, 2, result1.next)
+        assert list(result2) == [res2, res3]
+        assert not result2.next
+
+        result3 = self.get_result(paginator, 2, result2.prev)
+        assert list(result3) == [res4, res1]
+        assert not result3.prev
+
+    def test_pk_tiebreaker(self):
+        paginator = KeysetPaginator(User.objects.all(), "-date_joined")
+        assert paginator.order_by == ["-date_joined", "-id"]
+
+        paginator = KeysetPaginator(User.objects.all(), ["is_active", "-id"])
+        assert paginator.order_by == ["is_active", "-id"]
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(User.objects.all(), "id")
+        for value in ("10", "not-a-cursor", paginator.encode_key(["a", "b"])):
+            with self.assertRaises(BadPaginationError):
+                paginator.get_result(cursor=StringCursor(value, 0, False))
+
+    def test_hits(self):
+        self.create_user("foo@example.com")
+        self.create_user("bar@example.com")
+
+        paginator = KeysetPaginator(User.objects.all(), "id")
+        result = paginator.get_result(limit=1, count_hits=True)
+        assert result.hits == 2
+        assert result.max_hits == 1000
+
+        paginator = KeysetPaginator(User.objects.all(), "id", estimate_hits_threshold=0)
+        result = paginator.get_result(limit=1, count_hits=True)
+        assert result.hits == estimate_hits(User.objects.all())
+
+    def test_estimate_hits(self):
+        assert estimate_hits(User.objects.none()) == 0
+        assert estimate_hits(User.objects.all()) >= 0
+
+
 class DateTimePaginatorTest(TestCase):
     def test_ascending(self):
         joined = timezone.now()
@@ -0,0 +1,41 @@
+import pytest
+
+from sentry.api.paginator import KeysetPaginator, OffsetPaginator
+from sentry.models import User
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.cursors import Cursor
+
+ROWS = 20000
+LIMIT = 100
+# Deep enough into the table for OFFSET to have to skip most rows
+PAGE = ROWS // LIMIT - 2
+
+
+@pytest.fixture
+def users():
+    User.objects.bulk_create(
+        [User(username=f"user-{i}", email=f"user-{i}@example.com") for i in range(ROWS)],
+        batch_size=5000,
+    )
+    return User.objects.all()
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_offset_paginator_deep_page(benchmark, users):
+    paginator = OffsetPaginator(users, "-id")
+    cursor = Cursor(LIMIT, PAGE, False)
+
+    result = benchmark(paginator.get_result, limit=LIMIT, cursor=cursor)
+    assert len(result) == LIMIT
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_keyset_paginator_deep_page(benchmark, users):
+    paginator = KeysetPaginator(users, "-id")
+    boundary = users.order_by("-id")[PAGE * LIMIT - 1]
+    cursor = paginator.cursor_cls(paginator.get_item_key(boundary), 0, False)
+
+    result = benchmark(paginator.get_result, limit=LIMIT, cursor=cursor)
+    assert len(result) == LIMIT
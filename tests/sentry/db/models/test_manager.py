@@ -0,0 +1,71 @@
+from django.test import override_settings
+
+from sentry.db.models.manager import BaseManager, ProcessCache
+from sentry.models import Organization
+from sentry.testutils import TestCase
+from sentry.utils import invalidation, json
+from sentry.utils.compat import mock
+
+
+@override_settings(SENTRY_MODEL_PROCESS_CACHE_SIZE=100)
+class ProcessCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        BaseManager.clear_process_cache()
+        self.addCleanup(BaseManager.clear_process_cache)
+
+    def test_get_from_cache(self):
+        org = self.create_organization(name="foo")
+        assert Organization.objects.get_from_cache(id=org.id) == org
+        assert Organization.objects.get_from_cache(slug=org.slug) == org
+
+        with mock.patch("sentry.db.models.manager.cache") as cache, self.assertNumQueries(0):
+            result = Organization.objects.get_from_cache(id=org.id)
+            assert result == org
+            assert Organization.objects.get_from_cache(slug=org.slug) == org
+            assert not cache.get.called
+
+        # every lookup gets its own copy
+        result.name = "bar"
+        assert Organization.objects.get_from_cache(id=org.id).name == "foo"
+
+    def test_invalidated_on_save(self):
+        org = self.create_organization(name="foo", slug="foo")
+        Organization.objects.get_from_cache(id=org.id)
+        Organization.objects.get_from_cache(slug="foo")
+
+        with mock.patch.object(invalidation, "publish") as publish:
+            org.update(name="bar", slug="bar")
+        (topic, keys), _ = publish.call_args
+        assert topic == ProcessCache.topic
+        assert len(keys) == 3
+
+        assert Organization.objects.get_from_cache(id=org.id).name == "bar"
+        assert Organization.objects.get_from_cache(slug="bar").name == "bar"
+        with self.assertRaises(Organization.DoesNotExist):
+            Organization.objects.get_from_cache(slug="foo")
+
+    def test_prefetch_from_cache(self):
+        orgs = [self.create_organization() for _ in range(3)]
+        Organization.objects.prefetch_from_cache([org.id for org in orgs])
+
+        with mock.patch("sentry.db.models.manager.cache") as cache, self.assertNumQueries(0):
+            for org in orgs:
+                assert Organization.objects.get_from_cache(id=org.id) == org
+            assert not cache.get.called
+
+    def test_broadcast(self):
+        org = self.create_organization()
+        Organization.objects.get_from_cache(id=org.id)
+
+        with mock.patch.object(invalidation, "publish") as publish:
+            Organization.objects.uncache_object(org.id)
+        (topic, keys), _ = publish.call_args
+
+        Organization.objects.get_from_cache(id=org.id)
+        invalidation.dispatch(json.dumps({"topic": topic, "keys": keys}))
+
+        with mock.patch("sentry.db.models.manager.cache") as cache:
+            cache.get.return_value = None
+            assert Organization.objects.get_from_cache(id=org.id) == org
+            assert cache.get.called
@@ -87,3 +87,21 @@ class DeleteProjectTest(TestCase):
         assert Commit.objects.filter(id=commit.id).exists()
         assert not ProjectDebugFile.objects.filter(id=dif.id).exists()
         assert not File.objects.filter(id=file.id).exists()
+
+    def test_sharded_groups(self):
+        project = self.create_project(name="test")
+        groups = [self.create_group(project=project) for _ in range(5)]
+        GroupMeta.objects.create(group=groups[0], key="foo", value="bar")
+        other_group = self.create_group()
+
+        deletion = ScheduledDeletion.schedule(project, days=0)
+        deletion.update(in_progress=True)
+
+        with self.options({"deletions.project.group-shards": 3}), self.tasks():
+            run_deletion(deletion.id)
+
+        assert not Project.objects.filter(id=project.id).exists()
+        assert not Group.objects.filter(project_id=project.id).exists()
+        assert not GroupMeta.objects.filter(group_id=groups[0].id).exists()
+        assert Group.objects.filter(id=other_group.id).exists()
+        assert not ScheduledDeletion.objects.filter(id=deletion.id).exists()
@@ -6,6 +6,7 @@ import pytest
 
 from sentry.event_manager import _save_aggregate
 from sentry.eventstore.models import Event
+from sentry.testutils.helpers import override_options
 
 
 @pytest.mark.django_db(transaction=True)
@@ -26,9 +27,13 @@ from sentry.eventstore.models import Event
         False,
     ],
 )
-def test_group_creation_race(monkeypatch, default_project, is_race_free):
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_group_creation_race(monkeypatch, default_project, is_race_free, coalesce):
     CONCURRENCY = 2
 
+    if coalesce and not is_race_free:
+        pytest.skip("coalescing relies on transaction isolation in the leader")
+
     if not is_race_free:
 
         class FakeTransactionModule:
@@ -67,13 +72,14 @@ def test_group_creation_race(monkeypatch, default_project, is_race_free):
         )
 
     threads = []
-    for _ in range(CONCURRENCY):
-        thread = Thread(target=save_event)
-        thread.start()
-        threads.append(thread)
+    with override_options({"store.coalesce-group-creation": coalesce}):
+        for _ in range(CONCURRENCY):
+            thread = Thread(target=save_event)
+            thread.start()
+            threads.append(thread)
 
-    for thread in threads:
-        thread.join()
+        for thread in threads:
+            thread.join()
 
     if is_race_free:
         # assert one group is new
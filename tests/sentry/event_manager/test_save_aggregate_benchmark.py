@@ -0,0 +1,62 @@
+import time
+import uuid
+from threading import Barrier, Thread
+
+import pytest
+from django.db import connections
+
+from sentry.event_manager import _save_aggregate
+from sentry.eventstore.models import Event
+from sentry.testutils.helpers import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+
+CONCURRENCY = 16
+
+
+def save_burst(project):
+    """
+    Saves ``CONCURRENCY`` events with the same brand-new hashes at once, the
+    way a deploy that introduces a new error does.
+    """
+    hashes = [uuid.uuid4().hex, uuid.uuid4().hex]
+    barrier = Barrier(CONCURRENCY)
+    return_values = []
+
+    def save_event():
+        data = {"timestamp": time.time()}
+        event = Event(project.id, uuid.uuid4().hex, data=data)
+        barrier.wait()
+        try:
+            return_values.append(
+                _save_aggregate(
+                    event,
+                    flat_hashes=hashes,
+                    hierarchical_hashes=[],
+                    release=None,
+                    data=data,
+                    level=10,
+                    culprit="",
+                )
+            )
+        finally:
+            connections.close_all()
+
+    threads = [Thread(target=save_event) for _ in range(CONCURRENCY)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return return_values
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_benchmark_new_issue_burst(benchmark, default_project, coalesce):
+    with override_options({"store.coalesce-group-creation": coalesce}):
+        return_values = benchmark.pedantic(save_burst, args=(default_project,), rounds=10)
+
+    assert len(return_values) == CONCURRENCY
+    assert len({group.id for group, _, _ in return_values}) == 1
+    assert sum(is_new for _, is_new, _ in return_values) == 1
@@ -2,6 +2,7 @@ from sentry.eventstore.base import Filter
 from sentry.eventstore.snuba.backend import SnubaEventStorage
 from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.utils import snuba
 from sentry.utils.compat import mock
 from sentry.utils.samples import load_data
 
@@ -157,6 +158,54 @@ class SnubaEventStorageTest(TestCase, SnubaTestCase):
         assert oldest_event is None
         assert latest_event is None
 
+    def test_get_adjacent_event_ids(self):
+        event = self.eventstore.get_event_by_id(self.project2.id, "b" * 32)
+        _filter = Filter(project_ids=[self.project1.id, self.project2.id])
+
+        with mock.patch(
+            "sentry.utils.snuba.bulk_raw_query", wraps=snuba.bulk_raw_query
+        ) as bulk_raw_query:
+            adjacent = self.eventstore.get_adjacent_event_ids(event, filter=_filter)
+            assert bulk_raw_query.call_count == 1
+
+            assert adjacent == (
+                (str(self.project1.id), "a" * 32),
+                (str(self.project1.id), "a" * 32),
+                (str(self.project2.id), "c" * 32),
+                (str(self.project2.id), "e" * 32),
+            )
+            assert adjacent.prev == self.eventstore.get_prev_event_id(event, filter=_filter)
+            assert adjacent.next == self.eventstore.get_next_event_id(event, filter=_filter)
+
+            # cached
+            bulk_raw_query.reset_mock()
+            assert self.eventstore.get_adjacent_event_ids(event, filter=_filter) == adjacent
+            assert bulk_raw_query.call_count == 0
+
+        # only the requested events are queried
+        with mock.patch(
+            "sentry.utils.snuba.bulk_raw_query", wraps=snuba.bulk_raw_query
+        ) as bulk_raw_query:
+            assert self.eventstore.get_adjacent_event_ids(
+                event, filter=_filter, which=("prev", "next")
+            ) == (None, adjacent.prev, adjacent.next, None)
+            (snuba_params,), _ = bulk_raw_query.call_args
+            assert len(snuba_params) == 2
+
+        _filter = Filter(project_ids=[self.project1.id], group_ids=[self.event2.group_id])
+        assert self.eventstore.get_adjacent_event_ids(event, filter=_filter) == (
+            None,
+            None,
+            None,
+            None,
+        )
+        assert self.eventstore.get_adjacent_event_ids(None, filter=_filter) == (
+            None,
+            None,
+            None,
+            None,
+        )
+
     def test_transaction_get_next_prev_event_id(self):
         _filter = Filter(
             project_ids=[self.project1.id, self.project2.id],
@@ -39,6 +39,32 @@ class EventStorageTest(TestCase):
         assert event.data._node_data is not None
         assert event.data["user"]["id"] == "user1"
 
+    def test_iter_bind_nodes(self):
+        events = [Event(project_id=self.project.id, event_id=f"{i:032x}") for i in range(25)]
+        node_data = {e.data.id: {"culprit": e.event_id} for e in events[:-1]}
+
+        def get_multi(node_ids):
+            return {node_id: node_data[node_id] for node_id in node_ids if node_id in node_data}
+
+        with mock.patch("sentry.nodestore.get_multi", side_effect=get_multi) as mock_get_multi:
+            pages = list(
+                self.eventstorage.iter_bind_nodes(
+                    (e for e in events), "data", page_size=10, max_prefetch=20
+                )
+            )
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert [e for page in pages for e in page] == events
+        assert mock_get_multi.call_count == 3
+        for event in events[:-1]:
+            assert event.data._node_data is not None
+            assert event.data["culprit"] == event.event_id
+        assert events[-1].data._node_data is not None
+        assert "culprit" not in events[-1].data
+
+    def test_iter_bind_nodes_empty(self):
+        assert list(self.eventstorage.iter_bind_nodes([], "data")) == []
+
 
 class ServiceDelegationTest(TestCase, SnubaTestCase):
     def setUp(self):
@@ -26,15 +26,17 @@ from sentry.incidents.subscription_processor import (
     build_alert_rule_trigger_stat_key,
     build_trigger_stat_keys,
     get_alert_rule_stats,
+    get_alert_rule_stats_many,
     get_redis_client,
     partition,
+    process_updates,
     update_alert_rule_stats,
 )
 from sentry.snuba.models import QuerySubscription
 from sentry.testutils import TestCase
 from sentry.utils.compat import map
 from sentry.utils.compat.mock import Mock, call
-from sentry.utils.dates import to_timestamp
+from sentry.utils.dates import to_datetime, to_timestamp
 
 EMPTY = object()
 
@@ -816,6 +818,47 @@ class ProcessUpdateTest(TestCase):
         self.assert_trigger_exists_with_status(incident, other_trigger, TriggerStatus.RESOLVED)
         self.assert_actions_resolved_for_incident(incident, [self.action])
 
+    def test_process_updates_reuses_processor(self):
+        rule = self.rule
+        rule.update(threshold_period=2)
+        trigger = self.trigger
+        processor_cache = {}
+        with self.feature(
+            ["organizations:incidents", "organizations:performance-view"]
+        ), self.capture_on_commit_callbacks(execute=True):
+            process_updates(
+                [
+                    (
+                        self.build_subscription_update(
+                            self.sub,
+                            value=trigger.alert_threshold + 1,
+                            time_delta=timedelta(minutes=-1),
+                        ),
+                        self.sub,
+                    )
+                ],
+                processor_cache,
+            )
+            processor = processor_cache[self.sub.id][0]
+            self.assert_trigger_counts(processor, trigger, 1, 0)
+            self.assert_no_active_incident(rule)
+
+            process_updates(
+                [
+                    (
+                        self.build_subscription_update(self.sub, value=trigger.alert_threshold + 1),
+                        self.sub,
+                    )
+                ],
+                processor_cache,
+            )
+
+        assert processor_cache[self.sub.id][0] is processor
+        self.assert_trigger_counts(processor, trigger, 0, 0)
+        incident = self.assert_active_incident(rule)
+        self.assert_trigger_exists_with_status(incident, trigger, TriggerStatus.ACTIVE)
+        self.assert_actions_fired_for_incident(incident, [self.action])
+
 
 class TestBuildAlertRuleStatKeys(unittest.TestCase):
     def test(self):
@@ -879,6 +922,20 @@ class TestGetAlertRuleStats(TestCase):
         assert resolve_counts == {3: 2, 4: 4}
 
 
+class TestGetAlertRuleStatsMany(TestCase):
+    def test(self):
+        alert_rule = AlertRule(id=1)
+        subs = [QuerySubscription(id=5, project_id=2), QuerySubscription(id=6, project_id=3)]
+        triggers = [AlertRuleTrigger(id=3), AlertRuleTrigger(id=4)]
+        timestamp = datetime.now().replace(tzinfo=pytz.utc, microsecond=0)
+        update_alert_rule_stats(alert_rule, subs[0], timestamp, {3: 1, 4: 3}, {3: 2, 4: 4})
+
+        results = get_alert_rule_stats_many([(sub, alert_rule, triggers) for sub in subs])
+        assert results[0] == (timestamp, {3: 1, 4: 3}, {3: 2, 4: 4})
+        assert results[1] == (to_datetime(0), {3: 0, 4: 0}, {3: 0, 4: 0})
+        assert get_alert_rule_stats_many([]) == []
+
+
 class TestUpdateAlertRuleStats(TestCase):
     def test(self):
         alert_rule = AlertRule(id=1)
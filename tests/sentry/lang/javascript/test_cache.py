@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from sentry.lang.javascript.cache import SourceCache
+from sentry.lang.javascript.cache import ParsedSourceCache, SourceCache
 
 
 class BasicCacheTest(TestCase):
@@ -37,3 +37,45 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class ParsedSourceCacheTest(TestCase):
+    def test_lru_by_size(self):
+        cache = ParsedSourceCache(max_size=10)
+
+        cache.set(("source", "a"), "a", 4)
+        cache.set(("source", "b"), "b", 4)
+        assert cache.get(("source", "a")) == "a"
+
+        # evicts b, which is the least recently used entry
+        cache.set(("source", "c"), "c", 4)
+        assert cache.size == 8
+        assert ("source", "a") in cache
+        assert ("source", "b") not in cache
+        assert cache.get(("source", "c")) == "c"
+
+    def test_too_large(self):
+        cache = ParsedSourceCache(max_size=10)
+        cache.set(("source", "a"), "a", 4)
+        cache.set(("source", "b"), "b", 11)
+        assert len(cache) == 1
+        assert cache.get(("source", "b")) is None
+
+    def test_replace(self):
+        cache = ParsedSourceCache(max_size=10)
+        cache.set(("source", "a"), "a", 4)
+        cache.set(("source", "a"), "aa", 6)
+        assert cache.size == 6
+        assert cache.get(("source", "a")) == "aa"
+
+    def test_get_or_set(self):
+        cache = ParsedSourceCache(max_size=10)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "a"
+
+        assert cache.get_or_set(("source", "a"), build, 1) == "a"
+        assert cache.get_or_set(("source", "a"), build, 1) == "a"
+        assert len(calls) == 1
@@ -25,6 +25,7 @@ from sentry.lang.javascript.processor import (
     get_max_age,
     get_release_file_cache_key,
     get_release_file_cache_key_meta,
+    parsed_source_cache,
     should_retry_fetch,
     trim_line,
 )
@@ -160,6 +161,29 @@ class FetchReleaseFileTest(TestCase):
             "file.min.js", {"content-type": "application/json; charset=utf-8"}, b"bar", 200, "utf-8"
         )
 
+    def test_missing_file_uses_index(self):
+        project = self.project
+        release = Release.objects.create(organization_id=project.organization_id, version="abc")
+        release.add_project(project)
+
+        artifact_index = ReleaseFile.get_artifact_index(release)
+        with self.assertNumQueries(0):
+            assert fetch_release_file("file.min.js", release, artifact_index=artifact_index) is None
+
+        file = File.objects.create(name="file.min.js", type="release.file")
+        file.putfile(BytesIO(b"foo"))
+        with self.capture_on_commit_callbacks(execute=True):
+            ReleaseFile.objects.create(
+                name="file.min.js",
+                release=release,
+                organization_id=project.organization_id,
+                file=file,
+            )
+
+        # the upload invalidated the index, so the file is found right away
+        result = fetch_release_file("file.min.js", release)
+        assert result.body == b"foo"
+
     def test_tilde(self):
         project = self.project
         release = Release.objects.create(organization_id=project.organization_id, version="abc")
@@ -793,6 +817,23 @@ class FetchSourcemapTest(TestCase):
         with pytest.raises(UnparseableSourcemap):
             fetch_sourcemap("http://example.com")
 
+    @patch("sentry.lang.javascript.processor.fetch_file")
+    @patch("sentry.lang.javascript.processor.SourceMapView")
+    def test_parsed_cache(self, mock_view, mock_fetch_file):
+        parsed_source_cache.clear()
+        url = "http://example.com/file.min.js.map"
+        mock_fetch_file.return_value = http.UrlResult(url, {}, b'{"version": 3}', 200, None)
+
+        assert fetch_sourcemap(url)
+        assert fetch_sourcemap(url)
+        assert mock_view.from_json_bytes.call_count == 1
+
+        # the body is part of the key, a changed file is parsed again
+        mock_fetch_file.return_value = http.UrlResult(url, {}, b'{"version": 3, "x": 1}', 200, None)
+        assert fetch_sourcemap(url)
+        assert mock_view.from_json_bytes.call_count == 2
+        parsed_source_cache.clear()
+
 
 class TrimLineTest(unittest.TestCase):
     long_line = "The public is more familiar with bad design than good design. It is, in effect, conditioned to prefer bad design, because that is what it lives with. The new becomes threatening, the old reassuring."
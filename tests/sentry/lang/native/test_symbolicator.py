@@ -3,9 +3,16 @@ import copy
 import pytest
 
 from sentry.lang.native import symbolicator
-from sentry.lang.native.symbolicator import get_sources_for_project, redact_internal_sources
+from sentry.lang.native.symbolicator import (
+    Symbolicator,
+    SymbolicatorSession,
+    get_sources_for_project,
+    redact_internal_sources,
+)
+from sentry.tasks.store import RetrySymbolication
 from sentry.testutils.helpers import Feature
-from sentry.utils.compat import map
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.compat import map, mock
 
 CUSTOM_SOURCE_CONFIG = """
 [{
@@ -265,3 +272,37 @@ class TestAliasReversion:
         reverse_aliases = symbolicator.reverse_aliases_map(builtin_sources)
         expected = {"sentry:ios-source": "sentry:ios", "sentry:tvos-source": "sentry:ios"}
         assert reverse_aliases == expected
+
+
+class TestPolling:
+    @pytest.fixture
+    def client(self, default_project):
+        with override_options({"symbolicator.options": {"url": "http://symbolicator"}}):
+            yield Symbolicator(default_project, "a" * 32)
+
+    @pytest.mark.django_db
+    def test_pending_long_poll(self, client):
+        pending = {"status": "pending", "request_id": "abc", "retry_after": 5}
+        with mock.patch.object(
+            SymbolicatorSession, "symbolicate_stacktraces", return_value=pending
+        ), mock.patch.object(SymbolicatorSession, "query_task", return_value=pending) as query:
+            with pytest.raises(RetrySymbolication):
+                client.process_payload(stacktraces=[], modules=[])
+            assert not query.called
+
+            with mock.patch("sentry.lang.native.symbolicator.time") as time:
+                time.time.side_effect = [100, 105]
+                with pytest.raises(RetrySymbolication) as e:
+                    client.process_payload(stacktraces=[], modules=[])
+
+            query.assert_called_once_with("abc", timeout=10)
+            # the time spent long-polling already counts as waiting
+            assert e.value.retry_after == 0
+
+    def test_session_pooled(self):
+        with SymbolicatorSession(url="http://symbolicator") as sess:
+            session = sess.session
+        assert sess.session is None
+
+        with SymbolicatorSession(url="http://symbolicator") as sess:
+            assert sess.session is session
@@ -0,0 +1,52 @@
+from sentry.metrics import aggregating
+from sentry.metrics.aggregating import AggregatingMetricsBackend
+from sentry.metrics.dummy import DummyMetricsBackend
+from sentry.testutils import TestCase
+from sentry.utils.compat.mock import call, patch
+
+
+class AggregatingMetricsBackendTest(TestCase):
+    def setUp(self):
+        aggregating._aggregators.clear()
+        self.backend = AggregatingMetricsBackend(
+            backend="sentry.metrics.dummy.DummyMetricsBackend", flush_interval=3600
+        )
+
+    @patch.object(DummyMetricsBackend, "incr")
+    def test_incr(self, mock_incr):
+        self.backend.incr("foo", tags={"a": "1", "b": "2"})
+        self.backend.incr("foo", tags={"b": "2", "a": "1"}, amount=2, sample_rate=0.1)
+        self.backend.incr("foo", instance="bar")
+        assert not mock_incr.called
+
+        self.backend.flush()
+        assert len(mock_incr.call_args_list) == 2
+        assert call("foo", None, {"a": "1", "b": "2"}, 3, 1) in mock_incr.call_args_list
+        assert call("foo", "bar", {}, 1, 1) in mock_incr.call_args_list
+
+        mock_incr.reset_mock()
+        self.backend.flush()
+        assert not mock_incr.called
+
+    @patch.object(DummyMetricsBackend, "timing")
+    def test_timing(self, mock_timing):
+        for value in (0, 0.5, 0.501, 20, 20):
+            self.backend.timing("foo", value, tags={"a": "1"})
+        self.backend.flush()
+
+        values = sorted(args[1] for args, _ in mock_timing.call_args_list)
+        assert len(values) == 5
+        assert values[0] == 0
+        for value, expected in zip(values[1:], (0.5, 0.501, 20, 20)):
+            assert abs(value - expected) <= expected * aggregating.RELATIVE_ACCURACY
+        # close values end up in the same bucket
+        assert values[1] == values[2]
+
+        (key, _, instance, tags, sample_rate), _ = mock_timing.call_args
+        assert (key, instance, tags, sample_rate) == ("foo", None, {"a": "1"}, 1)
+
+    def test_shared_between_threads(self):
+        other = AggregatingMetricsBackend(
+            backend="sentry.metrics.dummy.DummyMetricsBackend", flush_interval=3600
+        )
+        assert other.aggregator is self.backend.aggregator
@@ -0,0 +1,83 @@
+import pytest
+from datadog import statsd as dogstatsd
+
+from sentry.metrics import aggregating
+from sentry.metrics.aggregating import AggregatingMetricsBackend
+from sentry.metrics.dogstatsd import DogStatsdMetricsBackend
+from sentry.metrics.statsd import StatsdMetricsBackend
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.compat import mock
+
+TAGS = {"consumer": "ingest", "result": "success"}
+
+
+@pytest.fixture(params=["statsd", "dogstatsd", "aggregating"])
+def backend(request):
+    # The statsd backends send UDP packets to a port nobody listens on, which
+    # is what they cost on the calling thread in production as well.
+    if request.param == "statsd":
+        return StatsdMetricsBackend(prefix="sentrytest.")
+    if request.param == "dogstatsd":
+        return DogStatsdMetricsBackend(prefix="sentrytest.")
+
+    aggregating._aggregators.clear()
+    return AggregatingMetricsBackend(
+        backend="sentry.metrics.statsd.StatsdMetricsBackend",
+        backend_options={"prefix": "sentrytest."},
+        flush_interval=3600,
+    )
+
+
+@requires_pytest_benchmark
+def test_benchmark_incr(benchmark, backend):
+    benchmark(backend.incr, "ingest_consumer.flush.messages_seen", None, dict(TAGS))
+
+
+@requires_pytest_benchmark
+def test_benchmark_timing(benchmark, backend):
+    benchmark(backend.timing, "rules.conditions.queried_snuba", 0.0123, None, dict(TAGS))
+
+
+@pytest.fixture(params=["statsd", "dogstatsd"])
+def flush_backend(request):
+    """
+    An aggregating backend, and a mock of the function through which its
+    wrapped backend sends every packet.
+    """
+    aggregating._aggregators.clear()
+    if request.param == "statsd":
+        backend = AggregatingMetricsBackend(
+            backend="sentry.metrics.statsd.StatsdMetricsBackend",
+            backend_options={"prefix": "sentrytest."},
+            flush_interval=3600,
+        )
+        client = backend.aggregator.backend.client
+        with mock.patch.object(client, "_send", wraps=client._send) as send:
+            yield backend, send
+    else:
+        backend = AggregatingMetricsBackend(
+            backend="sentry.metrics.dogstatsd.DogStatsdMetricsBackend",
+            backend_options={"prefix": "sentrytest."},
+            flush_interval=3600,
+        )
+        with mock.patch.object(
+            dogstatsd, "_send_to_server", wraps=dogstatsd._send_to_server
+        ) as send:
+            yield backend, send
+
+
+@requires_pytest_benchmark
+def test_benchmark_flush_packets(benchmark, flush_backend):
+    backend, send = flush_backend
+
+    def record_and_flush():
+        for i in range(1000):
+            backend.timing("rules.conditions.queried_snuba", 0.01 + (i % 100) / 1000, None, None)
+        backend.flush()
+
+    benchmark.pedantic(record_and_flush, rounds=10)
+
+    packets_per_flush = send.call_count / 10
+    benchmark.extra_info["packets_per_flush"] = packets_per_flush
+    # The 1000 timings are packed into batches instead of one packet each.
+    assert packets_per_flush < 200
@@ -1,5 +1,4 @@
 import os
-import time
 import zipfile
 from io import BytesIO
 
@@ -278,13 +277,9 @@ class DebugFilesClearTest(APITestCase):
         ProjectDebugFile.difcache.clear_old_entries()
         assert os.path.isfile(difs[PROGUARD_UUID])
 
-        # Put the time into the future
-        real_time = time.time
-        time.time = lambda: real_time() + 60 * 60 * 48
-        try:
+        # Shrink the cache so that the file does not fit anymore
+        with self.options({"dsym.cache-max-size": 0}):
             ProjectDebugFile.difcache.clear_old_entries()
-        finally:
-            time.time = real_time
 
         # But it's gone now
         assert not os.path.isfile(difs[PROGUARD_UUID])
@@ -0,0 +1,50 @@
+import pickle
+from copy import deepcopy
+
+from sentry.models import EventDict
+from sentry.testutils import TestCase
+from sentry.utils.compat import mock
+from sentry.utils.samples import load_data
+
+
+class EventDictTest(TestCase):
+    def test_renormalization_is_deferred(self):
+        data = load_data("python")
+        with mock.patch("sentry.models.event.StoreNormalizer") as normalizer:
+            normalizer.return_value.normalize_event.return_value = {"platform": "python"}
+            event_data = EventDict(data)
+            assert not normalizer.called
+            assert not event_data.is_materialized
+
+            assert event_data["platform"] == "python"
+            assert event_data.is_materialized
+            assert normalizer.call_count == 1
+
+            assert dict(event_data) == {"platform": "python"}
+            assert normalizer.call_count == 1
+
+    def test_same_result_as_eager(self):
+        data = load_data("python")
+        data["sentry.interfaces.User"] = {"id": "1"}
+        event_data = EventDict(deepcopy(data))
+
+        assert "sentry.interfaces.User" in event_data
+        assert event_data["user"] == {"id": "1"}
+        assert event_data["platform"] == "python"
+        assert "sentry.interfaces.User" not in event_data.data
+
+    def test_wrapping_is_lazy(self):
+        inner = EventDict({"platform": "python"}, skip_renormalization=True)
+        outer = EventDict(inner)
+        assert not inner.is_materialized
+        assert outer["platform"] == "python"
+        assert inner.is_materialized
+
+    def test_copy_and_pickle(self):
+        event_data = EventDict({"platform": "python"}, skip_renormalization=True)
+        assert event_data.copy()["platform"] == "python"
+
+        restored = pickle.loads(pickle.dumps(EventDict({"platform": "python"})))
+        assert isinstance(restored, EventDict)
+        assert restored.is_materialized
+        assert restored["platform"] == "python"
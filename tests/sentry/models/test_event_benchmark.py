@@ -0,0 +1,57 @@
+import tracemalloc
+from copy import deepcopy
+
+import pytest
+
+from sentry.api.serializers import serialize
+from sentry.eventstore.models import Event
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.samples import load_data
+
+NUM_EVENTS = 200
+
+
+@pytest.fixture
+def payloads():
+    data = load_data("python")
+    return [deepcopy(data) for _ in range(NUM_EVENTS)]
+
+
+def load_events(project, payloads):
+    return [Event(project.id, f"{i:032x}", data=payload) for i, payload in enumerate(payloads)]
+
+
+def post_process(events):
+    # Post-processing mostly reads attributes that are backed by Snuba or the
+    # database and never needs the full payload.
+    return [(event.project_id, event.group_id, event.event_id) for event in events]
+
+
+def measure_peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_post_process(benchmark, default_project, payloads):
+    def run():
+        return post_process(load_events(default_project, deepcopy(payloads)))
+
+    benchmark.extra_info["peak_memory"] = measure_peak_memory(run)
+    assert len(benchmark(run)) == NUM_EVENTS
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_event_details(benchmark, default_project, default_user, payloads):
+    def run():
+        events = load_events(default_project, deepcopy(payloads))
+        return [serialize(event, default_user) for event in events]
+
+    benchmark.extra_info["peak_memory"] = measure_peak_memory(run)
+    assert len(benchmark(run)) == NUM_EVENTS
@@ -1,10 +1,12 @@
 import errno
 import os
+import tempfile
 from io import BytesIO
 
 from sentry import options
-from sentry.models import ReleaseFile
+from sentry.models import File, ReleaseFile
 from sentry.testutils import TestCase
+from sentry.utils.compat.mock import patch
 
 
 class ReleaseFileTestCase(TestCase):
@@ -33,6 +35,28 @@ class ReleaseFileTestCase(TestCase):
         # world, but worth documenting the behavior
         assert n("foo.js") == ["foo.js", "~foo.js"]
 
+    def test_artifact_index(self):
+        release = self.create_release(project=self.project)
+        dist = release.add_dist("foo")
+        foo = self.create_release_file(release=release, name="~/foo.js")
+        bar = self.create_release_file(release=release, name="~/bar.js", dist=dist)
+
+        assert ReleaseFile.get_artifact_index(release) == {foo.ident: foo.id}
+        assert ReleaseFile.get_artifact_index(release, dist) == {bar.ident: bar.id}
+
+        with self.assertNumQueries(0):
+            ReleaseFile.get_artifact_index(release)
+
+        # uploading a new artifact invalidates the index once committed
+        with self.capture_on_commit_callbacks(execute=True):
+            baz = self.create_release_file(release=release, name="~/baz.js")
+            assert ReleaseFile.get_artifact_index(release) == {foo.ident: foo.id}
+        assert ReleaseFile.get_artifact_index(release) == {foo.ident: foo.id, baz.ident: baz.id}
+
+        with self.capture_on_commit_callbacks(execute=True):
+            foo.delete()
+        assert ReleaseFile.get_artifact_index(release) == {baz.ident: baz.id}
+
 
 class ReleaseFileCacheTest(TestCase):
     def test_getfile_fs_cache(self):
@@ -43,9 +67,7 @@ class ReleaseFileCacheTest(TestCase):
         release_file = self.create_release_file(file=file)
 
         expected_path = os.path.join(
-            options.get("releasefile.cache-path"),
-            str(self.organization.id),
-            str(file.id),
+            options.get("releasefile.cache-path"), file.checksum[:2], file.checksum
         )
 
         # Set the threshold to zero to force caching on the file system
@@ -57,6 +79,45 @@ class ReleaseFileCacheTest(TestCase):
         # Check that the file was cached
         os.stat(expected_path)
 
+    def test_getfile_shared_by_checksum(self):
+        file_content = b"this is a test"
+        options.set("releasefile.cache-limit", 0)
+
+        release_files = []
+        for name in ("a.txt", "b.txt"):
+            file = self.create_file(name=name)
+            file.putfile(BytesIO(file_content))
+            release_files.append(self.create_release_file(file=file, name=name))
+
+        with patch.object(File, "save_to", autospec=True, side_effect=File.save_to) as save_to:
+            for release_file in release_files:
+                with ReleaseFile.cache.getfile(release_file) as f:
+                    assert f.read() == file_content
+            assert save_to.call_count == 1
+
+    def test_clear_old_entries(self):
+        options.set("releasefile.cache-limit", 0)
+
+        with tempfile.TemporaryDirectory() as cache_path, self.options(
+            {"releasefile.cache-path": cache_path, "releasefile.cache-max-size": 20}
+        ):
+            paths = []
+            for i, name in enumerate(("a.txt", "b.txt", "c.txt")):
+                file = self.create_file(name=name)
+                file.putfile(BytesIO(b"%d this is a test" % i))
+                release_file = self.create_release_file(file=file, name=name)
+                with ReleaseFile.cache.getfile(release_file):
+                    pass
+                paths.append(ReleaseFile.cache.get_path(file))
+                # make sure the modification times are ordered
+                os.utime(paths[-1], (i, i))
+
+            # using an entry makes it the most recently used one
+            ReleaseFile.cache.fetch(File.objects.get(name="a.txt"))
+
+            ReleaseFile.cache.clear_old_entries()
+            assert [os.path.exists(path) for path in paths] == [True, False, False]
+
     def test_getfile_streaming(self):
         file_content = b"this is a test"
 
@@ -65,9 +126,7 @@ class ReleaseFileCacheTest(TestCase):
         release_file = self.create_release_file(file=file)
 
         expected_path = os.path.join(
-            options.get("releasefile.cache-path"),
-            str(self.organization.id),
-            str(file.id),
+            options.get("releasefile.cache-path"), file.checksum[:2], file.checksum
         )
 
         # Set the threshold larger than the file size to force streaming
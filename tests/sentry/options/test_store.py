@@ -8,6 +8,7 @@ from exam import before, fixture
 from sentry.models import Option
 from sentry.options.store import OptionsStore
 from sentry.testutils import TestCase
+from sentry.utils import invalidation
 from sentry.utils.compat.mock import patch
 
 
@@ -149,3 +150,48 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    def test_publishes_invalidation(self):
+        store, key = self.store, self.key
+
+        with patch.object(invalidation, "publish") as publish:
+            store.set(key, "bar")
+        publish.assert_called_once_with(OptionsStore.invalidation_topic, [key.cache_key])
+
+        with patch.object(invalidation, "publish") as publish:
+            store.delete(key)
+        publish.assert_called_once_with(OptionsStore.invalidation_topic, [key.cache_key])
+
+    def test_handle_invalidation(self):
+        store, key, other_key = self.store, self.key, self.make_key()
+
+        store.set(key, "bar")
+        store.set(other_key, "baz")
+        store.cache.set(key.cache_key, "lol")
+
+        store.handle_invalidation([key.cache_key])
+        assert key.cache_key not in store._local_cache
+        assert other_key.cache_key in store._local_cache
+        assert store.get(key) == "lol"
+
+        store.handle_invalidation(None)
+        assert not store._local_cache
+
+    @patch("sentry.options.store.time")
+    def test_key_ttl_while_subscribed(self, mocked_time):
+        store, key = self.store, self.make_key(10, 0)
+
+        mocked_time.return_value = 0
+        with patch.object(invalidation, "is_connected", return_value=True):
+            with self.settings(SENTRY_OPTIONS_SUBSCRIBED_TTL=300):
+                store.set(key, "bar")
+
+        # Still served locally long after the TTL of the key has passed.
+        store.cache.delete(key.cache_key)
+        mocked_time.return_value = 250
+        with patch.object(Option.objects, "get_queryset", side_effect=Exception()):
+            assert store.get(key) == "bar"
+
+        mocked_time.return_value = 301
+        with patch.object(Option.objects, "get_queryset", side_effect=Exception()):
+            assert store.get(key) is None
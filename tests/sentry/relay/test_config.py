@@ -1,8 +1,9 @@
 import pytest
 
 from sentry.models import ProjectKey
-from sentry.relay.config import get_project_config
+from sentry.relay.config import SectionCache, get_project_config, get_project_config_for_key
 from sentry.testutils.helpers import Feature
+from sentry.utils.compat import mock
 from sentry.utils.safe import get_path
 
 PII_CONFIG = """
@@ -98,3 +99,45 @@ def test_project_config_uses_filters_and_sampling_feature(
             assert dynamic_sampling == dyn_sampling_data()
         else:
             assert dynamic_sampling is None
+
+
+@pytest.mark.django_db
+def test_get_project_config_for_key(default_project, factories):
+    default_project.update_option("sentry:relay_pii_config", PII_CONFIG)
+    factories.create_project_key(project=default_project)
+    factories.create_project_key(project=default_project)
+    keys = list(ProjectKey.objects.filter(project=default_project))
+
+    project_config = get_project_config(default_project, full_config=True, project_keys=keys)
+
+    for key in keys:
+        derived = get_project_config_for_key(default_project, project_config, key).to_dict()
+        expected = get_project_config(default_project, full_config=True, project_keys=[key])
+        expected = expected.to_dict()
+
+        for cfg in (derived, expected):
+            cfg.pop("lastFetch")
+            cfg.pop("rev")
+
+        assert derived == expected
+        assert [k["publicKey"] for k in derived["publicKeys"]] == [key.public_key]
+
+    # the config of the project itself remains untouched
+    assert len(project_config.to_dict()["publicKeys"]) == len(keys)
+
+
+@pytest.mark.django_db
+def test_section_cache_shares_organization_sections(default_project, factories):
+    other_project = factories.create_project(organization=default_project.organization)
+    section_cache = SectionCache()
+
+    with mock.patch(
+        "sentry.relay.config.quotas.get_event_retention", return_value=90
+    ) as get_event_retention:
+        configs = [
+            get_project_config(project, full_config=True, section_cache=section_cache)
+            for project in (default_project, other_project)
+        ]
+
+    assert get_event_retention.call_count == 1
+    assert [cfg.to_dict()["config"]["eventRetention"] for cfg in configs] == [90, 90]
@@ -2943,3 +2943,39 @@ def test_zerofill():
 
     assert results[0]["time"] == 1546387200
     assert results[7]["time"] == 1546992000
+
+
+def test_zerofill_series():
+    start = datetime(2019, 1, 2, 0, 0)
+    end = datetime(2019, 1, 4, 23, 59, 59)
+    data = [
+        {"time": 1546387200, "key": "a", "count": 1},
+        {"time": 1546560000, "key": "a", "count": 2},
+        {"time": 1546473600, "key": "b", "count": 3},
+        {"time": 1546473600, "key": "c", "count": 4},
+        # not aligned to a bucket
+        {"time": 1546473601, "key": "b", "count": 5},
+    ]
+    series, unmatched = discover.zerofill_series(
+        data, lambda row: row["key"], ["a", "b"], start, end, 86400
+    )
+
+    assert series == {
+        "a": [
+            {"time": 1546387200, "key": "a", "count": 1},
+            {"time": 1546473600},
+            {"time": 1546560000, "key": "a", "count": 2},
+        ],
+        "b": [
+            {"time": 1546387200},
+            {"time": 1546473600, "key": "b", "count": 3},
+            {"time": 1546560000},
+        ],
+    }
+    assert unmatched == [{"time": 1546473600, "key": "c", "count": 4}]
+
+    # matches zerofilling each series separately
+    for key, rows in series.items():
+        assert rows == discover.zerofill(
+            [row for row in data if row["key"] == key], start, end, 86400, "time"
+        )
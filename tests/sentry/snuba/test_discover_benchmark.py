@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from sentry.snuba import discover
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.snuba import to_naive_timestamp
+
+ROWS = 10000
+KEYS = 10
+ROLLUP = 60
+START = datetime(2021, 1, 1)
+
+
+def build_rows(num_keys):
+    start = int(to_naive_timestamp(START))
+    return [
+        {"time": start + (i // num_keys) * ROLLUP, "key": str(i % num_keys), "count": i}
+        for i in range(ROWS)
+    ]
+
+
+@requires_pytest_benchmark
+def test_benchmark_zerofill(benchmark):
+    rows = build_rows(1)
+    end = START + timedelta(seconds=ROLLUP * ROWS)
+
+    result = benchmark(discover.zerofill, rows, START, end, ROLLUP, "time")
+    assert len(result) == ROWS + 1
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("num_keys", [1, KEYS])
+def test_benchmark_zerofill_series(benchmark, num_keys):
+    rows = build_rows(num_keys)
+    keys = [str(i) for i in range(num_keys)]
+    end = START + timedelta(seconds=ROLLUP * (ROWS // num_keys))
+
+    series, unmatched = benchmark(
+        discover.zerofill_series, rows, lambda row: row["key"], keys, START, end, ROLLUP
+    )
+    assert len(series) == num_keys
+    assert not unmatched
@@ -12,6 +12,8 @@ from sentry.snuba.query_subscription_consumer import (
     InvalidMessageError,
     InvalidSchemaError,
     QuerySubscriptionConsumer,
+    batch_subscriber_registry,
+    register_batch_subscriber,
     register_subscriber,
     subscriber_registry,
 )
@@ -114,6 +116,92 @@ class HandleMessageTest(BaseQuerySubscriptionTest, TestCase):
         mock_callback.assert_called_once_with(data["payload"], sub)
 
 
+class HandleBatchTest(BaseQuerySubscriptionTest, TestCase):
+    metrics = patcher("sentry.snuba.query_subscription_consumer.metrics")
+
+    def tearDown(self):
+        super().tearDown()
+        subscriber_registry.pop("registered_batch_test", None)
+        batch_subscriber_registry.pop("registered_batch_test", None)
+
+    def build_mock_message(self, data, topic=None, partition=0, offset=0):
+        message = super().build_mock_message(data, topic=topic)
+        message.partition.return_value = partition
+        message.offset.return_value = offset
+        return message
+
+    def create_subscription(self, registration_key):
+        with self.tasks():
+            snuba_query = create_snuba_query(
+                QueryDatasets.EVENTS,
+                "hello",
+                "count()",
+                timedelta(minutes=10),
+                timedelta(minutes=1),
+                None,
+            )
+            sub = create_snuba_subscription(self.project, registration_key, snuba_query)
+        sub.refresh_from_db()
+        return sub
+
+    def test_batch_subscriber(self):
+        registration_key = "registered_batch_test"
+        mock_callback = mock.Mock()
+        mock_batch_callback = mock.Mock()
+        register_subscriber(registration_key)(mock_callback)
+        register_batch_subscriber(registration_key)(mock_batch_callback)
+        sub = self.create_subscription(registration_key)
+        other_sub = self.create_subscription(registration_key)
+
+        messages = []
+        for i, (subscription, partition) in enumerate([(sub, 0), (other_sub, 0), (sub, 1)]):
+            data = deepcopy(self.valid_wrapper)
+            data["payload"]["subscription_id"] = subscription.subscription_id
+            messages.append(self.build_mock_message(data, partition=partition, offset=i))
+
+        consumer = self.consumer
+        consumer.batch = messages
+        with self.assertNumQueries(1):
+            assert consumer.flush_batch() == 3
+
+        assert consumer.offsets == {0: 2, 1: 3}
+        assert not mock_callback.called
+        assert mock_batch_callback.call_count == 2
+        (updates, state), _ = mock_batch_callback.call_args_list[0]
+        assert [subscription for _, subscription in updates] == [sub, other_sub]
+        assert state is consumer.partition_state[0]
+        (updates, state), _ = mock_batch_callback.call_args_list[1]
+        assert [subscription for _, subscription in updates] == [sub]
+        assert state is consumer.partition_state[1]
+
+    def test_no_batch_subscriber(self):
+        registration_key = "registered_batch_test"
+        mock_callback = mock.Mock()
+        register_subscriber(registration_key)(mock_callback)
+        sub = self.create_subscription(registration_key)
+        data = self.valid_wrapper
+        data["payload"]["subscription_id"] = sub.subscription_id
+
+        self.consumer.handle_batch([self.build_mock_message(data)])
+        assert mock_callback.call_count == 1
+        assert mock_callback.call_args[0][1] == sub
+
+    def test_no_subscription(self):
+        with mock.patch("sentry.snuba.tasks._snuba_pool") as pool:
+            pool.urlopen.return_value.status = 202
+            self.consumer.handle_batch(
+                [
+                    self.build_mock_message(
+                        self.valid_wrapper, topic=settings.KAFKA_EVENTS_SUBSCRIPTIONS_RESULTS
+                    )
+                ]
+            )
+            assert pool.urlopen.call_count == 1
+        self.metrics.incr.assert_called_once_with(
+            "snuba_query_subscriber.subscription_doesnt_exist"
+        )
+
+
 class ParseMessageValueTest(BaseQuerySubscriptionTest, unittest.TestCase):
     def run_test(self, message):
         self.consumer.parse_message_value(json.dumps(message))
@@ -0,0 +1,38 @@
+import pytest
+
+from sentry.models import Project
+from sentry.tasks.relay import update_config_cache
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.compat import mock
+
+NUM_PROJECTS = 500
+
+
+@pytest.fixture
+def organization_with_projects(factories, default_organization, default_team):
+    for i in range(NUM_PROJECTS):
+        project = factories.create_project(
+            organization=default_organization, teams=[default_team], slug=f"project-{i}"
+        )
+        factories.create_project_key(project=project)
+    return default_organization
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_update_config_cache(benchmark, organization_with_projects):
+    num_projects = Project.objects.filter(organization=organization_with_projects).count()
+
+    with mock.patch("sentry.relay.projectconfig_cache.set_many") as set_many:
+        benchmark(
+            update_config_cache,
+            generate=True,
+            organization_id=organization_with_projects.id,
+            update_reason="benchmark",
+        )
+
+    (configs,), _ = set_many.call_args
+    # one config for every project and one for each of its keys
+    assert len(configs) >= 2 * NUM_PROJECTS
+
+    benchmark.extra_info["projects_per_second"] = num_projects / benchmark.stats.stats.mean
@@ -28,7 +28,9 @@ from sentry.tasks.reports import (
     merge_sequences,
     merge_series,
     month_to_index,
+    prepare_organization_reports,
     prepare_project_issue_summaries,
+    prepare_project_report,
     prepare_project_series,
     prepare_reports,
     safe_add,
@@ -362,6 +364,46 @@ class ReportTestCase(TestCase, SnubaTestCase):
 
 
 class ReportAcceptanceTest(OutcomesSnubaTest, SnubaTestCase):
+    @mock.patch("sentry.tasks.reports.BATCH_SIZE", 1)
+    @mock.patch("sentry.tasks.reports.PROJECT_BATCH_SIZE", 2)
+    def test_prepare_organization_reports(self):
+        now = timezone.now()
+        two_days_ago = now - timedelta(days=2)
+        three_days_ago = now - timedelta(days=3)
+        interval = (floor_to_utc_day(now - timedelta(days=7)), floor_to_utc_day(now))
+
+        projects = [self.project] + [
+            self.create_project(organization=self.organization) for _ in range(2)
+        ]
+
+        for i, project in enumerate(projects[:2]):
+            self.store_outcomes(
+                {
+                    "org_id": self.organization.id,
+                    "project_id": project.id,
+                    "outcome": Outcome.ACCEPTED,
+                    "category": DataCategory.ERROR,
+                    "timestamp": two_days_ago,
+                    "key_id": 1,
+                },
+                num_times=i + 1,
+            )
+
+            for fingerprint in ("group-1", "group-2"):
+                event = self.store_event(
+                    data={
+                        "message": "message",
+                        "timestamp": iso_format(three_days_ago),
+                        "fingerprint": [fingerprint],
+                    },
+                    project_id=project.id,
+                )
+
+            event.group.update(status=GroupStatus.RESOLVED, resolved_at=two_days_ago)
+
+        expected = {project.id: prepare_project_report(interval, project) for project in projects}
+        assert prepare_organization_reports(interval, projects) == expected
+
     @mock.patch("sentry.tasks.reports.backend", DummyReportBackend())
     def test_deliver_organization_user_report(self):
         now = timezone.now()
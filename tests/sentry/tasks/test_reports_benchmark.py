@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from sentry.app import tsdb
+from sentry.tasks.reports import prepare_organization_reports, prepare_project_report
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.compat import mock
+from sentry.utils.dates import floor_to_utc_day
+
+NUM_PROJECTS = 500
+
+
+@pytest.fixture
+def interval():
+    now = floor_to_utc_day(timezone.now())
+    return now - timedelta(days=7), now
+
+
+@pytest.fixture
+def projects(factories, default_organization, default_team, interval):
+    _, stop = interval
+    projects = []
+    for i in range(NUM_PROJECTS):
+        project = factories.create_project(
+            organization=default_organization, teams=[default_team], slug=f"project-{i}"
+        )
+        tsdb.incr(tsdb.models.project, project.id, stop - timedelta(days=1), count=i)
+        projects.append(project)
+    return projects
+
+
+@pytest.fixture
+def no_outcomes():
+    # Outcomes live in Snuba, this measures the database and TSDB side only.
+    with mock.patch("sentry.tasks.reports.raw_snql_query", return_value={"data": []}):
+        yield
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_prepare_project_reports(benchmark, interval, projects, no_outcomes):
+    reports = benchmark(lambda: [prepare_project_report(interval, p) for p in projects])
+    assert len(reports) == NUM_PROJECTS
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_prepare_organization_reports(benchmark, interval, projects, no_outcomes):
+    reports = benchmark(prepare_organization_reports, interval, projects)
+    assert len(reports) == NUM_PROJECTS
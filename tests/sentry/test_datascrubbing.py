@@ -2,7 +2,14 @@ import copy
 
 import pytest
 
-from sentry.datascrubbing import scrub_data
+from sentry.datascrubbing import (
+    get_all_pii_configs,
+    get_cached_pii_configs,
+    pii_config_cache,
+    scrub_data,
+    scrub_data_batch,
+)
+from sentry.utils.compat import mock
 
 
 def merge_pii_configs(prefixes_and_configs):
@@ -80,6 +87,54 @@ def test_scrub_data(field, default_project):
     )
 
 
+@pytest.fixture
+def empty_pii_config_cache():
+    pii_config_cache.clear()
+    yield
+    pii_config_cache.clear()
+
+
+@pytest.mark.django_db
+def test_cached_pii_configs(default_project, empty_pii_config_cache):
+    project = default_project
+
+    with mock.patch(
+        "sentry.datascrubbing.get_all_pii_configs", side_effect=get_all_pii_configs
+    ) as build:
+        configs = get_cached_pii_configs(project)
+        assert get_cached_pii_configs(project) is configs
+        assert build.call_count == 1
+
+        # Changing any of the inputs builds the configs again
+        project.update_option("sentry:sensitive_fields", ["b"])
+        new_configs = get_cached_pii_configs(project)
+        assert build.call_count == 2
+        assert new_configs != configs
+
+        project.organization.update_option(
+            "sentry:relay_pii_config", '{"applications": {"extra.a": ["@anything:remove"]}}'
+        )
+        assert len(get_cached_pii_configs(project)) == len(new_configs) + 1
+        assert build.call_count == 3
+
+
+@pytest.mark.django_db
+def test_scrub_data_batch(default_project, empty_pii_config_cache):
+    project = default_project
+    project.update_option("sentry:sensitive_fields", ["a"])
+
+    events = [{"extra": {"a": "pls remove", "b": str(i)}} for i in range(3)]
+    expected = [scrub_data(project, copy.deepcopy(event)) for event in events]
+
+    with mock.patch(
+        "sentry.datascrubbing.get_all_pii_configs", side_effect=get_all_pii_configs
+    ) as build:
+        assert scrub_data_batch(project, events) == expected
+        assert build.call_count == 0
+
+    assert [event["extra"]["a"] for event in expected] == ["[Filtered]"] * 3
+
+
 def test_merge_pii_configs_simple():
     assert merge_pii_configs([("p:", {}), ("o:", {})]) == {}
 
@@ -0,0 +1,143 @@
+import time
+
+from django.test import override_settings
+
+from sentry import grouphash_cache
+from sentry.event_manager import HashDiscarded, _save_aggregate
+from sentry.eventstore.models import Event
+from sentry.models import GroupHash, GroupTombstone
+from sentry.reprocessing2 import start_group_reprocessing
+from sentry.testutils import TestCase
+from sentry.utils.compat import mock
+
+
+@override_settings(SENTRY_GROUPHASH_CACHE_LOCAL_SIZE=1000)
+class GroupHashCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        grouphash_cache._local_cache.invalidate(None)
+        self.addCleanup(grouphash_cache._local_cache.invalidate, None)
+
+    def test_get_many(self):
+        group = self.create_group()
+        grouphash = GroupHash.objects.create(project=self.project, hash="a" * 32, group=group)
+        GroupHash.objects.create(project=self.project, hash="b" * 32)
+
+        generation, entries = grouphash_cache.get_many(self.project.id, ["a" * 32, "b" * 32])
+        assert entries == {}
+
+        grouphash_cache.set_many(self.project.id, generation, GroupHash.objects.all())
+
+        # hashes without a group are not cached
+        _, entries = grouphash_cache.get_many(self.project.id, ["a" * 32, "b" * 32])
+        assert entries == {
+            "a" * 32: grouphash_cache.CachedGroupHash(grouphash.id, group.id, None, None)
+        }
+
+        # a full hit is served from the process-local tier
+        with mock.patch.object(grouphash_cache, "_get_client") as get_client:
+            _, entries = grouphash_cache.get_many(self.project.id, ["a" * 32])
+            assert not get_client.called
+        assert entries["a" * 32].group_id == group.id
+
+    def test_invalidate(self):
+        group = self.create_group()
+        GroupHash.objects.create(project=self.project, hash="a" * 32, group=group)
+
+        generation, _ = grouphash_cache.get_many(self.project.id, ["a" * 32])
+        grouphash_cache.set_many(self.project.id, generation, GroupHash.objects.all())
+        assert grouphash_cache.get_many(self.project.id, ["a" * 32])[1]
+
+        with self.capture_on_commit_callbacks(execute=True):
+            grouphash_cache.invalidate([self.project.id])
+
+        new_generation, entries = grouphash_cache.get_many(self.project.id, ["a" * 32])
+        assert new_generation != generation
+        assert entries == {}
+
+        # entries read in an outdated generation are never served
+        grouphash_cache.set_many(self.project.id, generation, GroupHash.objects.all())
+        assert grouphash_cache.get_many(self.project.id, ["a" * 32])[1] == {}
+
+    def test_invalidated_on_save(self):
+        grouphash = GroupHash.objects.create(
+            project=self.project, hash="a" * 32, group=self.create_group()
+        )
+
+        with mock.patch.object(grouphash_cache, "invalidate") as invalidate:
+            grouphash.update(state=GroupHash.State.LOCKED_IN_MIGRATION)
+        invalidate.assert_called_once_with([self.project.id])
+
+    def test_local_tier_expires(self):
+        group = self.create_group()
+        GroupHash.objects.create(project=self.project, hash="a" * 32, group=group)
+        generation, _ = grouphash_cache.get_many(self.project.id, ["a" * 32])
+        grouphash_cache.set_many(self.project.id, generation, GroupHash.objects.all())
+        grouphash_cache.get_many(self.project.id, ["a" * 32])
+
+        with override_settings(SENTRY_GROUPHASH_CACHE_LOCAL_TTL=10):
+            with mock.patch("sentry.grouphash_cache.time.time", return_value=time.time() + 60):
+                assert grouphash_cache._local_cache.get(self.project.id, ["a" * 32]) is None
+
+
+@override_settings(SENTRY_GROUPHASH_CACHE_LOCAL_SIZE=1000)
+class SaveAggregateGroupHashCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        grouphash_cache._local_cache.invalidate(None)
+        self.addCleanup(grouphash_cache._local_cache.invalidate, None)
+
+    def save_aggregate(self, hashes):
+        event = Event(self.project.id, "89aeed6a472e4c5fb992d14df4d7e1b6", data={})
+        return _save_aggregate(
+            event, flat_hashes=hashes, hierarchical_hashes=[], release=None, data={}
+        )
+
+    def test_existing_group_skips_grouphash_queries(self):
+        with self.options({"store.grouphash-cache-enabled": True}):
+            group, is_new, _ = self.save_aggregate(["a" * 32, "b" * 32])
+            assert is_new
+
+            # the first lookup of the existing group populates the cache
+            assert self.save_aggregate(["a" * 32, "b" * 32])[0] == group
+
+            with mock.patch.object(GroupHash.objects, "get_or_create") as get_or_create:
+                assert self.save_aggregate(["a" * 32, "b" * 32]) == (group, False, False)
+                assert not get_or_create.called
+
+            # a hash that is not cached yet takes the regular path
+            assert self.save_aggregate(["a" * 32, "c" * 32])[0] == group
+            assert GroupHash.objects.get(hash="c" * 32).group_id == group.id
+
+    def test_tombstone(self):
+        with self.options({"store.grouphash-cache-enabled": True}):
+            group, _, _ = self.save_aggregate(["a" * 32])
+            self.save_aggregate(["a" * 32])
+
+            tombstone = GroupTombstone.objects.create(
+                project_id=group.project_id, previous_group_id=group.id
+            )
+            GroupHash.objects.filter(group=group).update(
+                group=None, group_tombstone_id=tombstone.id
+            )
+            with self.capture_on_commit_callbacks(execute=True):
+                grouphash_cache.invalidate([self.project.id])
+
+            for _ in range(2):
+                with self.assertRaises(HashDiscarded):
+                    self.save_aggregate(["a" * 32])
+
+    @mock.patch("sentry.reprocessing2.snuba.aliased_query")
+    def test_reprocessing(self, aliased_query):
+        aliased_query.return_value = {"data": [{"times_seen": 1}]}
+
+        with self.options({"store.grouphash-cache-enabled": True}):
+            group, _, _ = self.save_aggregate(["a" * 32])
+            self.save_aggregate(["a" * 32])
+
+            with self.capture_on_commit_callbacks(execute=True):
+                new_group_id = start_group_reprocessing(
+                    self.project.id, group.id, remaining_events="delete"
+                )
+
+            assert self.save_aggregate(["a" * 32])[0].id == new_group_id
@@ -58,3 +58,47 @@ class RedisLockBackendTestCase(TestCase):
         self.backend.acquire(key, duration)
         assert self.backend.locked(key)
         self.backend.release(key)
+
+    def test_acquire_many(self):
+        keys = [f"lock:{i}" for i in range(20)]
+        duration = 60
+
+        self.backend.acquire_many(keys, duration)
+        for key in keys:
+            client = self.backend.get_client(key)
+            full_key = self.backend.prefix_key(key)
+            assert client.get(full_key) == self.backend.uuid.encode("utf-8")
+            assert duration - 2 < float(client.ttl(full_key)) <= duration
+
+        self.backend.release_many(keys)
+        assert not any(self.backend.locked(key) for key in keys)
+
+    def test_acquire_many_all_or_nothing(self):
+        keys = [f"lock:{i}" for i in range(20)]
+        duration = 60
+
+        other_backend = RedisLockBackend(self.cluster)
+        other_backend.acquire(keys[10], duration)
+        with pytest.raises(Exception):
+            self.backend.acquire_many(keys, duration)
+
+        assert [key for key in keys if self.backend.locked(key)] == [keys[10]]
+
+        other_backend.release(keys[10])
+        self.backend.acquire_many(keys, duration)
+        self.backend.release_many(keys)
+
+    def test_acquire_many_routing_key(self):
+        keys = ["lock:a", "lock:b"]
+        self.backend.acquire_many(keys, 60, routing_key=0)
+        assert self.backend.locked("lock:a", routing_key=0)
+        self.backend.release_many(keys, routing_key=0)
+
+    def test_release_many_fail_on_conflict(self):
+        keys = ["lock:a", "lock:b"]
+        self.backend.acquire_many(keys, 60)
+        self.backend.get_client(keys[1]).set(self.backend.prefix_key(keys[1]), "someone-elses-uuid")
+
+        with pytest.raises(Exception):
+            self.backend.release_many(keys)
+        assert not self.backend.locked(keys[0])
@@ -0,0 +1,59 @@
+from threading import Thread
+
+import pytest
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.locking.backends.redis import RedisLockBackend
+from sentry.utils.redis import clusters
+
+KEYS = [f"lock:benchmark:{i}" for i in range(50)]
+THREADS = 8
+
+
+def lock_many(backend, keys):
+    backend.acquire_many(keys, 60)
+    backend.release_many(keys)
+
+
+def lock_each(backend, keys):
+    for key in keys:
+        backend.acquire(key, 60)
+    for key in keys:
+        backend.release(key)
+
+
+def contend(lock, keys):
+    """
+    Lets ``THREADS`` threads (each with its own backend) take the same locks
+    as often as they can, and returns how often each of them succeeded.
+    """
+    acquired = [0] * THREADS
+
+    def run(index):
+        backend = RedisLockBackend(clusters.get("default"))
+        for _ in range(50):
+            try:
+                lock(backend, keys)
+            except Exception:
+                continue
+            acquired[index] += 1
+
+    threads = [Thread(target=run, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return acquired
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("lock", [lock_each, lock_many])
+def test_benchmark_lock_throughput(benchmark, lock):
+    backend = RedisLockBackend(clusters.get("default"))
+    benchmark(lock, backend, KEYS)
+
+
+@requires_pytest_benchmark
+def test_benchmark_acquire_many_contention(benchmark):
+    acquired = benchmark.pedantic(contend, args=(lock_many, KEYS), rounds=5)
+    assert sum(acquired) > 0
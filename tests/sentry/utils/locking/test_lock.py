@@ -5,7 +5,7 @@ import pytest
 from sentry.utils.compat import mock
 from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.locking.backends import LockBackend
-from sentry.utils.locking.lock import Lock
+from sentry.utils.locking.lock import Lock, MultiLock
 
 
 class LockTestCase(unittest.TestCase):
@@ -42,3 +42,42 @@ class LockTestCase(unittest.TestCase):
             backend.acquire.assert_called_once_with(key, duration, routing_key)
 
         backend.release.assert_called_once_with(key, routing_key)
+
+
+class MultiLockTestCase(unittest.TestCase):
+    def test_context_manager_interface(self):
+        backend = mock.Mock(spec=LockBackend)
+        duration = 60
+
+        lock = MultiLock(backend, ["b", "a", "b"], duration)
+
+        with lock.acquire():
+            backend.acquire_many.assert_called_once_with(["a", "b"], duration, None)
+
+        backend.release_many.assert_called_once_with(["a", "b"], None)
+
+        backend.acquire_many.side_effect = Exception("Boom!")
+        with pytest.raises(UnableToAcquireLock):
+            lock.acquire()
+
+    def test_default_backend_rolls_back(self):
+        class Backend(LockBackend):
+            def __init__(self):
+                self.locks = {"c"}
+
+            def acquire(self, key, duration, routing_key=None):
+                if key in self.locks:
+                    raise Exception("Locked")
+                self.locks.add(key)
+
+            def release(self, key, routing_key=None):
+                self.locks.remove(key)
+
+        backend = Backend()
+        with pytest.raises(UnableToAcquireLock):
+            MultiLock(backend, ["a", "b", "c"], 60).acquire()
+        assert backend.locks == {"c"}
+
+        with MultiLock(backend, ["a", "b"], 60).acquire():
+            assert backend.locks == {"a", "b", "c"}
+        assert backend.locks == {"c"}
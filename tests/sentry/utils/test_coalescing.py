@@ -0,0 +1,69 @@
+from threading import Thread
+from unittest import TestCase
+
+from exam import fixture
+
+from sentry.utils.coalescing import CoalescedOperation
+from sentry.utils.compat import mock
+from sentry.utils.redis import redis_clusters
+
+
+class CoalescedOperationTestCase(TestCase):
+    @fixture
+    def client(self):
+        return redis_clusters.get("default")
+
+    def setUp(self):
+        self.client.delete("coalesce:{test}:leader", "coalesce:{test}:done")
+
+    def operation(self):
+        return CoalescedOperation(self.client, "test")
+
+    def test_single_leader(self):
+        leader = self.operation()
+        assert leader.try_lead() is True
+        assert self.operation().try_lead() is False
+
+        leader.release()
+        assert self.operation().try_lead() is True
+
+    def test_followers_wake_up(self):
+        leader = self.operation()
+        assert leader.try_lead() is True
+
+        # Followers are determined before the leader releases, waiting works
+        # no matter whether they block before or after the release.
+        followers = [self.operation() for _ in range(3)]
+        assert [follower.try_lead() for follower in followers] == [False, False, False]
+
+        results = []
+
+        def follow(follower):
+            results.append(follower.wait(5))
+
+        threads = [Thread(target=follow, args=(follower,)) for follower in followers]
+        for thread in threads:
+            thread.start()
+
+        leader.release()
+        for thread in threads:
+            thread.join()
+
+        assert results == [True, True, True]
+        # the notification does not outlive the operation
+        assert self.client.ttl(leader.done_key) > 0
+
+    def test_new_leader_discards_notification(self):
+        leader = self.operation()
+        leader.try_lead()
+        leader.release()
+
+        assert self.operation().try_lead() is True
+        assert self.operation().wait(1) is False
+
+    def test_redis_unavailable(self):
+        operation = self.operation()
+        with mock.patch.object(self.client, "set", side_effect=Exception("boom")):
+            assert operation.try_lead() is None
+        with mock.patch.object(self.client, "blpop", side_effect=Exception("boom")):
+            assert operation.wait(1) is False
@@ -1,7 +1,11 @@
+from queue import Queue
+
 import pytest
+from django.test import override_settings
 
 from sentry.utils import metrics
 from sentry.utils.compat import mock
+from sentry.utils.dates import to_datetime
 
 
 def test_timer_success():
@@ -43,3 +47,39 @@ def test_wraps():
         args, kwargs = timing.call_args
         assert args[0] == "key"
         assert args[3] == {"foo": True, "result": "success"}
+
+
+def test_internal_metrics_batching():
+    internal = metrics.InternalMetrics()
+    internal.q = Queue()
+    for key, instance in [("a", None), ("a", None), ("a", "x"), ("b", None)]:
+        internal.q.put((key, instance, None, 2, 1, 1000.0))
+    internal.q.put(("a", None, None, 1, 1, 1020.0))
+
+    with mock.patch("sentry.tsdb.incr_multi") as incr_multi, override_settings(
+        SENTRY_INTERNAL_METRICS_BATCH_SIZE=5
+    ):
+        internal._flush(internal._get_batch())
+
+    assert incr_multi.call_count == 1
+    (items,), _ = incr_multi.call_args
+    counts = {(key, options["timestamp"]): options["count"] for _, key, options in items}
+    assert counts == {
+        ("a", to_datetime(1000)): 4,
+        ("a.x", to_datetime(1000)): 2,
+        ("b", to_datetime(1000)): 2,
+        ("a", to_datetime(1020)): 1,
+    }
+
+
+def test_internal_metrics_drops_when_full():
+    internal = metrics.InternalMetrics()
+    internal._started = True
+    internal.q = Queue(maxsize=1)
+
+    with mock.patch.object(metrics, "backend") as backend:
+        internal.incr("a")
+        internal.incr("b")
+
+    assert internal.q.qsize() == 1
+    backend.incr.assert_called_once_with("internal_metrics.dropped", "b", None, 1, 1)
@@ -0,0 +1,157 @@
+import os
+import signal
+import sys
+import threading
+import time
+from threading import Thread
+from unittest import TestCase
+
+from sentry.utils import profiler as profiler_module
+from sentry.utils.compat import mock
+from sentry.utils.profiler import SamplingProfiler, get_output_path, install_signal_handler
+
+
+def spin(seconds):
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pass
+
+
+class SamplingProfilerTest(TestCase):
+    def setUp(self):
+        self.profiler = SamplingProfiler()
+
+    def tearDown(self):
+        self.profiler.stop()
+
+    def test_record(self):
+        frame = sys._getframe()
+        self.profiler._record(frame)
+        self.profiler._record(frame)
+
+        assert self.profiler.sample_count == 2
+        (line,) = self.profiler.get_folded().splitlines()
+        stack, count = line.rsplit(" ", 1)
+        assert count == "2"
+        assert stack.split(";")[-1].startswith("test_record (")
+
+    def test_sample_skips_waiting_threads(self):
+        self.profiler.interval = 1
+        # The caller's frame does not move while this test runs.
+        frame = sys._getframe().f_back
+        frames = {threading.main_thread().ident: None}
+        with mock.patch.object(sys, "_current_frames", return_value=frames):
+            self.profiler._sample(signal.SIGPROF, frame)
+            self.profiler._sample(signal.SIGPROF, frame)
+        self.profiler.interval = None
+
+        assert self.profiler.sample_count == 1
+
+    def test_max_stacks(self):
+        with mock.patch.object(profiler_module, "MAX_STACKS", 1):
+            self.profiler._record(sys._getframe())
+            self.profiler._record(sys._getframe().f_back)
+
+        assert len(self.profiler.stacks) == 2
+        assert self.profiler.stacks[profiler_module.TRUNCATED_STACK] == 1
+
+    def test_start_stop(self):
+        self.profiler.start(0.001)
+        assert self.profiler.running
+        spin(0.2)
+        self.profiler.stop()
+        assert not self.profiler.running
+
+        assert self.profiler.sample_count > 0
+        assert "spin (" in self.profiler.get_folded()
+
+        count = self.profiler.sample_count
+        spin(0.05)
+        assert self.profiler.sample_count == count
+
+    def test_other_threads(self):
+        thread = Thread(target=spin, args=(0.3,))
+
+        self.profiler.start(0.001)
+        thread.start()
+        # Signal handlers only run while the main thread runs Python code.
+        while thread.is_alive():
+            time.sleep(0.001)
+        self.profiler.stop()
+
+        assert any(
+            stack[-1].startswith("spin (") and "run (" in ";".join(stack)
+            for stack in self.profiler.stacks
+        )
+
+    def test_stop_outside_main_thread(self):
+        self.profiler.start(0.001)
+        thread = Thread(target=self.profiler.stop)
+        thread.start()
+        thread.join()
+        assert not self.profiler.running
+
+        count = self.profiler.sample_count
+        spin(0.05)
+        assert self.profiler.sample_count == count
+
+        # the handler that is still installed is reused
+        self.profiler.start(0.001)
+        spin(0.05)
+        assert self.profiler.sample_count > count
+
+    def test_start_outside_main_thread(self):
+        errors = []
+
+        def start():
+            try:
+                self.profiler.start()
+            except ValueError as e:
+                errors.append(e)
+
+        thread = Thread(target=start)
+        thread.start()
+        thread.join()
+
+        assert len(errors) == 1
+        assert not self.profiler.running
+
+
+def test_signal_handler():
+    previous = signal.getsignal(signal.SIGUSR2)
+    path = get_output_path(os.getpid())
+    try:
+        install_signal_handler("SIGUSR2")
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert profiler_module.profiler.running
+        spin(0.1)
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert not profiler_module.profiler.running
+
+        with open(path) as f:
+            assert "spin (" in f.read()
+    finally:
+        profiler_module.profiler.stop()
+        signal.signal(signal.SIGUSR2, previous)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_signal_handler_replaces_symlink(tmpdir):
+    previous = signal.getsignal(signal.SIGUSR2)
+    path = get_output_path(os.getpid())
+    victim = tmpdir.join("victim")
+    victim.write("do not touch")
+    os.symlink(str(victim), path)
+    try:
+        install_signal_handler("SIGUSR2")
+        os.kill(os.getpid(), signal.SIGUSR2)
+        os.kill(os.getpid(), signal.SIGUSR2)
+
+        assert victim.read() == "do not touch"
+        assert not os.path.islink(path)
+    finally:
+        profiler_module.profiler.stop()
+        signal.signal(signal.SIGUSR2, previous)
+        if os.path.lexists(path):
+            os.remove(path)
@@ -168,6 +168,19 @@ class UnmergeTestCase(TestCase, SnubaTestCase):
 
     @with_feature("projects:similarity-indexing")
     def test_unmerge(self):
+        self.run_unmerge_test()
+
+    @with_feature("projects:similarity-indexing")
+    def test_unmerge_high_throughput(self):
+        self.run_unmerge_test(high_throughput=True)
+
+    @with_feature("projects:similarity-indexing")
+    def test_unmerge_high_throughput_multiple_tasks(self):
+        # Every task handles a single batch and flushes its denormalizations.
+        with self.options({"unmerge.high-throughput.task-duration": 0}):
+            self.run_unmerge_test(high_throughput=True)
+
+    def run_unmerge_test(self, **unmerge_kwargs):
         now = before_now(minutes=5).replace(microsecond=0, tzinfo=pytz.utc)
 
         def time_from_now(offset=0):
@@ -282,7 +295,13 @@ class UnmergeTestCase(TestCase, SnubaTestCase):
                 project.id, [list(events.keys())[0]], source.id, destination.id
             )
             unmerge.delay(
-                project.id, source.id, destination.id, [list(events.keys())[0]], None, batch_size=5
+                project.id,
+                source.id,
+                destination.id,
+                [list(events.keys())[0]],
+                None,
+                batch_size=5,
+                **unmerge_kwargs,
             )
             eventstream.end_unmerge(eventstream_state)
 
@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta
 
 import pytz
@@ -6,7 +7,8 @@ from sentry.models import Environment, Group, GroupRelease, Release
 from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import iso_format
 from sentry.tsdb.base import TSDBModel
-from sentry.tsdb.snuba import SnubaTSDB
+from sentry.tsdb.snuba import BUCKET_CACHE_TTL, SnubaTSDB
+from sentry.utils import snuba
 from sentry.utils.compat.mock import patch
 from sentry.utils.dates import to_timestamp
 
@@ -166,6 +168,37 @@ class SnubaTSDBTest(TestCase, SnubaTestCase):
 
         assert self.db.get_range(TSDBModel.group, [], dts[0], dts[-1], rollup=3600) == {}
 
+    @patch("sentry.tsdb.snuba.BUCKET_CACHE_SETTLE_TIME", 0)
+    def test_range_bucket_cache(self):
+        dts = [self.now + timedelta(hours=i) for i in range(4)]
+        keys = [self.proj1group1.id, self.proj1group2.id]
+
+        def get_range(**kwargs):
+            return self.db.get_range(TSDBModel.group, keys, dts[0], dts[-1], rollup=3600, **kwargs)
+
+        expected = get_range()
+        expected_env = get_range(environment_ids=[self.env1.id])
+        assert expected != expected_env
+
+        with self.options({"tsdb.snuba.bucket-cache-enabled": True}):
+            assert get_range() == expected
+            with patch("sentry.tsdb.snuba.snuba.query", wraps=snuba.query) as query:
+                assert get_range() == expected
+                assert not query.called
+
+                # Other environments are cached separately.
+                assert get_range(environment_ids=[self.env1.id]) == expected_env
+                assert query.call_count == 1
+
+            # Buckets cached more than BUCKET_CACHE_TTL ago are queried again.
+            with patch("sentry.tsdb.snuba.time") as mock_time, patch(
+                "sentry.tsdb.snuba.snuba.query", wraps=snuba.query
+            ) as query:
+                mock_time.time.return_value = time.time() + BUCKET_CACHE_TTL + 60
+                assert get_range() == expected
+                assert query.call_count == 1
+                assert query.call_args[1]["start"] == dts[0]
+
     def test_range_releases(self):
         dts = [self.now + timedelta(hours=i) for i in range(4)]
         assert self.db.get_range(